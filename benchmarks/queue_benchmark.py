@@ -0,0 +1,149 @@
+"""
+Benchmark das operações de fila com 10k tracks: o caminho antigo dos cogs (copiar a fila,
+limpar e recolocar track a track com put_wait) contra a IndexedQueue de commands/tracklist.py.
+
+Uso: python benchmarks/queue_benchmark.py [--size 10000] [--ops 200]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import wavelink  # noqa: E402
+
+from commands.tracklist import IndexedQueue, queue_total_length  # noqa: E402
+
+
+PER_PAGE = 10
+
+
+def make_track(index: int) -> wavelink.Playable:
+    return wavelink.Playable(
+        {
+            "encoded": f"QAAA{index:08d}" + "x" * 120,
+            "info": {
+                "identifier": f"id{index}",
+                "isSeekable": True,
+                "author": f"Artist {index % 97}",
+                "length": 180_000 + index,
+                "isStream": False,
+                "position": 0,
+                "title": f"Track {index}",
+                "uri": f"https://example.com/{index}",
+                "artworkUrl": None,
+                "isrc": None,
+                "sourceName": "youtube",
+            },
+            "pluginInfo": {},
+            "userData": {},
+        }
+    )
+
+
+# Reproduções do que QueueCommands/QueueControlView faziam antes
+async def old_skipto(queue: wavelink.Queue, position: int) -> wavelink.Playable:
+    items = list(queue)
+    target = items[position - 1]
+    queue.clear()
+    for track in items[position:]:
+        await queue.put_wait(track)
+    return target
+
+
+async def old_remove(queue: wavelink.Queue, position: int) -> wavelink.Playable:
+    items = list(queue)
+    removed = items.pop(position - 1)
+    queue.clear()
+    for track in items:
+        await queue.put_wait(track)
+    return removed
+
+
+def old_page(queue: wavelink.Queue, page: int) -> tuple[list, int]:
+    items = list(queue)
+    return items[page * PER_PAGE:(page + 1) * PER_PAGE], sum(track.length or 0 for track in items)
+
+
+# Caminho novo usado pelos cogs
+async def new_skipto(queue: wavelink.Queue, position: int) -> wavelink.Playable:
+    target = queue[position - 1]
+    del queue[:position]
+    return target
+
+
+async def new_remove(queue: wavelink.Queue, position: int) -> wavelink.Playable:
+    removed = queue[position - 1]
+    queue.delete(position - 1)
+    return removed
+
+
+def new_page(queue: wavelink.Queue, page: int) -> tuple[list, int]:
+    return queue[page * PER_PAGE:(page + 1) * PER_PAGE], queue_total_length(queue)
+
+
+async def run(options: argparse.Namespace) -> None:
+    tracks = [make_track(index) for index in range(options.size)]
+    rng = random.Random(42)
+    positions = [rng.randint(1, options.size // 2) for _ in range(options.ops)]
+
+    def fresh(queue_cls) -> wavelink.Queue:
+        queue = queue_cls()
+        queue.put(tracks)
+        return queue
+
+    async def bench(label: str, factory, operation) -> float:
+        elapsed = 0.0
+        for position in positions:
+            queue = factory()
+            started = time.perf_counter()
+            result = operation(queue, position)
+            if asyncio.iscoroutine(result):
+                await result
+            elapsed += time.perf_counter() - started
+        per_op = elapsed * 1e6 / len(positions)
+        print(f"  {label:<22} {per_op:10.1f} µs/op")
+        return per_op
+
+    print(f"Fila com {options.size} tracks, {options.ops} operações por caso")
+    for name, old_op, new_op in (
+        ("skipto", old_skipto, new_skipto),
+        ("remove", old_remove, new_remove),
+        ("página + duração", lambda queue, position: old_page(queue, position // PER_PAGE),
+         lambda queue, position: new_page(queue, position // PER_PAGE)),
+    ):
+        print(f"{name}:")
+        old = await bench("antigo (wavelink.Queue)", lambda: fresh(wavelink.Queue), old_op)
+        new = await bench("novo (IndexedQueue)", lambda: fresh(IndexedQueue), new_op)
+        print(f"  ganho: {old / new:.1f}x")
+
+    # move não existia antes; mede só a fila indexada
+    queue = fresh(IndexedQueue)
+    started = time.perf_counter()
+    for position in positions:
+        queue.move(position, options.size - position)
+    print(f"move: {(time.perf_counter() - started) * 1e6 / len(positions):.1f} µs/op (IndexedQueue)")
+
+    # Sanidade: as duas implementações produzem a mesma fila
+    old_queue, new_queue = fresh(wavelink.Queue), fresh(IndexedQueue)
+    for position in positions[:20]:
+        await old_remove(old_queue, position)
+        await new_remove(new_queue, position)
+    await old_skipto(old_queue, 100)
+    await new_skipto(new_queue, 100)
+    print(f"resultados iguais: {list(old_queue) == list(new_queue)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--ops", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Micro-benchmark do translate: caminho antigo (split da chave + dicts aninhados + str.format)
+contra as tabelas planas pré-compiladas de commands/i18n.py.
+
+Uso: python benchmarks/translate_benchmark.py [--rounds 20]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from commands.i18n import build_locale_tables, flatten_locale  # noqa: E402
+
+
+DEFAULT_LANGUAGE = "en"
+
+
+def load_locales(locale_dir: Path) -> dict[str, dict[str, Any]]:
+    locales: dict[str, dict[str, Any]] = {}
+    for locale_file in sorted(locale_dir.glob("*.json")):
+        with locale_file.open("r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        if isinstance(data, dict):
+            locales[locale_file.stem.lower()] = data
+    locales.setdefault(DEFAULT_LANGUAGE, {})
+    return locales
+
+
+def resolve_nested(locales: dict[str, dict[str, Any]], locale: str, key: str) -> Any:
+    """Reprodução do antigo MusicBot._resolve_locale_value."""
+    data = locales.get(locale)
+    if not data:
+        return None
+
+    current: Any = data
+    for part in key.split('.'):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def translate_old(locales, locale: str, key: str, kwargs: dict) -> str:
+    text = resolve_nested(locales, locale, key)
+    if text is None and locale != DEFAULT_LANGUAGE:
+        text = resolve_nested(locales, DEFAULT_LANGUAGE, key)
+    if text is None:
+        return key
+    if kwargs:
+        try:
+            return text.format(**kwargs)
+        except Exception:
+            return text
+    return text
+
+
+def translate_new(tables, locale: str, key: str, kwargs: dict) -> str:
+    table = tables.get(locale) or tables[DEFAULT_LANGUAGE]
+    template = table.get(key)
+    if template is None:
+        return key
+    if kwargs:
+        try:
+            return template.render(kwargs)
+        except Exception:
+            return template.text
+    return template.text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--locales", type=Path, default=ROOT / "locales")
+    options = parser.parse_args()
+
+    locales = load_locales(options.locales)
+    tables = build_locale_tables(locales, DEFAULT_LANGUAGE)
+
+    # Todas as chaves de todos os locales, traduzidas em todos os idiomas
+    keys = sorted({key for data in locales.values() for key in flatten_locale(data)})
+    calls: list[tuple[str, str, dict]] = []
+    for locale in sorted(tables):
+        for key in keys:
+            template = tables[locale].get(key)
+            fields = template.fields if template is not None else ()
+            calls.append((locale, key, {name: "x" for name in fields}))
+
+    mismatches = sum(
+        1 for locale, key, kwargs in calls
+        if translate_old(locales, locale, key, kwargs) != translate_new(tables, locale, key, kwargs)
+    )
+
+    def run(func, data) -> float:
+        started = time.perf_counter()
+        for _ in range(options.rounds):
+            for locale, key, kwargs in calls:
+                func(data, locale, key, kwargs)
+        return time.perf_counter() - started
+
+    old_elapsed = run(translate_old, locales)
+    new_elapsed = run(translate_new, tables)
+    total = len(calls) * options.rounds
+
+    print(f"{len(keys)} chaves x {len(tables)} locales, {options.rounds} rodadas ({total} chamadas)")
+    print(f"antigo: {old_elapsed * 1e9 / total:8.1f} ns/chamada")
+    print(f"novo:   {new_elapsed * 1e9 / total:8.1f} ns/chamada ({old_elapsed / new_elapsed:.2f}x)")
+    print(f"resultados divergentes: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
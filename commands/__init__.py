@@ -1,11 +1,27 @@
 from __future__ import annotations
 
-from typing import Iterable
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Iterable
 
 import discord
 import wavelink
 
-__all__ = ["iter_wavelink_nodes", "resolve_wavelink_player", "player_is_ready"]
+__all__ = [
+	"iter_wavelink_nodes",
+	"resolve_wavelink_player",
+	"player_is_ready",
+	"normalize_search_result",
+	"hedged_search",
+]
+
+# Busca "hedged": dispara o próximo provedor se o anterior não respondeu dentro do stagger
+SEARCH_HEDGE_STAGGER_SECONDS = float(os.getenv("SEARCH_HEDGE_STAGGER_SECONDS", "0.75"))
+SEARCH_HEDGE_MAX_IN_FLIGHT = int(os.getenv("SEARCH_HEDGE_MAX_IN_FLIGHT", "3"))
+# Tempo máximo esperando uma tentativa de maior prioridade depois que uma de menor prioridade já achou algo
+SEARCH_HEDGE_PRIORITY_GRACE_SECONDS = float(os.getenv("SEARCH_HEDGE_PRIORITY_GRACE_SECONDS", "1.5"))
+# Orçamento total da busca (a interação já foi deferida, mas o usuário está esperando)
+SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", "12"))
 
 
 def iter_wavelink_nodes() -> Iterable[wavelink.Node]:
@@ -78,3 +94,140 @@ def player_is_ready(player: wavelink.Player | None) -> bool:
 			return True
 
 	return False
+
+
+def normalize_search_result(result: Any) -> wavelink.Playlist | list[wavelink.Playable] | None:
+	"""Converte o retorno do Lavalink em Playlist/lista não vazia (ou None)."""
+	if not result:
+		return None
+
+	if isinstance(result, wavelink.Playlist):
+		return result if getattr(result, "tracks", None) else None
+
+	playable_cls = getattr(wavelink, "Playable", None)
+	if playable_cls and isinstance(result, playable_cls):
+		return [result]
+
+	try:
+		tracks_list = list(result)
+	except TypeError:
+		return None
+
+	return tracks_list or None
+
+
+async def hedged_search(
+	fetch: Callable[[Any], Awaitable[Any]],
+	attempts: list[Any],
+	*,
+	attempt_timeout: float | None = None,
+	stagger: float = SEARCH_HEDGE_STAGGER_SECONDS,
+	max_in_flight: int = SEARCH_HEDGE_MAX_IN_FLIGHT,
+	priority_grace: float = SEARCH_HEDGE_PRIORITY_GRACE_SECONDS,
+	deadline: float | None = SEARCH_DEADLINE_SECONDS,
+	normalize: Callable[[Any], Any] = normalize_search_result,
+) -> Any:
+	"""Executa as tentativas em ordem de prioridade, sobrepondo as lentas.
+
+	A próxima tentativa começa quando a anterior falha/volta vazia ou quando o
+	stagger expira. Vence o resultado não vazio de maior prioridade (esperando no
+	máximo priority_grace pelas tentativas mais prioritárias ainda em voo); as
+	demais tentativas são canceladas. normalize converte cada retorno e devolve
+	None quando ele não serve (padrão: resultados de busca do Lavalink).
+	"""
+	if not attempts:
+		return None
+
+	loop = asyncio.get_running_loop()
+	ends_at = loop.time() + deadline if deadline else None
+	max_in_flight = max(1, max_in_flight)
+
+	pending: dict[asyncio.Task, int] = {}
+	finished: set[int] = set()
+	results: dict[int, Any] = {}
+	best: int | None = None
+	best_found_at = 0.0
+	last_exc: Exception | None = None
+	next_index = 0
+
+	async def _attempt(identifier: Any) -> Any:
+		coro = fetch(identifier)
+		if attempt_timeout:
+			return await asyncio.wait_for(coro, timeout=attempt_timeout)
+		return await coro
+
+	def _can_launch() -> bool:
+		if next_index >= len(attempts) or len(pending) >= max_in_flight:
+			return False
+		# Não adianta disparar tentativas de prioridade menor que a vencedora atual
+		return best is None or next_index < best
+
+	def _launch() -> None:
+		nonlocal next_index
+		task = asyncio.create_task(_attempt(attempts[next_index]))
+		pending[task] = next_index
+		next_index += 1
+
+	try:
+		while True:
+			if best is not None:
+				if all(index in finished for index in range(best)):
+					return results[best]
+				if loop.time() - best_found_at >= priority_grace:
+					return results[best]
+
+			if not pending:
+				if not _can_launch():
+					break
+				_launch()
+				continue
+
+			wait_timeout = stagger if _can_launch() else None
+			if ends_at is not None:
+				remaining = ends_at - loop.time()
+				if remaining <= 0:
+					break
+				wait_timeout = remaining if wait_timeout is None else min(wait_timeout, remaining)
+			if best is not None:
+				grace_left = max(0.0, priority_grace - (loop.time() - best_found_at))
+				wait_timeout = grace_left if wait_timeout is None else min(wait_timeout, grace_left)
+
+			done, _ = await asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+			if not done:
+				# Stagger expirou sem resposta: dispara a próxima tentativa em paralelo
+				if _can_launch() and (ends_at is None or loop.time() < ends_at):
+					_launch()
+				continue
+
+			freed_slot = False
+			for task in done:
+				index = pending.pop(task)
+				finished.add(index)
+				try:
+					value = normalize(task.result())
+				except Exception as exc:
+					last_exc = exc
+					freed_slot = True
+					continue
+
+				if value is None:
+					freed_slot = True
+					continue
+
+				results[index] = value
+				if best is None:
+					best_found_at = loop.time()
+				if best is None or index < best:
+					best = index
+
+			if freed_slot and _can_launch():
+				_launch()
+	finally:
+		for task in pending:
+			task.cancel()
+
+	if best is not None:
+		return results[best]
+	if last_exc:
+		raise last_exc
+	return None
@@ -207,12 +207,12 @@ class AdminCommands(commands.Cog):
         )
 
         # Persiste status; atividade só se for suportada
-        config = self.bot._load_presence_config()
+        config = await self.bot._load_presence_config()
         config["status"] = state.value
         serialized = serialize_activity(current_activity)
         if serialized is not None:
             config["activity"] = serialized
-        self.bot.save_presence_config(config)
+        await self.bot.save_presence_config(config)
 
         status_label = self._translate(
             interaction,
@@ -285,7 +285,7 @@ class AdminCommands(commands.Cog):
                 return await interaction.response.send_message(error_message, ephemeral=True)
 
         # Mantém status salvo (ou padrão online)
-        config = self.bot._load_presence_config()
+        config = await self.bot._load_presence_config()
         saved_status_str = config.get("status", "online")
         status_mapping = {
             "online": discord.Status.online,
@@ -330,7 +330,7 @@ class AdminCommands(commands.Cog):
 
         # Garante status salvo
         config["status"] = saved_status_str
-        self.bot.save_presence_config(config)
+        await self.bot.save_presence_config(config)
 
         embed = discord.Embed(
             title=self._translate(
@@ -370,7 +370,7 @@ class AdminCommands(commands.Cog):
         action: app_commands.Choice[str]
     ):
         # Verifica se o MongoDB está conectado
-        if not hasattr(self.bot, 'logs_collection') or self.bot.logs_collection is None:
+        if getattr(self.bot, 'storage', None) is None or getattr(self.bot, 'logs_collection', None) is None:
             error_message = self._translate(
                 interaction,
                 "commands.admin.logs.errors.no_mongodb",
@@ -383,8 +383,10 @@ class AdminCommands(commands.Cog):
         if action_value == "status":
             # Mostra o status atual
             try:
-                config = self.bot.logs_collection.find_one({"_id": "global"})
+                config = await self.bot.storage.find_one(self.bot.logs_collection, {"_id": "global"})
                 enabled = config.get("enabled", True) if config else True
+                if getattr(self.bot, "logger", None) is not None:
+                    self.bot.logger.invalidate(enabled=bool(enabled))
 
                 status_text = self._translate(
                     interaction,
@@ -447,11 +449,14 @@ class AdminCommands(commands.Cog):
         elif action_value == "enable":
             # Habilita os logs
             try:
-                self.bot.logs_collection.update_one(
+                await self.bot.storage.update_one(
+                    self.bot.logs_collection,
                     {"_id": "global"},
                     {"$set": {"enabled": True}},
                     upsert=True
                 )
+                if getattr(self.bot, "logger", None) is not None:
+                    self.bot.logger.invalidate(enabled=True)
                 
                 embed = discord.Embed(
                     title=self._translate(
@@ -480,11 +485,14 @@ class AdminCommands(commands.Cog):
         elif action_value == "disable":
             # Desabilita os logs
             try:
-                self.bot.logs_collection.update_one(
+                await self.bot.storage.update_one(
+                    self.bot.logs_collection,
                     {"_id": "global"},
                     {"$set": {"enabled": False}},
                     upsert=True
                 )
+                if getattr(self.bot, "logger", None) is not None:
+                    self.bot.logger.invalidate(enabled=False)
                 
                 embed = discord.Embed(
                     title=self._translate(
@@ -625,7 +633,7 @@ class AdminCommands(commands.Cog):
                 default=new_language,
             )
 
-            success = bot.set_guild_language(guild_id_value, new_language)
+            success = await bot.set_guild_language(guild_id_value, new_language)
             if not success:
                 await interaction.followup.send(
                     self._translate(
@@ -808,7 +816,7 @@ class AdminCommands(commands.Cog):
         persisted = False
         saver = getattr(self.bot, "save_warp_setting", None)
         if callable(saver):
-            persisted = saver(self.bot.enable_warp_reconnect)
+            persisted = await saver(self.bot.enable_warp_reconnect)
 
         embed = discord.Embed(
             title=self._translate(
@@ -833,6 +841,7 @@ class AdminCommands(commands.Cog):
     )
     @app_commands.choices(
         action=[
+            app_commands.Choice(name="Restart Now (keep playback)", value="now"),
             app_commands.Choice(name="Schedule Restart", value="schedule"),
             app_commands.Choice(name="Cancel Scheduled Restart", value="cancel"),
             app_commands.Choice(name="Check Status", value="status"),
@@ -848,7 +857,30 @@ class AdminCommands(commands.Cog):
         
         action_value = action.value if action else "status"
         
-        if action_value == "schedule":
+        if action_value == "now":
+            # Reinicia já: as sessões Lavalink ficam gravadas e os players são retomados no próximo start
+            resumer = getattr(self.bot, "session_resumer", None)
+            if resumer is None or not resumer.enabled:
+                embed = discord.Embed(
+                    title="⚠️ Retomada de sessões desativada",
+                    description="`LAVALINK_RESUME_TIMEOUT_SECONDS` está em 0; use **Schedule Restart** para não derrubar as calls.",
+                    color=0xffaa00
+                )
+                return await interaction.response.send_message(embed=embed, ephemeral=True)
+
+            embed = discord.Embed(
+                title="🔄 Reiniciando",
+                description=f"As músicas continuam no Lavalink por até {resumer.resume_timeout}s e os players são retomados quando o bot voltar.",
+                color=0x00ff00
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+            import sys
+            print("🔄 Reinício imediato solicitado; preservando sessões Lavalink...")
+            await self.bot.close()
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+
+        elif action_value == "schedule":
             # Agenda o reinício
             if not hasattr(self.bot, "_restart_scheduled"):
                 self.bot._restart_scheduled = False
@@ -1048,6 +1080,9 @@ class AdminCommands(commands.Cog):
                 stats = await node.send("GET", path="/v4/stats")
             except Exception:
                 pass
+            scoreboard = getattr(self.bot, "node_scores", None)
+            if scoreboard is not None and isinstance(stats, dict):
+                scoreboard.record_stats(node_id, stats)
             
             # Cor baseada no status
             color = {
@@ -1073,20 +1108,22 @@ class AdminCommands(commands.Cog):
             # Tenta obter latência (igual ao /ping)
             latency_ms = None
             try:
-                import aiohttp
-                timeout = aiohttp.ClientTimeout(total=4)
                 headers = {"Authorization": cfg["password"]}
                 url = f"{protocol}://{host}:{port}/v4/info"
                 
                 start_time = time.perf_counter()
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(url, headers=headers) as resp:
-                        if resp.status < 500:
-                            end_time = time.perf_counter()
-                            latency_ms = int((end_time - start_time) * 1000)
+                async with self.bot.http_client.request(
+                    "GET", url, headers=headers, timeout=4, use_proxy=False
+                ) as resp:
+                    if resp.status < 500:
+                        end_time = time.perf_counter()
+                        latency_ms = int((end_time - start_time) * 1000)
             except Exception:
                 pass
             
+            if latency_ms is not None and scoreboard is not None:
+                scoreboard.record_latency(node_id, latency_ms)
+
             if latency_ms is not None:
                 # Emoji baseado na latência
                 if latency_ms <= 100:
@@ -1108,6 +1145,20 @@ class AdminCommands(commands.Cog):
                     inline=True,
                 )
             
+            # Pontuação de carga usada na escolha de node (menor = melhor)
+            if scoreboard is not None:
+                parts = scoreboard.breakdown(node)
+                embed.add_field(
+                    name="⚖️ Score",
+                    value=(
+                        f"`{sum(parts.values()):.1f}`\n"
+                        f"Players: `{parts['players']:.0f}` • CPU: `{parts['cpu']:.1f}`\n"
+                        f"Frames: `{parts['deficit'] + parts['nulled']:.1f}` • Falhas: `{parts['failures']:.0f}`\n"
+                        f"Latência: `{parts['latency']:.1f}`"
+                    ),
+                    inline=True,
+                )
+
             # Pega session_id do node
             session_id = getattr(node, "session_id", None)
             if session_id:
@@ -1198,11 +1249,176 @@ class AdminCommands(commands.Cog):
             
             embeds.append(embed)
         
-        # Envia todos os embeds
-        if len(embeds) == 1:
-            await interaction.followup.send(embed=embeds[0])
+        # Envia todos os embeds (o Discord aceita no máximo 10 por mensagem)
+        for start in range(0, len(embeds), 10):
+            await interaction.followup.send(embeds=embeds[start:start + 10])
+
+    @admin.command(name="node", description="Add, drain, remove or reload Lavalink nodes at runtime (owners only)")
+    @app_commands.describe(
+        action="Action to perform",
+        identifier="Node identifier (e.g. node3)",
+        host="Node host (add)",
+        port="Node port (add)",
+        password="Node password (add)",
+        secure="Use wss/https (add)",
+        name="Display name (add)",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="List", value="list"),
+            app_commands.Choice(name="Add / Update", value="add"),
+            app_commands.Choice(name="Drain (move players away)", value="drain"),
+            app_commands.Choice(name="Undrain", value="undrain"),
+            app_commands.Choice(name="Remove", value="remove"),
+            app_commands.Choice(name="Reload config", value="reload"),
+        ]
+    )
+    @app_commands.check(is_admin)
+    async def node_manage(
+        self,
+        interaction: discord.Interaction,
+        action: app_commands.Choice[str],
+        identifier: str | None = None,
+        host: str | None = None,
+        port: app_commands.Range[int, 1, 65535] | None = None,
+        password: str | None = None,
+        secure: bool | None = None,
+        name: str | None = None,
+    ):
+        """Gerencia o registro de nós Lavalink sem reiniciar o bot."""
+        import wavelink
+        from commands.node_registry import make_node_config, node_uri
+
+        registry = self.bot.node_registry
+        action_value = action.value
+        identifier = (identifier or "").strip()
+
+        if action_value != "list" and action_value != "reload" and not identifier:
+            embed = discord.Embed(
+                title="⚠️ Identificador obrigatório",
+                description="Informe o `identifier` do node para esta ação.",
+                color=0xffaa00
+            )
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        if action_value == "list":
+            lines = []
+            for cfg in registry.configs():
+                try:
+                    node = wavelink.Pool.get_node(cfg["id"])
+                    status_name = getattr(node.status, "name", str(node.status))
+                    players = len(node.players)
+                except wavelink.InvalidNodeException:
+                    status_name = "FORA DO POOL"
+                    players = 0
+                flag = " • 🚰 drain" if registry.is_draining(cfg["id"]) else ""
+                lines.append(f"`{cfg['id']}` {node_uri(cfg)} • {status_name} • {players} player(s){flag}")
+            stats = registry.stats()
+            description = "\n".join(lines) or "Nenhum node no registro."
+            embed = discord.Embed(
+                title=f"🎛️ Nodes Lavalink ({stats['nodes']})",
+                description=description[:4000],
+                color=0x5865f2
+            )
+            embed.set_footer(text=f"Store: {stats['store']} • adicionados em runtime: {stats['runtime']} • removidos: {stats['removed']}")
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        # Migrações e conexões podem levar alguns segundos
+        await interaction.response.defer(ephemeral=True)
+
+        if action_value == "add":
+            existing = registry.get(identifier)
+            node_host = (host or (existing or {}).get("host") or "").strip()
+            if not node_host:
+                embed = discord.Embed(
+                    title="⚠️ Host obrigatório",
+                    description="Informe o `host` para adicionar um node novo.",
+                    color=0xffaa00
+                )
+                return await interaction.followup.send(embed=embed, ephemeral=True)
+
+            # Campos omitidos mantêm o valor atual do node (ao atualizar)
+            cfg = make_node_config(
+                identifier,
+                node_host,
+                port or (existing or {}).get("port") or "2333",
+                password or (existing or {}).get("password") or "youshallnotpass",
+                secure=secure if secure is not None else bool((existing or {}).get("secure", False)),
+                name=(name or (existing or {}).get("name") or "").strip(),
+            )
+            result = await self.bot.add_lavalink_node(cfg)
+            try:
+                status_name = getattr(wavelink.Pool.get_node(identifier).status, "name", "?")
+            except wavelink.InvalidNodeException:
+                status_name = "FORA DO POOL"
+            description = f"`{identifier}` → {node_uri(cfg)}\n**Status:** `{status_name}`"
+            if identifier in result["failed"]:
+                embed = discord.Embed(
+                    title="⚠️ Node salvo, mas não conectou",
+                    description=f"{description}\nO watchdog tenta reconectar; confira host, porta e senha.",
+                    color=0xffaa00
+                )
+            elif identifier in result["blacklisted"]:
+                embed = discord.Embed(
+                    title="⚠️ Node salvo, mas está na blacklist",
+                    description=f"{description}\nCaiu há pouco; reconecta quando a blacklist expirar.",
+                    color=0xffaa00
+                )
+            else:
+                embed = discord.Embed(
+                    title="✅ Node atualizado" if identifier in result["changed"] or existing else "✅ Node adicionado",
+                    description=description,
+                    color=0x00ff00
+                )
+
+        elif action_value == "drain":
+            if identifier not in registry:
+                embed = discord.Embed(title="❌ Node não encontrado", description=f"`{identifier}` não está no registro.", color=0xff0000)
+                return await interaction.followup.send(embed=embed, ephemeral=True)
+            migrated, total = await self.bot.drain_lavalink_node(identifier)
+            embed = discord.Embed(
+                title="🚰 Node em drain",
+                description=(
+                    f"`{identifier}` não recebe players novos.\n"
+                    f"**Migrados:** {migrated}/{total} player(s)"
+                ),
+                color=0xffaa00 if migrated < total else 0x00ff00
+            )
+
+        elif action_value == "undrain":
+            undrained = registry.undrain(identifier)
+            embed = discord.Embed(
+                title="✅ Drain removido" if undrained else "ℹ️ Node não estava em drain",
+                description=f"`{identifier}`",
+                color=0x00ff00 if undrained else 0x5865f2
+            )
+
+        elif action_value == "remove":
+            removed = await self.bot.remove_lavalink_node(identifier)
+            embed = discord.Embed(
+                title="🗑️ Node removido" if removed else "❌ Node não encontrado",
+                description=(
+                    f"`{identifier}` saiu do pool; os players foram migrados para os demais nodes."
+                    if removed else f"`{identifier}` não está no registro."
+                ),
+                color=0x00ff00 if removed else 0xff0000
+            )
+
         else:
-            await interaction.followup.send(embeds=embeds)
+            result = await self.bot.reload_lavalink_nodes()
+            embed = discord.Embed(
+                title="🔄 Configuração recarregada",
+                description=(
+                    f"**Novos:** {', '.join(result['added']) or '—'}\n"
+                    f"**Alterados:** {', '.join(result['changed']) or '—'}\n"
+                    f"**Removidos:** {', '.join(result['removed']) or '—'}\n"
+                    f"**Sem conexão:** {', '.join(result['failed']) or '—'}\n"
+                    f"**Na blacklist:** {', '.join(result['blacklisted']) or '—'}"
+                ),
+                color=0xffaa00 if result["failed"] else 0x00ff00
+            )
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
 
 async def setup(bot):
@@ -82,11 +82,9 @@ class ClearQueueCommands(commands.Cog):
             )
             return None
 
-        if getattr(player, "text_channel", None) is None and interaction.channel:
-            try:
-                player.text_channel = interaction.channel
-            except Exception:
-                pass
+        state = self.bot.player_states.for_player(player)
+        if state.text_channel is None and interaction.channel:
+            state.text_channel = interaction.channel
 
         return player
 
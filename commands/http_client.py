@@ -0,0 +1,145 @@
+"""
+Cliente HTTP compartilhado por todos os cogs.
+Uma única aiohttp.ClientSession com keep-alive, limite de conexões por host, cache de DNS
+e o mesmo proxy do --proxy, além de métricas de latência/erros por host.
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_DNS_CACHE_TTL_SECONDS = int(os.getenv("HTTP_DNS_CACHE_TTL_SECONDS", "300"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "15"))
+HTTP_USER_AGENT = "KennyMusicBot/1.0 (+https://github.com/)"
+
+
+class _HostStats:
+    """Métricas acumuladas das requisições para um host."""
+
+    __slots__ = ("requests", "errors", "timeouts", "total_ms", "max_ms", "last_ms")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+        }
+
+
+class HttpClient:
+    """Sessão HTTP do bot: criada no setup_hook e fechada no close"""
+
+    def __init__(
+        self,
+        *,
+        proxy: Optional[str] = None,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl: int = HTTP_DNS_CACHE_TTL_SECONDS,
+        default_timeout: float = HTTP_DEFAULT_TIMEOUT,
+    ):
+        self.proxy = proxy or None
+        self.limit = max(1, limit)
+        self.limit_per_host = max(1, limit_per_host)
+        self.dns_cache_ttl = dns_cache_ttl
+        self.default_timeout = default_timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._hosts: dict[str, _HostStats] = {}
+
+    async def start(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+            headers={"User-Agent": HTTP_USER_AGENT},
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        return self._session
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Optional[float] = None,
+        use_proxy: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Faz uma requisição pelo pool compartilhado, registrando latência até os headers.
+
+        use_proxy=False para destinos que o bot acessa direto (ex.: nós Lavalink).
+        """
+        if self._session is None or self._session.closed:
+            await self.start()
+
+        host = urlparse(url).netloc or url
+        stats = self._hosts.setdefault(host, _HostStats())
+        if use_proxy and self.proxy:
+            kwargs.setdefault("proxy", self.proxy)
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        started = time.perf_counter()
+        responded = False
+        try:
+            async with self._session.request(method, url, **kwargs) as response:
+                responded = True
+                stats.record((time.perf_counter() - started) * 1000)
+                if response.status >= 500:
+                    stats.errors += 1
+                yield response
+        except asyncio.TimeoutError:
+            if not responded:
+                stats.timeouts += 1
+            raise
+        except aiohttp.ClientError:
+            if not responded:
+                stats.errors += 1
+            raise
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Latência e contadores por host."""
+        return {host: entry.as_dict() for host, entry in sorted(self._hosts.items())}
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
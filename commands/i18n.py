@@ -0,0 +1,113 @@
+"""
+Tabelas de tradução achatadas e pré-compiladas.
+Cada locale vira um dicionário plano "chave.pontilhada" -> LocaleTemplate, já com o
+fallback para o idioma padrão embutido, então o translate faz um único lookup.
+"""
+from string import Formatter
+from typing import Any
+
+
+_FORMATTER = Formatter()
+
+
+class LocaleTemplate:
+    """Template de tradução com o format string já analisado."""
+
+    __slots__ = ("text", "fields", "error", "_parts", "_simple")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.fields: frozenset[str] = frozenset()
+        self.error: str | None = None
+        self._parts: tuple | None = None
+        self._simple = True
+
+        parts: list = []
+        fields: set[str] = set()
+        try:
+            for literal, field_name, format_spec, conversion in _FORMATTER.parse(text):
+                if literal:
+                    parts.append(literal)
+                if field_name is None:
+                    continue
+                # Campos com atributo/índice, conversão ou spec aninhada ficam com o str.format
+                if not field_name.isidentifier() or conversion or (format_spec and "{" in format_spec):
+                    self._simple = False
+                fields.add(field_name.split(".", 1)[0].split("[", 1)[0])
+                parts.append((field_name, format_spec or ""))
+        except ValueError as exc:
+            self.error = str(exc)
+            return
+
+        self.fields = frozenset(fields)
+        self._parts = tuple(parts)
+
+    def render(self, values: dict[str, Any]) -> str:
+        if self._parts is None:
+            raise ValueError(self.error or "template inválido")
+        if not self._simple:
+            return self.text.format(**values)
+
+        out: list[str] = []
+        for part in self._parts:
+            if part.__class__ is str:
+                out.append(part)
+            else:
+                out.append(format(values[part[0]], part[1]))
+        return "".join(out)
+
+
+def flatten_locale(data: dict[str, Any], prefix: str = "") -> dict[str, str]:
+    """Converte o JSON aninhado de um locale em {"a.b.c": texto}."""
+    flat: dict[str, str] = {}
+    for key, value in data.items():
+        full_key = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten_locale(value, full_key))
+        elif isinstance(value, str):
+            flat[full_key] = value
+    return flat
+
+
+def build_locale_tables(
+    locales: dict[str, dict[str, Any]],
+    default_language: str,
+) -> dict[str, dict[str, LocaleTemplate]]:
+    """Compila todos os locales, validando placeholders contra o idioma padrão."""
+    compiled: dict[str, dict[str, LocaleTemplate]] = {}
+    for locale_code, data in locales.items():
+        compiled[locale_code] = {
+            key: LocaleTemplate(text)
+            for key, text in flatten_locale(data or {}).items()
+        }
+
+    base = compiled.setdefault(default_language, {})
+    tables: dict[str, dict[str, LocaleTemplate]] = {}
+
+    for locale_code, table in compiled.items():
+        broken: list[str] = []
+        mismatched: list[str] = []
+        for key, template in table.items():
+            if template.error:
+                broken.append(key)
+                continue
+            reference = base.get(key)
+            if reference is not None and locale_code != default_language and not template.fields <= reference.fields:
+                mismatched.append(key)
+
+        if broken:
+            print(f"⚠️ Locale '{locale_code}': {len(broken)} template(s) inválido(s): {', '.join(sorted(broken)[:5])}")
+        if mismatched:
+            print(
+                f"⚠️ Locale '{locale_code}': {len(mismatched)} chave(s) com placeholders diferentes de "
+                f"'{default_language}': {', '.join(sorted(mismatched)[:5])}"
+            )
+
+        if locale_code == default_language:
+            tables[locale_code] = dict(table)
+        else:
+            merged = dict(base)
+            merged.update(table)
+            tables[locale_code] = merged
+
+    return tables
@@ -143,7 +143,7 @@ class LanguageCommands(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        success = bot.set_guild_language(guild_id, new_language)
+        success = await bot.set_guild_language(guild_id, new_language)
         if not success:
             message = bot.translate("commands.language.success.save_failed", guild_id=guild_id, locale=current_language)
             await interaction.followup.send(message, ephemeral=True)
@@ -1,11 +1,27 @@
 """
 Sistema de logs para o bot de música.
 Envia embeds para um canal de logs configurado via variável de ambiente LOG_CHANNEL_ID.
+Os eventos entram numa fila em memória e são enviados em lote (até 10 embeds por mensagem)
+por uma tarefa de fundo; o canal e a flag de habilitado ficam em cache.
 """
+import asyncio
 import discord
 import os
+import time
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
+
+
+# Embeds por mensagem (limite do Discord: 10 embeds e 6000 caracteres somados)
+LOG_BATCH_MAX_EMBEDS = 10
+LOG_BATCH_MAX_CHARS = 6000
+LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "3"))
+LOG_QUEUE_MAX_EVENTS = int(os.getenv("LOG_QUEUE_MAX_EVENTS", "500"))
+# "oldest" descarta o evento mais antigo quando a fila enche; "newest" descarta o que está chegando
+LOG_DROP_POLICY = os.getenv("LOG_DROP_POLICY", "oldest").strip().lower()
+# Rechecagem da flag no MongoDB (o /admin logs invalida na hora; isso cobre mudanças externas)
+LOG_ENABLED_CACHE_TTL_SECONDS = float(os.getenv("LOG_ENABLED_CACHE_TTL_SECONDS", "300"))
 
 
 class BotLogger:
@@ -15,6 +31,18 @@ class BotLogger:
         self.bot = bot
         self._log_channel_id: Optional[int] = None
         self._load_log_channel()
+        self._channel: Optional[discord.abc.Messageable] = None
+        self._enabled: Optional[bool] = None
+        self._enabled_checked_at = 0.0
+        self._queue: deque[discord.Embed] = deque()
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+        self.sent_events = 0
+        self.sent_messages = 0
+        self.dropped_events = 0
+        self.disabled_events = 0
+        self.failed_events = 0
     
     def _load_log_channel(self) -> None:
         """Carrega o ID do canal de logs da variável de ambiente"""
@@ -25,32 +53,55 @@ class BotLogger:
             self._log_channel_id = None
     
     async def _get_log_channel(self) -> Optional[discord.TextChannel]:
-        """Obtém o canal de logs"""
+        """Obtém o canal de logs (do cache do gateway quando possível; REST só na primeira vez)"""
         if self._log_channel_id is None:
             return None
+        if self._channel is not None:
+            return self._channel
         
-        try:
-            channel = await self.bot.fetch_channel(self._log_channel_id)
-            if isinstance(channel, discord.TextChannel):
-                return channel
-        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-            pass
+        channel = self.bot.get_channel(self._log_channel_id)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(self._log_channel_id)
+            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+                channel = None
         
+        if isinstance(channel, discord.TextChannel):
+            self._channel = channel
+            return channel
         return None
     
     async def _is_logging_enabled(self) -> bool:
-        """Verifica se os logs estão habilitados no MongoDB"""
-        if not hasattr(self.bot, 'logs_collection') or self.bot.logs_collection is None:
+        """Verifica se os logs estão habilitados no MongoDB (valor em cache)"""
+        storage = getattr(self.bot, 'storage', None)
+        if storage is None or getattr(self.bot, 'logs_collection', None) is None:
             return True  # Se não há MongoDB, assume que está habilitado
         
+        if self._enabled is not None and time.monotonic() - self._enabled_checked_at < LOG_ENABLED_CACHE_TTL_SECONDS:
+            return self._enabled
+        
         try:
-            config = self.bot.logs_collection.find_one({"_id": "global"})
-            if config:
-                return config.get("enabled", True)
-            return True  # Padrão: habilitado
+            config = await storage.find_one(self.bot.logs_collection, {"_id": "global"})
+            enabled = config.get("enabled", True) if config else True  # Padrão: habilitado
         except Exception as exc:
             print(f"Erro ao verificar status de logs no MongoDB: {exc}")
             return True
+        
+        self._enabled = bool(enabled)
+        self._enabled_checked_at = time.monotonic()
+        return self._enabled
+    
+    def invalidate(self, *, enabled: Optional[bool] = None) -> None:
+        """Descarta o cache do canal e da flag (chamado pelo /admin logs).
+
+        Com enabled informado o novo valor já fica em cache, sem ir ao MongoDB.
+        """
+        self._channel = None
+        self._enabled = enabled
+        self._enabled_checked_at = time.monotonic() if enabled is not None else 0.0
+        if enabled is False and self._queue:
+            self.disabled_events += len(self._queue)
+            self._queue.clear()
 
     def _translate(
         self,
@@ -83,20 +134,104 @@ class BotLogger:
         return default
     
     async def _send_log(self, embed: discord.Embed) -> bool:
-        """Envia uma embed para o canal de logs se estiver habilitado"""
-        if not await self._is_logging_enabled():
+        """Coloca uma embed na fila de envio. Retorna False se ela foi descartada."""
+        if self._log_channel_id is None or self._closing:
             return False
-        
-        channel = await self._get_log_channel()
-        if channel is None:
+        if self._enabled is False and time.monotonic() - self._enabled_checked_at < LOG_ENABLED_CACHE_TTL_SECONDS:
+            self.disabled_events += 1
             return False
         
+        if len(self._queue) >= LOG_QUEUE_MAX_EVENTS:
+            self.dropped_events += 1
+            if LOG_DROP_POLICY == "newest":
+                return False
+            self._queue.popleft()
+        self._queue.append(embed)
+        
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        if len(self._queue) >= LOG_BATCH_MAX_EMBEDS:
+            self._wakeup.set()
+        return True
+    
+    def _next_batch(self) -> list[discord.Embed]:
+        """Tira da fila até 10 embeds respeitando o limite de caracteres por mensagem."""
+        batch: list[discord.Embed] = []
+        chars = 0
+        while self._queue and len(batch) < LOG_BATCH_MAX_EMBEDS:
+            size = len(self._queue[0])
+            if batch and chars + size > LOG_BATCH_MAX_CHARS:
+                break
+            batch.append(self._queue.popleft())
+            chars += size
+        return batch
+    
+    async def _flush(self) -> None:
+        while self._queue:
+            if not await self._is_logging_enabled():
+                self.disabled_events += len(self._queue)
+                self._queue.clear()
+                return
+            
+            channel = await self._get_log_channel()
+            if channel is None:
+                self.failed_events += len(self._queue)
+                self._queue.clear()
+                return
+            
+            batch = self._next_batch()
+            try:
+                await channel.send(embeds=batch)
+                self.sent_events += len(batch)
+                self.sent_messages += 1
+            except (discord.NotFound, discord.Forbidden) as exc:
+                # Canal apagado ou sem permissão: busca de novo no próximo envio
+                self._channel = None
+                self.failed_events += len(batch)
+                print(f"Erro ao enviar log: {exc}")
+            except discord.HTTPException as exc:
+                self.failed_events += len(batch)
+                print(f"Erro ao enviar log: {exc}")
+    
+    async def _run(self) -> None:
+        """Envia a fila a cada LOG_FLUSH_INTERVAL_SECONDS ou assim que um lote enche."""
+        while self._queue and not self._closing:
+            # Lote já cheio (o set pode ter vindo antes do worker chegar aqui): envia sem esperar
+            if len(self._queue) < LOG_BATCH_MAX_EMBEDS:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=LOG_FLUSH_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            try:
+                await self._flush()
+            except Exception as exc:
+                print(f"Erro no envio de logs em lote: {exc}")
+    
+    async def close(self) -> None:
+        """Envia o que ainda está na fila antes do bot desligar."""
+        self._closing = True
+        self._wakeup.set()
+        worker, self._worker = self._worker, None
+        if worker is not None and not worker.done():
+            try:
+                await asyncio.wait_for(worker, timeout=10)
+            except (asyncio.TimeoutError, asyncio.CancelledError, Exception):
+                pass
         try:
-            await channel.send(embed=embed)
-            return True
-        except (discord.Forbidden, discord.HTTPException) as exc:
-            print(f"Erro ao enviar log: {exc}")
-            return False
+            await asyncio.wait_for(self._flush(), timeout=10)
+        except Exception as exc:
+            print(f"Erro ao enviar logs pendentes: {exc}")
+    
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "sent_events": self.sent_events,
+            "sent_messages": self.sent_messages,
+            "dropped": self.dropped_events,
+            "disabled": self.disabled_events,
+            "failed": self.failed_events,
+        }
     
     async def log_guild_join(self, guild: discord.Guild) -> None:
         """Registra quando o bot entra em um servidor, respeitando o idioma local."""
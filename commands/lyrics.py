@@ -1,5 +1,8 @@
 import asyncio
+import bisect
 import re
+import time
+from collections import Counter, deque
 
 import aiohttp
 import discord
@@ -7,9 +10,71 @@ import wavelink
 from discord import app_commands
 from discord.ext import commands
 
+from commands import hedged_search
+from commands.lyrics_cache import DiskLyricsStore, LyricsCache, MongoLyricsStore
+
 
 LRCLIB_API_BASE = "https://lrclib.net/api"
+# Marca uma consulta que falhou (timeout, erro HTTP) para não ser confundida com "não encontrado"
+_LRCLIB_FAILED = object()
+# Consultas ao LRCLib em paralelo: ISRC + as variantes de busca mais bem colocadas
+LRCLIB_FANOUT_WIDTH = 4
+LRCLIB_PRIORITY_GRACE_SECONDS = 1.0
+LRCLIB_DEADLINE_SECONDS = 8.0
 _TIMESTAMP_REGEX = re.compile(r"\[(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\]")
+# Largura do intervalo de duração usado na chave do cache (LRCLib aceita ~2s de diferença)
+LYRICS_CACHE_DURATION_BUCKET_SECONDS = 5
+
+# Antecipação da troca de linha (a linha aparece um pouco antes do timestamp)
+LYRICS_LINE_LOOKAHEAD_MS = 250
+# Teto do sono de uma sessão: seek/pausa feitos por outros comandos são percebidos nesse prazo
+LYRICS_SYNC_MAX_SLEEP_SECONDS = 3.0
+# Orçamento de edições por canal (o Discord permite ~5 por 5s, dividido com outras mensagens)
+LYRICS_CHANNEL_EDIT_BUDGET = 4
+LYRICS_CHANNEL_EDIT_WINDOW_SECONDS = 5.0
+
+# Prefetch da letra do próximo track: só em servidores que usaram letras há pouco tempo
+LYRICS_PREFETCH_ACTIVE_WINDOW_SECONDS = 30 * 60
+# Espera após o início do track (não disputa com o embed de "tocando agora" e com /lyrics)
+LYRICS_PREFETCH_DELAY_SECONDS = 3.0
+LYRICS_PREFETCH_MAX_CONCURRENCY = 2
+
+
+class _LyricsSession:
+    """Estado de uma sessão de letra sincronizada."""
+
+    __slots__ = (
+        "guild_id", "channel_id", "interaction", "message", "player", "track", "lyrics_data",
+        "timed_lines", "timestamps", "ephemeral", "last_index", "failures", "due", "editing",
+    )
+
+    def __init__(
+        self,
+        *,
+        interaction: discord.Interaction,
+        message: discord.Message,
+        player: wavelink.Player,
+        track: wavelink.Playable,
+        lyrics_data: dict,
+        timed_lines: list[dict],
+        channel_id: int,
+        ephemeral: bool,
+        last_index: int | None,
+    ) -> None:
+        self.guild_id = interaction.guild_id
+        self.channel_id = channel_id
+        self.interaction = interaction
+        self.message = message
+        self.player = player
+        self.track = track
+        self.lyrics_data = lyrics_data
+        self.timed_lines = timed_lines
+        self.timestamps = [entry["timestamp"] for entry in timed_lines]
+        self.ephemeral = ephemeral
+        self.last_index = last_index
+        self.failures = 0
+        self.due = 0.0
+        self.editing = False
 
 
 class LyricsStopView(discord.ui.View):
@@ -71,8 +136,27 @@ class LyricsStopView(discord.ui.View):
 class LyricsCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self._sync_tasks: dict[int, asyncio.Task] = {}
+        # Uma única tarefa agenda todas as sessões de letra sincronizada
+        self._sync_sessions: dict[int, _LyricsSession] = {}  # guild_id -> sessão
+        self._sync_task: asyncio.Task | None = None
+        self._sync_wakeup = asyncio.Event()
+        self._channel_edits: dict[int, deque[float]] = {}  # channel_id -> horários das últimas edições
         self._active_lyrics_channels: dict[int, int] = {}  # channel_id -> guild_id
+        # Prefetch da letra do próximo track
+        self._lyrics_activity: dict[int, float] = {}  # guild_id -> último uso de letras (monotonic)
+        self._prefetch_tasks: dict[int, asyncio.Task] = {}  # guild_id -> prefetch agendado
+        self._prefetch_semaphore = asyncio.Semaphore(LYRICS_PREFETCH_MAX_CONCURRENCY)
+        self._prefetch_stats: Counter[str] = Counter()
+        # Buscas no LRCLib em andamento por chave (prefetch e /lyrics compartilham a mesma)
+        self._inflight_fetches: dict[str, asyncio.Task] = {}
+
+        if getattr(bot, "storage", None) is not None and getattr(bot, "mongo_db", None) is not None:
+            store = MongoLyricsStore(bot.storage, bot.mongo_db["lyrics_cache"])
+        else:
+            store = DiskLyricsStore()
+        self.lyrics_cache = LyricsCache(store)
+        # Quantas vezes cada variante de consulta trouxe a letra (reordena as buscas)
+        self._variant_wins: Counter[str] = Counter()
 
     def _translate(self, interaction, key, default="Translation missing", **kwargs):
         return self.bot.translate(key, guild_id=interaction.guild_id, default=default, **kwargs)
@@ -80,31 +164,176 @@ class LyricsCommands(commands.Cog):
     def cleanup_guild_lyrics(self, guild_id: int) -> None:
         """Limpa letras ativas quando o bot desconecta do servidor."""
         self._cancel_sync_task(guild_id)
+        self._cancel_prefetch(guild_id)
 
-    async def fetch_lyrics(self, player: wavelink.Player, track: wavelink.Playable) -> dict | None:
-        return await self._fetch_from_lrclib(track)
+    def _lyrics_cache_key(self, track: wavelink.Playable) -> str:
+        """ISRC quando existir; senão título/artista normalizados + faixa de duração."""
+        isrc = self._extract_track_isrc(track)
+        if isrc:
+            return f"isrc:{isrc.upper()}"
 
-    async def _fetch_from_lrclib(self, track: wavelink.Playable) -> dict | None:
+        title = " ".join(self._sanitize_metadata(getattr(track, "title", "") or "").casefold().split())
+        artist = self._strip_feature_credit(self._sanitize_metadata(getattr(track, "author", "") or ""))
+        artist = " ".join(artist.casefold().split())
+        duration_ms = getattr(track, "length", None)
+        bucket = ""
+        if isinstance(duration_ms, (int, float)) and duration_ms > 0:
+            bucket = str(int(round(duration_ms / 1000 / LYRICS_CACHE_DURATION_BUCKET_SECONDS)))
+        return f"meta:{title}|{artist}|{bucket}"
+
+    async def fetch_lyrics(self, player: wavelink.Player, track: wavelink.Playable) -> dict | None:
         if track is None:
             return None
 
-        payload: dict | None = None
+        key = self._lyrics_cache_key(track)
+        found, cached = await self.lyrics_cache.get(key)
+        if not found:
+            cached = await self._resolve_lyrics(key, track)
+
+        if cached is None:
+            return None
+
+        # Campos do track atual (a mesma letra pode vir de outra versão com o mesmo ISRC)
+        result = dict(cached)
+        result["thumbnail"] = getattr(track, "artwork", None)
+        result["url"] = getattr(track, "uri", None)
+        return result
+
+    async def _resolve_lyrics(self, key: str, track: wavelink.Playable) -> dict | None:
+        """Busca no LRCLib e grava no cache, reaproveitando uma busca já em andamento para a mesma chave."""
+        task = self._inflight_fetches.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch_and_store(key, track))
+            self._inflight_fetches[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight_fetches.pop(k, None))
+        # shield: cancelar quem espera (ex.: prefetch) não cancela a busca de quem também depende dela
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: str, track: wavelink.Playable) -> dict | None:
+        result, definitive = await self._fetch_from_lrclib(track)
+        # Falhas de rede não viram "sem letra" em cache
+        if result is not None or definitive:
+            self.lyrics_cache.put(key, result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Prefetch da letra do próximo track
+    # ------------------------------------------------------------------
+    def _mark_lyrics_activity(self, guild_id: int | None) -> None:
+        if guild_id is not None:
+            self._lyrics_activity[guild_id] = time.monotonic()
+
+    def _lyrics_recently_active(self, guild_id: int) -> bool:
+        last_used = self._lyrics_activity.get(guild_id)
+        if last_used is None:
+            return False
+        if guild_id in self._sync_sessions or time.monotonic() - last_used < LYRICS_PREFETCH_ACTIVE_WINDOW_SECONDS:
+            return True
+        self._lyrics_activity.pop(guild_id, None)
+        return False
+
+    def schedule_prefetch(self, player: wavelink.Player | None, *, delay: float = LYRICS_PREFETCH_DELAY_SECONDS) -> None:
+        """Agenda o prefetch da letra de player.queue[0] (substitui um prefetch pendente do mesmo servidor)."""
+        guild = getattr(player, "guild", None)
+        if guild is None or not self._lyrics_recently_active(guild.id):
+            return
+
+        self._cancel_prefetch(guild.id)
+        task = self.bot.loop.create_task(self._prefetch_next(player, guild.id, delay))
+        self._prefetch_tasks[guild.id] = task
+        self._prefetch_stats["scheduled"] += 1
+
+    def _cancel_prefetch(self, guild_id: int) -> None:
+        task = self._prefetch_tasks.pop(guild_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def _prefetch_next(self, player: wavelink.Player, guild_id: int, delay: float) -> None:
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Com loop de faixa o próximo é o próprio track atual, que já foi buscado
+            queue = getattr(player, "queue", None)
+            if queue is None or not queue or getattr(queue, "mode", None) == wavelink.QueueMode.loop:
+                self._prefetch_stats["skipped"] += 1
+                return
+            try:
+                next_track = queue[0]
+            except IndexError:
+                self._prefetch_stats["skipped"] += 1
+                return
+
+            key = self._lyrics_cache_key(next_track)
+            found, _ = await self.lyrics_cache.get(key, record=False)
+            if found:
+                self._prefetch_stats["cached"] += 1
+                return
+
+            async with self._prefetch_semaphore:
+                result = await self._resolve_lyrics(key, next_track)
+            self._prefetch_stats["fetched" if result is not None else "not_found"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._prefetch_stats["errors"] += 1
+            print(f"[Lyrics] Falha no prefetch da próxima letra (guild {guild_id}): {exc}")
+        finally:
+            if self._prefetch_tasks.get(guild_id) is asyncio.current_task():
+                self._prefetch_tasks.pop(guild_id, None)
+
+    def prefetch_stats(self) -> dict[str, int]:
+        return dict(self._prefetch_stats)
+
+    @commands.Cog.listener()
+    async def on_wavelink_track_start(self, payload: wavelink.TrackStartEventPayload) -> None:
+        self.schedule_prefetch(getattr(payload, "player", None))
+
+    async def _fetch_from_lrclib(self, track: wavelink.Playable) -> tuple[dict | None, bool]:
+        """Retorna (letra, definitivo). definitivo=False se alguma consulta falhou por rede/servidor."""
+        if track is None:
+            return None, True
 
+        attempts: list[tuple[str, str, dict[str, str | int]]] = []
         isrc = self._extract_track_isrc(track)
         if isrc:
-            payload = await self._lrclib_request("get", {"isrc": isrc})
-
-        if payload is None:
-            for params in self._build_lrclib_queries(track):
-                results = await self._lrclib_request("search", params) or []
-                if not isinstance(results, list):
-                    continue
-                payload = self._select_lrclib_result(results, track)
-                if payload is not None:
-                    break
+            attempts.append(("get", "isrc", {"isrc": isrc}))
+        attempts.extend(("search", variant, params) for variant, params in self._ordered_lrclib_queries(track))
+
+        answered: set[int] = set()
+
+        async def _query(attempt: tuple[int, tuple[str, str, dict]]) -> tuple[str, dict] | None:
+            position, (endpoint, variant, params) = attempt
+            response = await self._lrclib_request(endpoint, params)
+            if response is _LRCLIB_FAILED:
+                return None
+            answered.add(position)
+            if endpoint == "get":
+                return (variant, response) if isinstance(response, dict) else None
+            if not isinstance(response, list):
+                return None
+            selected = self._select_lrclib_result(response, track)
+            return (variant, selected) if selected is not None else None
+
+        winner = await hedged_search(
+            _query,
+            list(enumerate(attempts)),
+            stagger=0.0,
+            max_in_flight=LRCLIB_FANOUT_WIDTH,
+            priority_grace=LRCLIB_PRIORITY_GRACE_SECONDS,
+            deadline=LRCLIB_DEADLINE_SECONDS,
+            normalize=lambda value: value,
+        )
+
+        if winner is None:
+            # Só é "sem letra" de verdade se todas as consultas responderam
+            return None, len(answered) == len(attempts)
+
+        variant, payload = winner
+        self._variant_wins[variant] += 1
 
         if not isinstance(payload, dict):
-            return None
+            return None, True
 
         timed_lines = self._parse_synced_lyrics(payload.get("syncedLyrics"), getattr(track, "length", None))
 
@@ -115,7 +344,7 @@ class LyricsCommands(commands.Cog):
             cleaned = "\n".join(filter(None, collected)) or None
 
         if cleaned is None and not timed_lines:
-            return None
+            return None, True
         cleaned = cleaned or ""
 
         language = payload.get("language")
@@ -133,41 +362,47 @@ class LyricsCommands(commands.Cog):
             "url": getattr(track, "uri", None),
             "source": source_label,
             "timed_lines": timed_lines,
-        }
+        }, True
 
-    async def _lrclib_request(self, endpoint: str, params: dict[str, str | int]) -> dict | list | None:
+    async def _lrclib_request(self, endpoint: str, params: dict[str, str | int]) -> dict | list | object | None:
         url = f"{LRCLIB_API_BASE}/{endpoint}"
-        timeout = aiohttp.ClientTimeout(total=12)
-        headers = {"User-Agent": "KennyMusicBot/1.0 (+https://github.com/)"}
 
         try:
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 404:
-                        return None
-                    if response.status != 200:
-                        body = await response.text()
-                        print(f"LRCLib request failed ({response.status}): {body[:200]}")
-                        return None
-                    return await response.json(content_type=None)
+            async with self.bot.http_client.request("GET", url, params=params, timeout=12) as response:
+                if response.status == 404:
+                    return None
+                if response.status != 200:
+                    body = await response.text()
+                    print(f"LRCLib request failed ({response.status}): {body[:200]}")
+                    return _LRCLIB_FAILED if response.status >= 500 or response.status == 429 else None
+                return await response.json(content_type=None)
         except asyncio.TimeoutError:
             print(f"Timeout ao consultar LRCLib em {endpoint} com {params}")
         except aiohttp.ClientError as exc:
             print(f"Falha HTTP ao consultar LRCLib: {exc}")
         except Exception as exc:  # noqa: BLE001
             print(f"Erro inesperado durante consulta ao LRCLib: {exc}")
-        return None
+        return _LRCLIB_FAILED
+
+    def _ordered_lrclib_queries(self, track: wavelink.Playable) -> list[tuple[str, dict[str, str | int]]]:
+        """Variantes de busca, das que mais venceram para as que menos venceram (empate: ordem original)."""
+        queries = self._build_lrclib_queries(track)
+        order = {variant: index for index, (variant, _) in enumerate(queries)}
+        return sorted(queries, key=lambda item: (-self._variant_wins[item[0]], order[item[0]]))
 
-    def _build_lrclib_queries(self, track: wavelink.Playable) -> list[dict[str, str | int]]:
+    def lrclib_variant_stats(self) -> dict[str, int]:
+        return dict(self._variant_wins.most_common())
+
+    def _build_lrclib_queries(self, track: wavelink.Playable) -> list[tuple[str, dict[str, str | int]]]:
         title = getattr(track, "title", "") or ""
         artist = getattr(track, "author", "") or ""
         duration_ms = getattr(track, "length", None)
         duration_seconds = int(round(duration_ms / 1000)) if isinstance(duration_ms, (int, float)) and duration_ms > 0 else None
 
-        queries: list[dict[str, str | int]] = []
+        queries: list[tuple[str, dict[str, str | int]]] = []
         seen: set[tuple[str, str, int | None]] = set()
 
-        def add_query(track_name: str, artist_name: str) -> None:
+        def add_query(variant: str, track_name: str, artist_name: str) -> None:
             query_key = (track_name, artist_name, duration_seconds)
             if query_key in seen:
                 return
@@ -178,23 +413,23 @@ class LyricsCommands(commands.Cog):
             }
             if duration_seconds:
                 payload["duration"] = duration_seconds
-            queries.append(payload)
+            queries.append((variant, payload))
 
-        add_query(title.strip(), artist.strip())
+        add_query("raw", title.strip(), artist.strip())
 
         normalized_title = self._sanitize_metadata(title)
         normalized_artist = self._sanitize_metadata(artist)
-        add_query(normalized_title, normalized_artist)
+        add_query("sanitized", normalized_title, normalized_artist)
 
         alt_artist = self._strip_feature_credit(normalized_artist)
         if alt_artist != normalized_artist:
-            add_query(normalized_title, alt_artist)
+            add_query("no_feat", normalized_title, alt_artist)
 
         if " - " in normalized_title:
             main_title = normalized_title.split(" - ", 1)[0].strip()
-            add_query(main_title, alt_artist)
+            add_query("main_title", main_title, alt_artist)
 
-        add_query(normalized_title, "")
+        add_query("title_only", normalized_title, "")
         return queries
 
     def _select_lrclib_result(self, results: list[dict], track: wavelink.Playable) -> dict | None:
@@ -391,9 +626,7 @@ class LyricsCommands(commands.Cog):
         return joined or None
 
     def _cancel_sync_task(self, guild_id: int) -> None:
-        task = self._sync_tasks.pop(guild_id, None)
-        if task:
-            task.cancel()
+        self._sync_sessions.pop(guild_id, None)
         
         # Remove qualquer canal ativo deste servidor quando a tarefa é cancelada
         channels_to_remove = [
@@ -432,7 +665,7 @@ class LyricsCommands(commands.Cog):
         if not ephemeral and channel_id in self._active_lyrics_channels:
             # Verifica se a tarefa de sync realmente existe e está rodando
             guild_id = self._active_lyrics_channels[channel_id]
-            sync_task = self._sync_tasks.get(guild_id)
+            sync_session = self._sync_sessions.get(guild_id)
 
             # Se a "sessão" é do mesmo servidor, preferimos auto-recuperar:
             # cancela o sync anterior e permite reiniciar as letras no mesmo canal.
@@ -442,7 +675,7 @@ class LyricsCommands(commands.Cog):
                 except Exception:
                     pass
                 self._active_lyrics_channels.pop(channel_id, None)
-                sync_task = None
+                sync_session = None
 
             # Se o bot nem está mais em voz, limpa estado preso
             try:
@@ -451,12 +684,12 @@ class LyricsCommands(commands.Cog):
                 if voice_client is None or not getattr(voice_client, "connected", False):
                     self._active_lyrics_channels.pop(channel_id, None)
                     self._cancel_sync_task(guild_id)
-                    sync_task = None
+                    sync_session = None
             except Exception:
                 pass
             
-            # Se não há tarefa ou a tarefa já terminou, limpa o canal da lista
-            if sync_task is None or sync_task.done():
+            # Se não há sessão de sincronização ativa, limpa o canal da lista
+            if sync_session is None:
                 self._active_lyrics_channels.pop(channel_id, None)
             else:
                 # Tarefa realmente existe e está ativa, mostra aviso
@@ -532,7 +765,10 @@ class LyricsCommands(commands.Cog):
         except (discord.NotFound, discord.HTTPException):
             message = None
 
+        self._mark_lyrics_activity(interaction.guild_id)
         lyrics_data = await self.fetch_lyrics(resolved_player, current_track)
+        # Já deixa a letra do próximo track pronta
+        self.schedule_prefetch(resolved_player, delay=0.0)
 
         guild_id = interaction.guild_id
         if guild_id is not None:
@@ -597,97 +833,198 @@ class LyricsCommands(commands.Cog):
             self._active_lyrics_channels[channel_id] = guild_id
 
         if timed_lines and guild_id is not None and message is not None:
-            task = self.bot.loop.create_task(
-                self._sync_lyrics_task(
-                    interaction=interaction,
-                    message=message,
-                    player=resolved_player,
-                    track=current_track,
-                    lyrics_data=lyrics_data,
-                    channel_id=channel_id,
-                    ephemeral=ephemeral,
-                )
+            session = _LyricsSession(
+                interaction=interaction,
+                message=message,
+                player=resolved_player,
+                track=current_track,
+                lyrics_data=lyrics_data,
+                timed_lines=timed_lines,
+                channel_id=channel_id,
+                ephemeral=ephemeral,
+                last_index=current_index,
             )
-            self._sync_tasks[guild_id] = task
-
-    async def _sync_lyrics_task(
-        self,
-        interaction: discord.Interaction,
-        message: discord.Message,
-        player: wavelink.Player,
-        track: wavelink.Playable,
-        lyrics_data: dict,
-        channel_id: int,
-        ephemeral: bool,
-    ) -> None:
-        guild_id = interaction.guild_id
-        timed_lines = [entry for entry in lyrics_data.get("timed_lines", []) if isinstance(entry, dict)]
-        if not timed_lines:
-            return
-
-        last_index: int | None = None
-        consecutive_edit_failures = 0
-        was_cancelled = False
+            self._register_sync_session(session)
 
+    @staticmethod
+    def _playback_rate(player: wavelink.Player) -> float:
+        """Velocidade real da reprodução (timescale speed x rate, ex.: nightcore)."""
         try:
-            while True:
-                current_track = getattr(player, "current", None)
-                if not current_track or current_track.identifier != track.identifier:
-                    break
-
-                # Se o bot desconectou do canal de voz, encerra o sync
-                if not getattr(player, "connected", True):
+            payload = player.filters.timescale.payload
+        except Exception:
+            return 1.0
+        speed = payload.get("speed") or 1.0
+        rate = payload.get("rate") or 1.0
+        return max(0.1, float(speed) * float(rate))
+
+    def _estimate_position(self, player: wavelink.Player, rate: float) -> int:
+        """Posição atual corrigida pela velocidade (o wavelink interpola sempre em 1x)."""
+        position = getattr(player, "position", 0) or 0
+        last_update = getattr(player, "_last_update", None)
+        last_position = getattr(player, "_last_position", None)
+        if getattr(player, "paused", False) or last_update is None or last_position is None or rate == 1.0:
+            return position
+
+        elapsed_ms = (time.monotonic_ns() - last_update) / 1_000_000
+        estimated = int(last_position + elapsed_ms * rate)
+        length = getattr(getattr(player, "current", None), "length", None)
+        return min(estimated, length) if length else estimated
+
+    def _register_sync_session(self, session: _LyricsSession) -> None:
+        self._sync_sessions[session.guild_id] = session
+        self._mark_lyrics_activity(session.guild_id)
+        session.due = 0.0
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = self.bot.loop.create_task(self._run_sync_scheduler())
+        self._sync_wakeup.set()
+
+    def notify_playback_changed(self, guild_id: int | None) -> None:
+        """Reavalia a sessão na hora (seek, pausa, filtro ou novo playerUpdate)."""
+        session = self._sync_sessions.get(guild_id) if guild_id is not None else None
+        if session is not None:
+            session.due = 0.0
+            self._sync_wakeup.set()
+
+    @commands.Cog.listener()
+    async def on_wavelink_player_update(self, payload: wavelink.PlayerUpdateEventPayload) -> None:
+        player = getattr(payload, "player", None)
+        guild = getattr(player, "guild", None)
+        if guild is not None:
+            self.notify_playback_changed(guild.id)
+
+    def _channel_budget_wait(self, channel_id: int, now: float) -> float:
+        """Segundos até o canal poder receber outra edição (0 = pode editar já)."""
+        edits = self._channel_edits.setdefault(channel_id, deque())
+        while edits and now - edits[0] >= LYRICS_CHANNEL_EDIT_WINDOW_SECONDS:
+            edits.popleft()
+        if len(edits) < LYRICS_CHANNEL_EDIT_BUDGET:
+            return 0.0
+        return LYRICS_CHANNEL_EDIT_WINDOW_SECONDS - (now - edits[0])
+
+    def _session_finished(self, session: _LyricsSession) -> bool:
+        player = session.player
+        current_track = getattr(player, "current", None)
+        if not current_track or current_track.identifier != session.track.identifier:
+            return True
+        # Se o bot desconectou do canal de voz, encerra o sync
+        if not getattr(player, "connected", True):
+            return True
+        # Se não está mais tocando (fila acabou/desconectou), encerra o sync
+        return not getattr(player, "playing", True) and not getattr(player, "paused", False)
+
+    def _schedule_next(self, session: _LyricsSession, now: float, position_ms: int, rate: float, paused: bool) -> None:
+        """Dorme até a próxima troca de linha (limitado pelo teto para perceber seek/pausa)."""
+        delay = LYRICS_SYNC_MAX_SLEEP_SECONDS
+        if not paused:
+            next_index = bisect.bisect_right(session.timestamps, position_ms + LYRICS_LINE_LOOKAHEAD_MS)
+            if next_index < len(session.timestamps):
+                boundary_ms = session.timestamps[next_index] - LYRICS_LINE_LOOKAHEAD_MS
+                delay = min(delay, max(0.0, (boundary_ms - position_ms) / 1000 / rate))
+        session.due = now + delay
+
+    async def _run_sync_scheduler(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._sync_sessions:
+                now = loop.time()
+                for session in list(self._sync_sessions.values()):
+                    if session.due > now or session.editing:
+                        continue
+
+                    if self._session_finished(session):
+                        self._finish_sync_session(session)
+                        continue
+
+                    rate = self._playback_rate(session.player)
+                    paused = bool(getattr(session.player, "paused", False))
+                    position_ms = self._estimate_position(session.player, rate)
+                    current_index = max(
+                        0, bisect.bisect_right(session.timestamps, position_ms + LYRICS_LINE_LOOKAHEAD_MS) - 1
+                    )
+
+                    if current_index != session.last_index:
+                        wait = self._channel_budget_wait(session.channel_id, now)
+                        if wait > 0:
+                            session.due = now + wait
+                            continue
+                        self._channel_edits[session.channel_id].append(now)
+                        session.editing = True
+                        loop.create_task(self._edit_sync_session(session, current_index))
+
+                    self._schedule_next(session, now, position_ms, rate, paused)
+
+                if not self._sync_sessions:
                     break
 
-                # Se não está mais tocando (fila acabou/desconectou), encerra o sync
-                if not getattr(player, "playing", True) and not getattr(player, "paused", False):
-                    break
+                pending = [session.due for session in self._sync_sessions.values() if not session.editing]
+                timeout = max(0.0, min(pending) - loop.time()) if pending else LYRICS_SYNC_MAX_SLEEP_SECONDS
+                self._sync_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._sync_wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._sync_task = None
 
-                position_ms = getattr(player, "position", 0) or 0
-                current_index = self._find_line_index(timed_lines, position_ms)
-
-                if current_index is not None and current_index != last_index:
-                    snippet = self._render_timed_snippet(timed_lines, current_index)
-                    if snippet:
-                        embed = self._create_embed(interaction, track, lyrics_data, snippet)
-                        try:
-                            await message.edit(embed=embed)
-                            consecutive_edit_failures = 0
-                        except discord.NotFound:
-                            break
-                        except discord.HTTPException as exc:
-                            print(f"Não foi possível atualizar letra sincronizada: {exc}")
-                            consecutive_edit_failures += 1
-                            if consecutive_edit_failures >= 3:
-                                break
-                        last_index = current_index
-
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            was_cancelled = True
-            raise
+    async def _edit_sync_session(self, session: _LyricsSession, current_index: int) -> None:
+        try:
+            snippet = self._render_timed_snippet(session.timed_lines, current_index)
+            if not snippet:
+                session.last_index = current_index
+                return
+            embed = self._create_embed(session.interaction, session.track, session.lyrics_data, snippet)
+            await session.message.edit(embed=embed)
+            session.failures = 0
+            session.last_index = current_index
+        except discord.NotFound:
+            self._drop_sync_session(session)
+        except discord.HTTPException as exc:
+            print(f"Não foi possível atualizar letra sincronizada: {exc}")
+            session.failures += 1
+            session.last_index = current_index
+            if session.failures >= 3:
+                self._drop_sync_session(session)
+        except Exception as exc:
+            print(f"Erro ao atualizar letra sincronizada: {exc}")
+            self._drop_sync_session(session)
         finally:
-            if guild_id is not None:
-                self._sync_tasks.pop(guild_id, None)
-            # Remove o canal da lista de ativos quando as letras terminam
-            if not ephemeral and channel_id in self._active_lyrics_channels:
-                self._active_lyrics_channels.pop(channel_id, None)
-            if not was_cancelled and lyrics_data.get("lyrics"):
+            session.editing = False
+            self._sync_wakeup.set()
+
+    def _drop_sync_session(self, session: _LyricsSession) -> None:
+        if self._sync_sessions.get(session.guild_id) is session:
+            self._sync_sessions.pop(session.guild_id, None)
+        # Remove o canal da lista de ativos quando as letras terminam
+        if not session.ephemeral and self._active_lyrics_channels.get(session.channel_id) == session.guild_id:
+            self._active_lyrics_channels.pop(session.channel_id, None)
+
+    def _finish_sync_session(self, session: _LyricsSession) -> None:
+        """Fim natural (música acabou): volta a embed para a letra completa."""
+        self._drop_sync_session(session)
+        if session.lyrics_data.get("lyrics"):
+            async def _restore() -> None:
                 try:
-                    embed = self._create_embed(interaction, track, lyrics_data, lyrics_data["lyrics"])
-                    await message.edit(embed=embed)
+                    embed = self._create_embed(
+                        session.interaction, session.track, session.lyrics_data, session.lyrics_data["lyrics"]
+                    )
+                    await session.message.edit(embed=embed)
                 except (discord.NotFound, discord.HTTPException):
                     pass
 
+            self.bot.loop.create_task(_restore())
+
     @app_commands.command(name="lyrics", description="Show the lyrics for the current track")
     async def lyrics(self, interaction: discord.Interaction):
         await self.handle_lyrics_interaction(interaction, ephemeral=False)
 
     def cog_unload(self) -> None:
-        for task in self._sync_tasks.values():
-            task.cancel()
-        self._sync_tasks.clear()
+        self._sync_sessions.clear()
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
         self._active_lyrics_channels.clear()
+        for guild_id in list(self._prefetch_tasks):
+            self._cancel_prefetch(guild_id)
 
 
 async def setup(bot):
@@ -0,0 +1,211 @@
+"""
+Cache de letras em dois níveis.
+Nível 1: LRU em memória com os resultados já processados (incluindo timed_lines).
+Nível 2: MongoDB (índice TTL) ou arquivos JSON em disco, para sobreviver a restarts.
+Resultados negativos ficam só na memória e por pouco tempo.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+LYRICS_CACHE_MAX_ENTRIES = int(os.getenv("LYRICS_CACHE_MAX_ENTRIES", "500"))
+LYRICS_CACHE_TTL_SECONDS = int(os.getenv("LYRICS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 7 dias
+LYRICS_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("LYRICS_CACHE_NEGATIVE_TTL_SECONDS", "600"))  # 10 minutos
+LYRICS_CACHE_DIR = os.getenv("LYRICS_CACHE_DIR", "lyrics_cache")
+
+
+class MongoLyricsStore:
+    """Letras numa coleção do MongoDB; a expiração fica a cargo de um índice TTL."""
+
+    name = "mongo"
+
+    def __init__(self, storage, collection):
+        self.storage = storage
+        self.collection = collection
+        self._index_ready = False
+
+    async def load(self, key: str) -> Optional[dict]:
+        from datetime import timezone
+
+        document = await self.storage.find_one(self.collection, {"_id": key}, {"value": 1, "expiresAt": 1})
+        if not document:
+            return None
+        # O índice TTL roda a cada minuto; entradas vencidas podem ainda existir
+        expires_at = document.get("expiresAt")
+        if expires_at is not None and expires_at.replace(tzinfo=timezone.utc).timestamp() < time.time():
+            return None
+        return document.get("value")
+
+    async def save(self, key: str, value: dict, ttl_seconds: int) -> None:
+        from datetime import datetime, timedelta, timezone
+
+        if not self._index_ready:
+            await self.storage.run(
+                "lyrics_cache.create_index",
+                self.collection.create_index,
+                "expiresAt",
+                expireAfterSeconds=0,
+            )
+            self._index_ready = True
+
+        await self.storage.update_one(
+            self.collection,
+            {"_id": key},
+            {"$set": {
+                "value": value,
+                "expiresAt": datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+            }},
+            upsert=True,
+        )
+
+
+class DiskLyricsStore:
+    """Um arquivo JSON por chave (nome = sha1 da chave), lido só quando a memória erra."""
+
+    name = "disk"
+
+    def __init__(self, directory: str | Path = LYRICS_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def _read(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with path.open("r", encoding="utf-8") as fp:
+            entry = json.load(fp)
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        if entry.get("expiresAt", 0) < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry.get("value")
+
+    def _write(self, key: str, value: dict, ttl_seconds: int) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as fp:
+            json.dump(
+                {"key": key, "expiresAt": time.time() + ttl_seconds, "value": value},
+                fp,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(temp_path, path)
+
+    async def load(self, key: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def save(self, key: str, value: dict, ttl_seconds: int) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl_seconds)
+
+
+class LyricsCache:
+    """LRU em memória na frente de um store persistente."""
+
+    def __init__(
+        self,
+        store: MongoLyricsStore | DiskLyricsStore | None = None,
+        *,
+        max_entries: int = LYRICS_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = LYRICS_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: int = LYRICS_CACHE_NEGATIVE_TTL_SECONDS,
+    ):
+        self.store = store
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Optional[dict]]] = OrderedDict()  # key -> (expira, valor)
+        self._pending_writes: set[asyncio.Task] = set()
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.store_errors = 0
+
+    def _remember(self, key: str, value: Optional[dict], ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str, *, record: bool = True) -> tuple[bool, Optional[dict]]:
+        """Retorna (encontrado, valor). valor None com encontrado=True é um negativo em cache.
+
+        record=False não mexe nos contadores (usado pelo prefetch).
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                if record and value is None:
+                    self.negative_hits += 1
+                elif record:
+                    self.memory_hits += 1
+                return True, value
+            del self._entries[key]
+
+        if self.store is not None:
+            try:
+                value = await self.store.load(key)
+            except Exception as exc:
+                self.store_errors += 1
+                print(f"[LyricsCache] Falha ao ler do store '{self.store.name}': {exc}")
+                value = None
+            if value is not None:
+                if record:
+                    self.store_hits += 1
+                self._remember(key, value, self.ttl_seconds)
+                return True, value
+
+        if record:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: str, value: Optional[dict]) -> None:
+        """Guarda um resultado; negativos (None) ficam só na memória e por pouco tempo."""
+        if value is None:
+            self._remember(key, None, self.negative_ttl_seconds)
+            return
+
+        self._remember(key, value, self.ttl_seconds)
+        if self.store is None:
+            return
+
+        try:
+            task = asyncio.get_running_loop().create_task(self._save(key, value))
+        except RuntimeError:
+            return
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def _save(self, key: str, value: dict) -> None:
+        try:
+            await self.store.save(key, value, self.ttl_seconds)
+        except Exception as exc:
+            self.store_errors += 1
+            print(f"[LyricsCache] Falha ao gravar no store '{self.store.name}': {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        hits = self.memory_hits + self.store_hits + self.negative_hits
+        lookups = hits + self.misses
+        return {
+            "store": self.store.name if self.store is not None else "memory",
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "store_errors": self.store_errors,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
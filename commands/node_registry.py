@@ -0,0 +1,232 @@
+"""
+Registro dos nós Lavalink.
+A base vem do .env (LAVALINK_NODE{n}_*, qualquer n, ou o LAVALINK_HOST antigo); por cima dela
+entram os nós adicionados/removidos em runtime, gravados no MongoDB ou num arquivo JSON, que
+também pode ser editado à mão e recarregado com /admin node reload.
+"""
+import asyncio
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+
+LAVALINK_NODES_FILE = os.getenv("LAVALINK_NODES_FILE", "lavalink_nodes.json")
+
+_ENV_NODE_HOST = re.compile(r"^LAVALINK_NODE(\d+)_HOST$")
+
+
+def make_node_config(
+    identifier: str,
+    host: str,
+    port: str | int = "2333",
+    password: str = "youshallnotpass",
+    *,
+    secure: bool = False,
+    name: str = "",
+) -> dict[str, Any]:
+    return {
+        "id": identifier,
+        "name": name,
+        "protocol": "wss" if secure else "ws",
+        "host": host,
+        "port": str(port or "2333"),
+        "password": password,
+        "secure": secure,
+    }
+
+
+def node_uri(cfg: dict) -> str:
+    return f"{cfg['protocol']}://{cfg['host']}:{cfg['port']}"
+
+
+def env_node_configs() -> list[dict[str, Any]]:
+    """Nós definidos no .env, em ordem numérica, sem limite de quantidade."""
+    indexes = sorted(
+        int(match.group(1))
+        for match in (_ENV_NODE_HOST.match(key) for key in os.environ)
+        if match
+    )
+
+    configs: list[dict[str, Any]] = []
+    for idx in indexes:
+        host = (os.getenv(f"LAVALINK_NODE{idx}_HOST", "") or "").strip()
+        if not host:
+            continue
+        configs.append(make_node_config(
+            f"node{idx}",
+            host,
+            (os.getenv(f"LAVALINK_NODE{idx}_PORT", "2333") or "2333").strip() or "2333",
+            os.getenv(f"LAVALINK_NODE{idx}_PASSWORD", "youshallnotpass"),
+            secure=(os.getenv(f"LAVALINK_NODE{idx}_SECURE", "false") or "false").lower() == "true",
+            name=(os.getenv(f"LAVALINK_NODE{idx}_NAME", "") or "").strip(),
+        ))
+
+    # Compatibilidade com configuração antiga (apenas um nó)
+    if not configs:
+        host = (os.getenv("LAVALINK_HOST", "") or "").strip()
+        if host:
+            configs.append(make_node_config(
+                "node1",
+                host,
+                (os.getenv("LAVALINK_PORT", "2333") or "2333").strip() or "2333",
+                os.getenv("LAVALINK_PASSWORD", "youshallnotpass"),
+                secure=(os.getenv("LAVALINK_SECURE", "false") or "false").lower() == "true",
+                name=(os.getenv("LAVALINK_NODE1_NAME", "") or os.getenv("LAVALINK_NAME", "") or "").strip(),
+            ))
+
+    return configs
+
+
+class MongoNodeStore:
+    """Alterações de runtime num documento do MongoDB."""
+
+    name = "mongo"
+
+    def __init__(self, storage, collection):
+        self.storage = storage
+        self.collection = collection
+
+    async def load(self) -> Optional[dict]:
+        document = await self.storage.find_one(self.collection, {"_id": "registry"}, {"nodes": 1, "removed": 1})
+        return document
+
+    async def save(self, data: dict) -> None:
+        await self.storage.update_one(self.collection, {"_id": "registry"}, {"$set": data}, upsert=True)
+
+
+class FileNodeStore:
+    """Alterações de runtime num arquivo JSON local ({"nodes": [...], "removed": [...]})."""
+
+    name = "file"
+
+    def __init__(self, path: str | Path = LAVALINK_NODES_FILE):
+        self.path = Path(path)
+
+    def _read(self) -> Optional[dict]:
+        if not self.path.exists():
+            return None
+        with self.path.open("r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        return data if isinstance(data, dict) else None
+
+    def _write(self, data: dict) -> None:
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as fp:
+            json.dump(data, fp, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    async def load(self) -> Optional[dict]:
+        return await asyncio.to_thread(self._read)
+
+    async def save(self, data: dict) -> None:
+        await asyncio.to_thread(self._write, data)
+
+
+class NodeRegistry:
+    """Configuração efetiva dos nós: .env + alterações de runtime (adições e remoções)."""
+
+    def __init__(self) -> None:
+        self.store: MongoNodeStore | FileNodeStore | None = None
+        self._added: dict[str, dict] = {}  # id -> config adicionada/alterada em runtime
+        self._removed: set[str] = set()  # ids do .env removidos em runtime
+        self._configs: dict[str, dict] = {}
+        self.draining: set[str] = set()  # não recebem players novos (só em memória)
+        self.reload_from_env()
+
+    async def attach(self, store: MongoNodeStore | FileNodeStore) -> None:
+        self.store = store
+        await self.reload()
+
+    async def reload(self) -> None:
+        """Relê o .env e o store (para edições manuais do arquivo/documento)."""
+        if self.store is not None:
+            try:
+                data = await self.store.load() or {}
+            except Exception as exc:
+                print(f"[Nodes] Falha ao carregar registro do store '{self.store.name}': {exc}")
+                data = None
+            if data is not None:
+                self._added = {
+                    str(cfg["id"]): make_node_config(
+                        str(cfg["id"]),
+                        str(cfg["host"]),
+                        cfg.get("port", "2333"),
+                        cfg.get("password", "youshallnotpass"),
+                        secure=bool(cfg.get("secure", False)),
+                        name=str(cfg.get("name") or ""),
+                    )
+                    for cfg in data.get("nodes") or []
+                    if isinstance(cfg, dict) and cfg.get("id") and cfg.get("host")
+                }
+                self._removed = {str(identifier) for identifier in data.get("removed") or []}
+        self.reload_from_env()
+
+    def reload_from_env(self) -> None:
+        configs = {cfg["id"]: cfg for cfg in env_node_configs() if cfg["id"] not in self._removed}
+        configs.update(self._added)
+        self._configs = configs
+        self.draining &= set(configs)
+
+    async def _persist(self) -> None:
+        if self.store is None:
+            return
+        try:
+            await self.store.save({"nodes": list(self._added.values()), "removed": sorted(self._removed)})
+        except Exception as exc:
+            print(f"[Nodes] Falha ao gravar registro no store '{self.store.name}': {exc}")
+
+    def configs(self) -> list[dict]:
+        return list(self._configs.values())
+
+    def get(self, identifier: str) -> Optional[dict]:
+        return self._configs.get(identifier)
+
+    def __contains__(self, identifier: object) -> bool:
+        return identifier in self._configs
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    async def add(self, cfg: dict) -> None:
+        """Adiciona (ou substitui) um nó e grava a alteração."""
+        self._added[cfg["id"]] = cfg
+        self._removed.discard(cfg["id"])
+        self._configs[cfg["id"]] = cfg
+        self.draining.discard(cfg["id"])
+        await self._persist()
+
+    async def remove(self, identifier: str) -> bool:
+        if identifier not in self._configs:
+            return False
+        self._added.pop(identifier, None)
+        self._removed.add(identifier)
+        self._configs.pop(identifier, None)
+        self.draining.discard(identifier)
+        await self._persist()
+        return True
+
+    def drain(self, identifier: str) -> bool:
+        if identifier not in self._configs:
+            return False
+        self.draining.add(identifier)
+        return True
+
+    def undrain(self, identifier: str) -> bool:
+        if identifier not in self.draining:
+            return False
+        self.draining.discard(identifier)
+        return True
+
+    def is_draining(self, identifier: Optional[str]) -> bool:
+        return identifier in self.draining
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "store": self.store.name if self.store is not None else "env",
+            "nodes": len(self._configs),
+            "runtime": len(self._added),
+            "removed": len(self._removed),
+            "draining": sorted(self.draining),
+        }
@@ -1,8 +1,6 @@
-import os
 import asyncio
 import time
 
-import aiohttp
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -37,54 +35,23 @@ class Ping(commands.Cog):
             return "🟡"
         return "🔴"
 
-    def _env_lavalink_configs(self) -> list[dict]:
-        """Lê a configuração dos nós Lavalink direto do .env."""
+    def _lavalink_configs(self) -> list[dict]:
+        """Configuração dos nós Lavalink a partir do registro do bot (.env + alterações em runtime)."""
         configs: list[dict] = []
 
-        for idx in range(1, 11):  # Suporta até 10 nodes (NODE1 até NODE10)
-            host = (os.getenv(f"LAVALINK_NODE{idx}_HOST", "") or "").strip()
-            if not host:
-                continue
-
-            name = (os.getenv(f"LAVALINK_NODE{idx}_NAME", "") or "").strip()
-            if not name:
-                name = f"node{idx}"
-            port = (os.getenv(f"LAVALINK_NODE{idx}_PORT", "2333") or "2333").strip()
-            password = os.getenv(f"LAVALINK_NODE{idx}_PASSWORD", "youshallnotpass")
-            secure = (os.getenv(f"LAVALINK_NODE{idx}_SECURE", "false") or "false").lower() == "true"
-            scheme = "https" if secure else "http"
+        for cfg in self.bot.node_registry.configs():
+            scheme = "https" if cfg["secure"] else "http"
             configs.append({
-                "identifier": f"node{idx}",
-                "name": name,
-                "secure": secure,
-                "host": host,
-                "port": port,
-                "password": password,
+                "identifier": cfg["id"],
+                "name": cfg["name"] or cfg["id"],
+                "secure": cfg["secure"],
+                "host": cfg["host"],
+                "port": cfg["port"],
+                "password": cfg["password"],
                 "scheme": scheme,
-                "base": f"{scheme}://{host}:{port}",
+                "base": f"{scheme}://{cfg['host']}:{cfg['port']}",
             })
 
-        if not configs:
-            host = (os.getenv("LAVALINK_HOST", "") or "").strip()
-            if host:
-                name = (os.getenv("LAVALINK_NODE_NAME", "") or "").strip()
-                if not name:
-                    name = "node1"
-                port = (os.getenv("LAVALINK_PORT", "2333") or "2333").strip()
-                password = os.getenv("LAVALINK_PASSWORD", "youshallnotpass")
-                secure = (os.getenv("LAVALINK_SECURE", "false") or "false").lower() == "true"
-                scheme = "https" if secure else "http"
-                configs.append({
-                    "identifier": "node1",
-                    "name": name,
-                    "secure": secure,
-                    "host": host,
-                    "port": port,
-                    "password": password,
-                    "scheme": scheme,
-                    "base": f"{scheme}://{host}:{port}",
-                })
-
         return configs
 
     async def _tcp_ping(self, host: str, port: int, timeout: float = 3.0) -> int | None:
@@ -107,32 +74,32 @@ class Ping(commands.Cog):
         """
         Mede a latência HTTP dos nós Lavalink. Retorna lista de tuplas (cfg, ms|None, endpoint).
         """
-        configs = self._env_lavalink_configs()
+        configs = self._lavalink_configs()
         if not configs:
             return []
 
         results: list[tuple[dict, int | None, str]] = []
         endpoints = ["/v4/info", "/version"]
-        timeout = aiohttp.ClientTimeout(total=4)
-
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            for cfg in configs:
-                latency_ms: int | None = None
-                endpoint_used = "N/A"
-                headers = {"Authorization": cfg["password"]}
-                for ep in endpoints:
-                    url = cfg["base"] + ep
-                    start = time.perf_counter()
-                    try:
-                        async with session.get(url, headers=headers) as resp:
-                            if resp.status < 500:
-                                end = time.perf_counter()
-                                latency_ms = int((end - start) * 1000)
-                                endpoint_used = ep
-                                break
-                    except Exception:
-                        continue
-                results.append((cfg, latency_ms, endpoint_used))
+        http_client = self.bot.http_client
+
+        for cfg in configs:
+            latency_ms: int | None = None
+            endpoint_used = "N/A"
+            headers = {"Authorization": cfg["password"]}
+            for ep in endpoints:
+                url = cfg["base"] + ep
+                start = time.perf_counter()
+                try:
+                    # O wavelink fala com os nós sem proxy; a medição segue o mesmo caminho
+                    async with http_client.request("GET", url, headers=headers, timeout=4, use_proxy=False) as resp:
+                        if resp.status < 500:
+                            end = time.perf_counter()
+                            latency_ms = int((end - start) * 1000)
+                            endpoint_used = ep
+                            break
+                except Exception:
+                    continue
+            results.append((cfg, latency_ms, endpoint_used))
 
         return results
 
@@ -3,14 +3,25 @@ from discord.ext import commands
 from discord import app_commands
 import wavelink
 import re
+import os
 import asyncio
 import difflib
 
-from commands import iter_wavelink_nodes, player_is_ready, resolve_wavelink_player
+from commands import hedged_search, iter_wavelink_nodes, player_is_ready, resolve_wavelink_player
+from commands.tracklist import IndexedPlayer
 
 
 AUTOCOMPLETE_TIMEOUT_SECONDS = 1.5
 
+# Playlists grandes entram na fila em lotes, numa tarefa em background
+PLAYLIST_STREAM_CHUNK_SIZE = 50
+PLAYLIST_STREAM_EDIT_INTERVAL_SECONDS = 2.0
+# Limites por servidor (quantidade e memória estimada da fila)
+QUEUE_MAX_TRACKS = int(os.getenv("QUEUE_MAX_TRACKS", "5000"))
+QUEUE_MAX_MEMORY_MB = float(os.getenv("QUEUE_MAX_MEMORY_MB", "32"))
+# Custo aproximado de um Playable em memória além do blob encoded
+TRACK_MEMORY_OVERHEAD_BYTES = 2048
+
 
 class MusicControlView(discord.ui.View):
     """View com botões de controle de música"""
@@ -26,8 +37,9 @@ class MusicControlView(discord.ui.View):
 
         initial_mode = None
         if player:
-            if hasattr(player, "loop_mode_override"):
-                initial_mode = player.loop_mode_override
+            state = bot.player_states.peek(resolved_guild_id)
+            if state is not None and state.loop_mode_override is not None:
+                initial_mode = state.loop_mode_override
             elif getattr(player, "queue", None):
                 initial_mode = player.queue.mode
         self._apply_loop_button_state(initial_mode)
@@ -297,7 +309,7 @@ class MusicControlView(discord.ui.View):
         self._update_play_pause_button(player)
 
         try:
-            embed_message = getattr(player, "current_embed_message", None)
+            embed_message = self.bot.player_states.for_player(player).current_embed_message
             new_embed = None
             current_track = getattr(player, "current", None)
             if embed_message and current_track:
@@ -330,6 +342,7 @@ class MusicControlView(discord.ui.View):
             print(f"Falha ao limpar estado de reprodução antes de desconectar: {exc}")
 
         await player.disconnect()
+        self.bot._release_guild_state(getattr(interaction.guild, "id", None))
         message = self._translate(interaction, "commands.play.stop.success")
         await self._send_ephemeral(interaction, message)
 
@@ -408,7 +421,7 @@ class MusicControlView(discord.ui.View):
             response_default = "🔁 Loop desativado."
 
         player.queue.mode = new_mode
-        player.loop_mode_override = new_mode
+        self.bot.player_states.for_player(player).loop_mode_override = new_mode
         if interaction.guild:
             self._guild_id = interaction.guild.id
         self._apply_loop_button_state(new_mode)
@@ -465,6 +478,13 @@ class MusicControlView(discord.ui.View):
 class PlayCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._playlist_streams: dict[int, set[asyncio.Task]] = {}  # guild_id -> tarefas de enqueue
+
+    def cog_unload(self) -> None:
+        for tasks in self._playlist_streams.values():
+            for task in tasks:
+                task.cancel()
+        self._playlist_streams.clear()
 
     def _translate(self, interaction: discord.Interaction | None, key: str, **kwargs) -> str:
         translator = getattr(self.bot, "translate", None)
@@ -544,11 +564,9 @@ class PlayCommands(commands.Cog):
             await self._send_interaction_message(interaction, embed=embed, ephemeral=ephemeral)
             return None
 
-        if getattr(player, "text_channel", None) is None and interaction.channel:
-            try:
-                player.text_channel = interaction.channel
-            except Exception:
-                pass
+        state = self.bot.player_states.for_player(player)
+        if state.text_channel is None and interaction.channel:
+            state.text_channel = interaction.channel
 
         return player
 
@@ -561,8 +579,10 @@ class PlayCommands(commands.Cog):
         except Exception:
             queue_mode = wavelink.QueueMode.normal
 
-        loop_mode = getattr(player, "loop_mode_override", queue_mode)
-        player.loop_mode_override = loop_mode
+        state = self.bot.player_states.for_player(player)
+        if state.loop_mode_override is None:
+            state.loop_mode_override = queue_mode
+        loop_mode = state.loop_mode_override
 
         try:
             player.queue.mode = loop_mode
@@ -682,46 +702,11 @@ class PlayCommands(commands.Cog):
         max_attempts: int | None = None,
         provider: str | None = None,
     ) -> wavelink.Playlist | list[wavelink.Playable] | None:
-        """Tenta buscar tracks em múltiplos prefixos (YouTube/YouTube Music/SoundCloud)."""
+        """Tenta buscar tracks em múltiplos prefixos, sobrepondo provedores lentos (hedged)."""
 
         async def _fetch(identifier: str):
-            try:
-                return await wavelink.Pool.fetch_tracks(identifier)
-            except Exception:
-                return await interaction.client.search_with_failover(identifier)
-
-        async def _run_attempts(attempts: list[str]):
-            last_exc: Exception | None = None
-            for attempt in attempts:
-                try:
-                    coro = _fetch(attempt)
-                    tracks = await asyncio.wait_for(coro, timeout=timeout) if timeout else await coro
-                except Exception as exc:
-                    last_exc = exc
-                    continue
-
-                if not tracks:
-                    continue
-
-                if isinstance(tracks, wavelink.Playlist):
-                    if getattr(tracks, "tracks", None):
-                        return tracks
-                    continue
-
-                playable_cls = getattr(wavelink, "Playable", None)
-                if playable_cls and isinstance(tracks, playable_cls):
-                    return [tracks]
-
-                try:
-                    tracks_list = list(tracks)
-                except TypeError:
-                    tracks_list = []
-
-                if tracks_list:
-                    return tracks_list
-            if last_exc:
-                raise last_exc
-            return None
+            # Cache compartilhado + failover entre nós (MusicBot.load_tracks)
+            return await interaction.client.load_tracks(identifier)
 
         attempts: list[str]
         clean_query = self._strip_search_prefix(query)
@@ -797,14 +782,12 @@ class PlayCommands(commands.Cog):
         if max_attempts is not None:
             attempts = attempts[:max_attempts]
 
-        # Primeira passada: conforme provider efetivo
-        first_result = await _run_attempts(attempts)
-        if first_result or is_url:
-            return first_result
+        if not is_url:
+            # Fallback amplo entra na mesma fila de prioridade, depois do provider efetivo
+            fallback_attempts = default_attempts if max_attempts is None else default_attempts[:max_attempts]
+            attempts = attempts + [attempt for attempt in fallback_attempts if attempt not in attempts]
 
-        # Fallback amplo se não achou nada
-        fallback_attempts = default_attempts if max_attempts is None else default_attempts[:max_attempts]
-        return await _run_attempts(fallback_attempts)
+        return await hedged_search(_fetch, attempts, attempt_timeout=timeout)
 
 
 
@@ -992,8 +975,12 @@ class PlayCommands(commands.Cog):
                 # Escolhe qual node usar
                 selected_node = None
                 
-                # Se há afinidade válida e o node está disponível, usa ele
-                if preferred_node_id and preferred_node_id not in excluded_nodes:
+                # Se há afinidade válida e o node está disponível (e fora de drain), usa ele
+                if (
+                    preferred_node_id
+                    and preferred_node_id not in excluded_nodes
+                    and not self.bot.node_registry.is_draining(preferred_node_id)
+                ):
                     try:
                         preferred_node = wavelink.Pool.get_node(preferred_node_id)
                         if preferred_node.status == wavelink.NodeStatus.CONNECTED:
@@ -1002,19 +989,20 @@ class PlayCommands(commands.Cog):
                     except Exception:
                         pass
                 
-                # Se não tem afinidade ou node preferido não está disponível, escolhe o com menos players
+                # Se não tem afinidade ou node preferido não está disponível, escolhe o de menor penalidade
                 if selected_node is None:
-                    # Ordena por quantidade de players (menos players = menos carga)
-                    usable_nodes.sort(key=lambda n: len(getattr(n, 'players', {})))
+                    # Ordena pela pontuação de carga (players tocando, CPU, frames, falhas, latência)
+                    usable_nodes = self.bot.rank_nodes(usable_nodes)
                     selected_node = usable_nodes[0]
                     player_count = len(getattr(selected_node, 'players', {}))
-                    print(f"🔍 Selecionado node com menos carga: {selected_node.identifier} ({player_count} player(s) ativos)")
+                    score = self.bot.node_scores.score(selected_node)
+                    print(f"🔍 Selecionado node com menos carga: {selected_node.identifier} ({player_count} player(s) ativos, score={score:.1f})")
 
                 connect_timeout = 6.0
                 
                 # Cria player com o node selecionado explicitamente
                 def _player_factory(client: discord.Client, ch: discord.abc.Connectable):
-                    return wavelink.Player(client, ch, nodes=[selected_node])
+                    return IndexedPlayer(client, ch, nodes=[selected_node])
 
                 player = await channel.connect(cls=_player_factory, self_deaf=True, reconnect=True, timeout=connect_timeout)
                 
@@ -1150,7 +1138,9 @@ class PlayCommands(commands.Cog):
             queue_mode = player.queue.mode
         except Exception:
             queue_mode = wavelink.QueueMode.normal
-        loop_mode = getattr(player, "loop_mode_override", queue_mode)
+        # Canal de texto, embed atual e loop ficam no PlayerState do servidor e sobrevivem à reconstrução
+        state = self.bot.player_states.for_player(player)
+        loop_mode = state.loop_mode_override if state.loop_mode_override is not None else queue_mode
 
         auto_queue_items: list[wavelink.Playable] = []
         if hasattr(player, "auto_queue") and player.auto_queue and not player.auto_queue.is_empty:
@@ -1159,8 +1149,8 @@ class PlayCommands(commands.Cog):
         autoplay_mode = player.autoplay
         inactive_timeout = player.inactive_timeout
         volume = player.volume
-        text_channel = getattr(player, "text_channel", None) or interaction.channel
-        current_embed_message = getattr(player, "current_embed_message", None)
+        if state.text_channel is None:
+            state.text_channel = interaction.channel
 
         try:
             await player.disconnect()
@@ -1180,23 +1170,16 @@ class PlayCommands(commands.Cog):
 
         new_player = await self._connect_player_with_retry(interaction, channel)
         new_player.queue.mode = loop_mode
-        new_player.loop_mode_override = loop_mode
+        state.loop_mode_override = loop_mode
         new_player.autoplay = autoplay_mode
 
         if inactive_timeout is not None:
             new_player.inactive_timeout = inactive_timeout
 
-        if text_channel:
-            new_player.text_channel = text_channel
-
-        if current_embed_message:
-            new_player.current_embed_message = current_embed_message
-
-        for item in queue_items:
-            try:
-                await new_player.queue.put_wait(item)
-            except Exception as exc:
-                print(f"Falha ao restaurar item da fila durante reconstrução: {exc}")
+        try:
+            new_player.queue.put(queue_items, atomic=False)
+        except Exception as exc:
+            print(f"Falha ao restaurar a fila durante reconstrução: {exc}")
 
         for item in auto_queue_items:
             try:
@@ -1276,10 +1259,166 @@ class PlayCommands(commands.Cog):
             except Exception:
                 player = await self._rebuild_player(interaction, player, user_channel)
 
-        player.text_channel = interaction.channel
+        self.bot.player_states.for_player(player).text_channel = interaction.channel
         self._ensure_loop_mode_attr(player)
         return player
 
+    @staticmethod
+    def _estimate_track_bytes(track: wavelink.Playable) -> int:
+        return TRACK_MEMORY_OVERHEAD_BYTES + len(getattr(track, "encoded", None) or "")
+
+    def _queue_capacity(self, player: wavelink.Player, tracks: list[wavelink.Playable]) -> int:
+        """Quantos tracks (do início da lista) cabem na fila sem passar dos limites do servidor."""
+        available = QUEUE_MAX_TRACKS - player.queue.count
+        memory_left = QUEUE_MAX_MEMORY_MB * 1024 * 1024 - sum(
+            self._estimate_track_bytes(queued) for queued in player.queue
+        )
+
+        count = 0
+        for track in tracks:
+            if count >= available:
+                break
+            memory_left -= self._estimate_track_bytes(track)
+            if memory_left < 0:
+                break
+            count += 1
+        return count
+
+    def _tag_requester(self, player: wavelink.Player, track: wavelink.Playable, user: discord.abc.User) -> None:
+        # Define quem solicitou a música
+        track.requester = user
+
+        # Armazena também no estado do servidor
+        track_id = getattr(track, "identifier", None) or getattr(track, "encoded", None)
+        if track_id:
+            self.bot.player_states.for_player(player).remember_requester(track_id, user)
+
+    def _playlist_embed(
+        self,
+        interaction: discord.Interaction,
+        playlist: wavelink.Playlist,
+        player: wavelink.Player,
+        *,
+        added: int,
+        pending: int,
+        skipped: int,
+    ) -> discord.Embed:
+        title = self._translate(interaction, "commands.play.playlist.added.title")
+        description = self._translate(
+            interaction,
+            "commands.play.playlist.added.description",
+            name=playlist.name,
+            count=added,
+        )
+
+        embed = discord.Embed(title=title, description=description, color=0x00ff00)
+
+        if hasattr(playlist, 'artwork') and playlist.artwork:
+            embed.set_thumbnail(url=playlist.artwork)
+
+        stats_name = self._translate(interaction, "commands.play.playlist.added.stats_name")
+        stats_value = self._translate(
+            interaction,
+            "commands.play.playlist.added.stats_value",
+            queue_count=player.queue.count,
+        )
+        embed.add_field(name=stats_name, value=stats_value, inline=True)
+
+        if skipped:
+            embed.add_field(
+                name="⚠️",
+                value=self._translate(
+                    interaction,
+                    "commands.play.playlist.added.limited",
+                    default="Queue limit reached: {skipped} track(s) were not added",
+                    skipped=skipped,
+                ),
+                inline=False,
+            )
+        if pending:
+            embed.set_footer(
+                text=self._translate(
+                    interaction,
+                    "commands.play.playlist.added.progress",
+                    default="Adding tracks... {count}/{total}",
+                    count=added,
+                    total=added + pending,
+                )
+            )
+        return embed
+
+    async def _stream_playlist_tail(
+        self,
+        interaction: discord.Interaction,
+        player: wavelink.Player,
+        playlist: wavelink.Playlist,
+        remaining: list[wavelink.Playable],
+        message: discord.WebhookMessage | None,
+        *,
+        added: int,
+        skipped: int,
+    ) -> None:
+        """Coloca o resto da playlist na fila em lotes, atualizando a embed de confirmação."""
+        loop = asyncio.get_running_loop()
+        last_edit = loop.time()
+        edited_count = added
+
+        async def _refresh(pending: int) -> None:
+            nonlocal last_edit, edited_count
+            if message is None:
+                return
+            try:
+                await message.edit(
+                    embed=self._playlist_embed(
+                        interaction, playlist, player, added=added, pending=pending, skipped=skipped
+                    )
+                )
+            except Exception:
+                pass
+            last_edit = loop.time()
+            edited_count = added
+
+        try:
+            for offset in range(0, len(remaining), PLAYLIST_STREAM_CHUNK_SIZE):
+                # Acompanha o player atual (pode ter sido reconstruído por failover)
+                current = interaction.guild.voice_client if interaction.guild else None
+                if isinstance(current, wavelink.Player):
+                    player = current
+                if not getattr(player, "connected", False):
+                    skipped += len(remaining) - offset
+                    break
+
+                chunk = remaining[offset:offset + PLAYLIST_STREAM_CHUNK_SIZE]
+                for track in chunk:
+                    self._tag_requester(player, track, interaction.user)
+                player.queue.put(chunk)
+                added += len(chunk)
+
+                pending = max(0, len(remaining) - offset - len(chunk))
+                if pending and loop.time() - last_edit >= PLAYLIST_STREAM_EDIT_INTERVAL_SECONDS:
+                    await _refresh(pending)
+
+                # Devolve o controle ao event loop entre os lotes
+                await asyncio.sleep(0)
+        except Exception as e:
+            print(f"Erro ao adicionar playlist em background: {e}")
+        finally:
+            remaining.clear()
+
+        if edited_count != added or skipped:
+            await _refresh(0)
+
+    def _track_playlist_stream(self, guild_id: int, task: asyncio.Task) -> None:
+        tasks = self._playlist_streams.setdefault(guild_id, set())
+        tasks.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            tasks.discard(finished)
+            if not tasks:
+                self._playlist_streams.pop(guild_id, None)
+
+        task.add_done_callback(_done)
+
     async def _safe_play(
         self,
         interaction: discord.Interaction,
@@ -1556,52 +1695,30 @@ class PlayCommands(commands.Cog):
         try:
             # Se for uma playlist
             if isinstance(tracks, wavelink.Playlist):
-                added_count = 0
-                
-                # Inicializa o dicionário de requesters se não existir
-                if not hasattr(player, "_track_requesters"):
-                    player._track_requesters = {}
-                
-                for track in tracks.tracks:
-                    # Define quem solicitou a música
-                    track.requester = interaction.user
-                    
-                    # Armazena também em um dicionário personalizado
-                    track_id = getattr(track, "identifier", None) or getattr(track, "encoded", None)
-                    if track_id:
-                        player._track_requesters[track_id] = interaction.user
-                    
-                    await player.queue.put_wait(track)
-                    added_count += 1
-
-                self._ensure_loop_mode_attr(player)
-
-                title = self._translate(interaction, "commands.play.playlist.added.title")
-                description = self._translate(
-                    interaction,
-                    "commands.play.playlist.added.description",
-                    name=tracks.name,
-                    count=added_count,
-                )
-
-                embed = discord.Embed(title=title, description=description, color=0x00ff00)
+                playlist_tracks = list(tracks.tracks)
+                capacity = self._queue_capacity(player, playlist_tracks)
+                skipped_count = len(playlist_tracks) - capacity
+                del playlist_tracks[capacity:]
+
+                if not playlist_tracks:
+                    embed = self._playlist_embed(
+                        interaction, tracks, player, added=0, pending=0, skipped=skipped_count
+                    )
+                    return await interaction.followup.send(embed=embed, ephemeral=True)
 
-                if hasattr(tracks, 'artwork') and tracks.artwork:
-                    embed.set_thumbnail(url=tracks.artwork)
+                # Primeiro lote entra na hora; o resto segue em background
+                first_chunk = playlist_tracks[:PLAYLIST_STREAM_CHUNK_SIZE]
+                remaining = playlist_tracks[PLAYLIST_STREAM_CHUNK_SIZE:]
+                for track in first_chunk:
+                    self._tag_requester(player, track, interaction.user)
+                player.queue.put(first_chunk)
+                added_count = len(first_chunk)
 
-                stats_name = self._translate(interaction, "commands.play.playlist.added.stats_name")
-                stats_value = self._translate(
-                    interaction,
-                    "commands.play.playlist.added.stats_value",
-                    queue_count=player.queue.count,
-                )
-                embed.add_field(name=stats_name, value=stats_value, inline=True)
-
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                self._ensure_loop_mode_attr(player)
 
                 # Se não está tocando, inicia
                 if not player.playing:
-                    player.text_channel = interaction.channel
+                    self.bot.player_states.for_player(player).text_channel = interaction.channel
                     next_track = await player.queue.get_wait()
                     try:
                         player = await self._safe_play(interaction, player, next_track)
@@ -1613,6 +1730,30 @@ class PlayCommands(commands.Cog):
                             error=e,
                         )
                         return await interaction.followup.send(embed=embed)
+
+                embed = self._playlist_embed(
+                    interaction,
+                    tracks,
+                    player,
+                    added=added_count,
+                    pending=len(remaining),
+                    skipped=skipped_count,
+                )
+                message = await interaction.followup.send(embed=embed, ephemeral=True, wait=True)
+
+                if remaining and interaction.guild:
+                    task = asyncio.create_task(
+                        self._stream_playlist_tail(
+                            interaction,
+                            player,
+                            tracks,
+                            remaining,
+                            message,
+                            added=added_count,
+                            skipped=skipped_count,
+                        )
+                    )
+                    self._track_playlist_stream(interaction.guild.id, task)
             else:
                 # Garante lista e escolhe o melhor resultado
                 tracks_list: list[wavelink.Playable]
@@ -1637,17 +1778,8 @@ class PlayCommands(commands.Cog):
                 except Exception:
                     track = tracks_list[0]
                 
-                # Inicializa o dicionário de requesters se não existir
-                if not hasattr(player, "_track_requesters"):
-                    player._track_requesters = {}
-                
-                # Define quem solicitou a música
-                track.requester = interaction.user
-                
-                # Armazena também em um dicionário personalizado
-                track_id = getattr(track, "identifier", None) or getattr(track, "encoded", None)
-                if track_id:
-                    player._track_requesters[track_id] = interaction.user
+                # Define quem solicitou a música (também no estado do servidor)
+                self._tag_requester(player, track, interaction.user)
 
                 # Se não está tocando nada, toca imediatamente
                 if not player.playing:
@@ -1662,7 +1794,7 @@ class PlayCommands(commands.Cog):
                         )
                         return await interaction.followup.send(embed=embed)
 
-                    player.text_channel = interaction.channel
+                    self.bot.player_states.for_player(player).text_channel = interaction.channel
                 else:
                     # Adiciona à fila
                     await player.queue.put_wait(track)
@@ -1856,6 +1988,7 @@ class PlayCommands(commands.Cog):
             print(f"Falha ao limpar estado de reprodução antes de desconectar: {exc}")
 
         await player.disconnect()
+        self.bot._release_guild_state(getattr(interaction.guild, "id", None))
 
         embed = discord.Embed(
             title=self._translate(interaction, "commands.play.stop.embed_title"),
@@ -0,0 +1,153 @@
+"""
+Estado por servidor que antes era pendurado no wavelink.Player com setattr.
+O registro é do MusicBot e indexado pelo guild_id, então o estado sobrevive à reconstrução
+do player e à troca de node; é descartado explicitamente quando o bot sai da call.
+"""
+import asyncio
+from typing import Any, Optional
+
+import discord
+import wavelink
+
+
+# Teto de requesters lembrados por servidor (o mais antigo sai primeiro)
+PLAYER_STATE_MAX_REQUESTERS = 5000
+# Carência antes de descartar o estado quando o bot sai da call por fora dos fluxos normais
+PLAYER_STATE_RELEASE_GRACE_SECONDS = 30.0
+
+
+class PlayerState:
+    """Campos tipados de um servidor com player ativo."""
+
+    __slots__ = (
+        "guild_id",
+        "text_channel",
+        "current_embed_message",
+        "loop_mode_override",
+        "track_requesters",
+        "afk_pause_active",
+        "lonely_pause_message",
+        "original_channel_status",
+        "channel_status_captured",
+        "channel_status_overridden",
+        "fallback_attempts",
+        "fallback_in_progress",
+        "unavailable_failover_attempts",
+        "node_failover_inflight",
+        "last_error",
+        "warp_retry_pending",
+        "warp_retry_attempted",
+        "warp_retry_inflight",
+        "warp_retry_track",
+        "warp_retry_future",
+        "warp_reconnect_task",
+    )
+
+    def __init__(self, guild_id: int) -> None:
+        self.guild_id = guild_id
+        self.text_channel: Optional[discord.abc.Messageable] = None
+        self.current_embed_message: Optional[discord.Message] = None
+        self.loop_mode_override: Optional[wavelink.QueueMode] = None
+        self.track_requesters: dict[str, Any] = {}  # identifier/encoded -> usuário
+        self.afk_pause_active = False
+        self.lonely_pause_message: Optional[discord.Message] = None
+        self.original_channel_status: Optional[str] = None
+        self.channel_status_captured = False
+        self.channel_status_overridden = False
+        self.fallback_attempts: set[str] = set()
+        self.fallback_in_progress = False
+        self.unavailable_failover_attempts: set[str] = set()
+        self.node_failover_inflight = False
+        self.last_error: Any = None
+        self.warp_retry_pending = False
+        self.warp_retry_attempted = False
+        self.warp_retry_inflight = False
+        self.warp_retry_track: Optional[wavelink.Playable] = None
+        self.warp_retry_future: Optional[asyncio.Task] = None
+        self.warp_reconnect_task: Optional[asyncio.Task] = None
+
+    def remember_requester(self, track_id: str, user: Any) -> None:
+        requesters = self.track_requesters
+        requesters.pop(track_id, None)
+        requesters[track_id] = user
+        while len(requesters) > PLAYER_STATE_MAX_REQUESTERS:
+            requesters.pop(next(iter(requesters)))
+
+    def requester_for(self, track: Any) -> Any:
+        track_id = getattr(track, "identifier", None) or getattr(track, "encoded", None)
+        return self.track_requesters.get(track_id) if track_id else None
+
+    def reset_track_attempts(self) -> None:
+        """Zera as tentativas de fallback/failover ao começar uma faixa nova."""
+        self.fallback_in_progress = False
+        self.unavailable_failover_attempts = set()
+
+    def clear_warp_retry(self) -> None:
+        self.warp_retry_pending = False
+        self.warp_retry_attempted = False
+        self.warp_retry_track = None
+
+    def release(self) -> None:
+        """Cancela tarefas pendentes e solta referências a mensagens/tracks."""
+        for task in (self.warp_retry_future, self.warp_reconnect_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self.warp_retry_future = None
+        self.warp_reconnect_task = None
+        self.warp_retry_track = None
+        self.current_embed_message = None
+        self.lonely_pause_message = None
+        self.track_requesters.clear()
+        self.fallback_attempts.clear()
+        self.unavailable_failover_attempts.clear()
+        self.last_error = None
+
+
+class PlayerStateRegistry:
+    """guild_id -> PlayerState, criado sob demanda."""
+
+    def __init__(self) -> None:
+        self._states: dict[int, PlayerState] = {}
+        self.created = 0
+        self.released = 0
+
+    def get(self, guild_id: int) -> PlayerState:
+        state = self._states.get(guild_id)
+        if state is None:
+            state = PlayerState(guild_id)
+            self._states[guild_id] = state
+            self.created += 1
+        return state
+
+    def peek(self, guild_id: Optional[int]) -> Optional[PlayerState]:
+        """Estado existente, sem criar um novo."""
+        if guild_id is None:
+            return None
+        return self._states.get(guild_id)
+
+    def for_player(self, player: Any) -> PlayerState:
+        guild = getattr(player, "guild", None)
+        guild_id = getattr(guild, "id", None)
+        if guild_id is None:
+            # Player sem guild (já destruído): estado descartável
+            return PlayerState(0)
+        return self.get(guild_id)
+
+    def release(self, guild_id: Optional[int]) -> None:
+        state = self._states.pop(guild_id, None) if guild_id is not None else None
+        if state is not None:
+            state.release()
+            self.released += 1
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, guild_id: object) -> bool:
+        return guild_id in self._states
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "states": len(self._states),
+            "created": self.created,
+            "released": self.released,
+        }
@@ -6,6 +6,7 @@ import asyncio
 import math
 
 from commands import player_is_ready, resolve_wavelink_player
+from commands.tracklist import queue_total_length
 
 
 class QueueControlView(discord.ui.View):
@@ -82,7 +83,7 @@ class QueueControlView(discord.ui.View):
                     queue_mode = wavelink.QueueMode.normal
                     if getattr(self.player, "queue", None):
                         queue_mode = getattr(self.player.queue, "mode", wavelink.QueueMode.normal)
-                    mode = getattr(self.player, "loop_mode_override", queue_mode)
+                    mode = queue_mode
 
         if mode is wavelink.QueueMode.loop:
             button.style = discord.ButtonStyle.success
@@ -138,8 +139,7 @@ class QueueControlView(discord.ui.View):
                 color=0xff0000,
             )
 
-        queue_items = list(player.queue)
-        queue_count = len(queue_items)
+        queue_count = len(player.queue)
 
         if queue_count == 0 and not player.current:
             embed = discord.Embed(
@@ -221,7 +221,7 @@ class QueueControlView(discord.ui.View):
         # Página atual da fila
         start = self.page * self.per_page
         end = start + self.per_page
-        page_items = queue_items[start:end]
+        page_items = player.queue[start:end]
 
         queue_lines: list[str] = []
         for idx, track in enumerate(page_items, start=start + 1):
@@ -250,7 +250,7 @@ class QueueControlView(discord.ui.View):
                 inline=False,
             )
 
-        total_queue_duration = sum(track.length or 0 for track in queue_items)
+        total_queue_duration = queue_total_length(player.queue)
         remaining_current = 0
         if player.current and player.current.length:
             remaining_current = max(player.current.length - player.position, 0)
@@ -378,6 +378,7 @@ class QueueControlView(discord.ui.View):
             return
 
         await player.disconnect()
+        self.bot._release_guild_state(getattr(interaction.guild, "id", None))
         message = self._translate(
             interaction,
             "commands.play.stop.success",
@@ -450,10 +451,8 @@ class QueueControlView(discord.ui.View):
                 apply_loop_mode(player, new_mode)
             except Exception:
                 player.queue.mode = new_mode
-                setattr(player, "loop_mode_override", new_mode)
         else:
             player.queue.mode = new_mode
-            setattr(player, "loop_mode_override", new_mode)
         self._apply_loop_button_state(new_mode)
 
         message = self._translate(
@@ -540,7 +539,7 @@ class QueueControlView(discord.ui.View):
     @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary, custom_id="queue_next_page", row=1)
     async def next_page_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         player = self._coerce_player(interaction)
-        queue_length = len(list(player.queue)) if player else 0
+        queue_length = len(player.queue) if player else 0
         page_count = max(1, math.ceil(queue_length / self.per_page)) if queue_length else 1
         if self.page < page_count - 1:
             self.page += 1
@@ -650,11 +649,9 @@ class QueueCommands(commands.Cog):
             )
             return None
 
-        if getattr(player, "text_channel", None) is None and interaction.channel:
-            try:
-                player.text_channel = interaction.channel
-            except Exception:
-                pass
+        state = self.bot.player_states.for_player(player)
+        if state.text_channel is None and interaction.channel:
+            state.text_channel = interaction.channel
 
         return player
 
@@ -715,9 +712,9 @@ class QueueCommands(commands.Cog):
         if not player:
             return
 
-        queue_items = list(player.queue)
+        queue_length = len(player.queue)
 
-        if not queue_items:
+        if not queue_length:
             embed = self._error_embed(
                 interaction,
                 "commands.common.embeds.error_title",
@@ -727,33 +724,28 @@ class QueueCommands(commands.Cog):
             )
             return await self._send_interaction_message(interaction, embed=embed, ephemeral=True)
 
-        if position < 1 or position > len(queue_items):
+        if position < 1 or position > queue_length:
             embed = self._error_embed(
                 interaction,
                 "commands.queue.skipto.errors.invalid_title",
                 "commands.queue.skipto.errors.invalid_description",
                 title_default="Posição inválida",
-                description_default=f"Use um número entre 1 e {len(queue_items)}.",
-                max_position=len(queue_items),
+                description_default=f"Use um número entre 1 e {queue_length}.",
+                max_position=queue_length,
             )
             return await self._send_interaction_message(interaction, embed=embed, ephemeral=True)
 
+        # Remove só o trecho pulado (até o alvo), sem reconstruir a fila
         target_index = position - 1
-        target_track = queue_items[target_index]
-        remaining_tracks = queue_items[target_index + 1 :]
-
-        original_queue = queue_items.copy()
-
-        player.queue.clear()
-        for track in remaining_tracks:
-            await player.queue.put_wait(track)
+        skipped_tracks = player.queue[: target_index + 1]
+        target_track = skipped_tracks[-1]
+        del player.queue[: target_index + 1]
 
         try:
             await player.play(target_track)
         except Exception as exc:  # noqa: BLE001
-            player.queue.clear()
-            for track in original_queue:
-                await player.queue.put_wait(track)
+            for index, track in enumerate(skipped_tracks):
+                player.queue.put_at(index, track)
 
             embed = self._error_embed(
                 interaction,
@@ -902,7 +894,7 @@ class QueueCommands(commands.Cog):
         )
 
         if not player.queue.is_empty:
-            next_title = list(player.queue)[0].title if not player.queue.is_empty else "—"
+            next_title = player.queue[0].title if not player.queue.is_empty else "—"
             if len(next_title) > 25:
                 next_title_display = next_title[:25] + "..."
             else:
@@ -957,23 +949,20 @@ class QueueCommands(commands.Cog):
             )
             return await self._send_interaction_message(interaction, embed=embed)
 
-        q = list(player.queue)
-        if position < 1 or position > len(q):
+        queue_length = len(player.queue)
+        if position < 1 or position > queue_length:
             embed = self._error_embed(
                 interaction,
                 "commands.queue.remove.errors.invalid_title",
                 "commands.queue.remove.errors.invalid_description",
                 title_default="Posição Inválida",
-                description_default=f"Use um número entre 1 e {len(q)}.",
-                max_position=len(q),
+                description_default=f"Use um número entre 1 e {queue_length}.",
+                max_position=queue_length,
             )
             return await self._send_interaction_message(interaction, embed=embed)
 
-        removed_track = q.pop(position - 1)
-
-        player.queue.clear()
-        for t in q:
-            await player.queue.put_wait(t)
+        removed_track = player.queue[position - 1]
+        player.queue.delete(position - 1)
 
         removed_title = removed_track.title
         if len(removed_title) > 30:
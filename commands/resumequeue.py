@@ -5,17 +5,29 @@ Cog para restaurar fila após desconexão de node.
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING
+import os
+from typing import TYPE_CHECKING, Any
 
 import discord
 import wavelink
 from discord import app_commands
 from discord.ext import commands
 
+from commands import normalize_search_result
+from commands.tracklist import IndexedPlayer
+
 if TYPE_CHECKING:
     from index import MusicBot
 
 
+# O primeiro lote é pequeno para o player começar a tocar o quanto antes
+RESUME_FIRST_CHUNK_SIZE = 5
+RESUME_DECODE_CHUNK_SIZE = int(os.getenv("RESUME_DECODE_CHUNK_SIZE", "100"))
+# Buscas simultâneas para as entradas que não puderam ser decodificadas
+RESUME_SEARCH_CONCURRENCY = int(os.getenv("RESUME_SEARCH_CONCURRENCY", "4"))
+RESUME_DECODE_CONCURRENCY = 8
+
+
 class ResumeQueueCog(commands.Cog):
     """Comando para restaurar fila salva após queda de node."""
 
@@ -43,6 +55,73 @@ class ResumeQueueCog(commands.Cog):
         message = self._translate(interaction, key, default=key, **kwargs)
         return discord.Embed(title=error_title, description=message, color=0xFF0000)
 
+    async def _decode_chunk(self, node: wavelink.Node, encoded: list[str]) -> list[wavelink.Playable | None]:
+        """Decodifica vários blobs de uma vez via /v4/decodetracks.
+
+        Se o lote for rejeitado (basta um blob inválido), decodifica um a um para isolar o problema.
+        """
+        try:
+            payload = await node.send("POST", path="v4/decodetracks", data=encoded)
+            if isinstance(payload, list) and len(payload) == len(encoded):
+                return [wavelink.Playable(data) for data in payload]
+        except Exception as e:
+            print(f"[ResumeQueue] Decodificação em lote falhou ({len(encoded)} track(s)): {e}")
+
+        semaphore = asyncio.Semaphore(RESUME_DECODE_CONCURRENCY)
+
+        async def _decode_one(blob: str) -> wavelink.Playable | None:
+            async with semaphore:
+                try:
+                    data = await node.send("GET", path="v4/decodetrack", params={"encodedTrack": blob})
+                    return wavelink.Playable(data) if isinstance(data, dict) else None
+                except Exception:
+                    return None
+
+        return list(await asyncio.gather(*(_decode_one(blob) for blob in encoded)))
+
+    async def _search_cached_track(self, cached: dict[str, Any], semaphore: asyncio.Semaphore) -> wavelink.Playable | None:
+        """Fallback: procura novamente uma entrada que não pôde ser decodificada."""
+        query = cached.get("uri") or cached.get("identifier")
+        if not query or not str(query).startswith(("http://", "https://")):
+            text = f"{cached.get('title') or ''} {cached.get('author') or ''}".strip()
+            query = f"ytsearch:{text}" if text else None
+        if not query:
+            return None
+
+        async with semaphore:
+            try:
+                result = normalize_search_result(await self.bot.load_tracks(query))
+            except Exception as e:
+                print(f"[ResumeQueue] Falha ao resolver track: {cached.get('title', 'unknown')} - {e}")
+                return None
+
+        if not result:
+            return None
+        tracks = result.tracks if isinstance(result, wavelink.Playlist) else result
+        return tracks[0] if tracks else None
+
+    async def _restore_chunk(
+        self,
+        node: wavelink.Node,
+        chunk: list[dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> list[wavelink.Playable | None]:
+        """Resolve um lote mantendo a ordem: decode em massa e busca só para o que falhar."""
+        resolved: list[wavelink.Playable | None] = [None] * len(chunk)
+        positions = [index for index, cached in enumerate(chunk) if cached.get("encoded")]
+        if positions:
+            decoded = await self._decode_chunk(node, [chunk[index]["encoded"] for index in positions])
+            for index, track in zip(positions, decoded):
+                resolved[index] = track
+
+        missing = [index for index, track in enumerate(resolved) if track is None]
+        if missing:
+            found = await asyncio.gather(*(self._search_cached_track(chunk[index], semaphore) for index in missing))
+            for index, track in zip(missing, found):
+                resolved[index] = track
+
+        return resolved
+
     async def _cleanup_voice_state(self, guild: discord.Guild) -> None:
         """Limpa estado de voz corrompido."""
         try:
@@ -111,8 +190,8 @@ class ResumeQueueCog(commands.Cog):
 
         print(f"[ResumeQueue] {len(usable_nodes)} node(s) disponível(is)")
 
-        # Ordena por quantidade de players (menos players = menos carga)
-        usable_nodes.sort(key=lambda n: len(getattr(n, 'players', {})))
+        # Ordena pela pontuação de carga (menor penalidade primeiro)
+        usable_nodes = self.bot.rank_nodes(usable_nodes)
         selected_node = usable_nodes[0]
         player_count = len(getattr(selected_node, 'players', {}))
         print(f"[ResumeQueue] Selecionado node: {selected_node.identifier} ({player_count} player(s) ativos)")
@@ -136,7 +215,7 @@ class ResumeQueueCog(commands.Cog):
 
                 # Cria player com o node selecionado explicitamente
                 def _player_factory(client: discord.Client, ch: discord.abc.Connectable):
-                    return wavelink.Player(client, ch, nodes=[selected_node])
+                    return IndexedPlayer(client, ch, nodes=[selected_node])
 
                 player = await voice_channel.connect(
                     cls=_player_factory, 
@@ -315,45 +394,55 @@ class ResumeQueueCog(commands.Cog):
             return
 
         # Guardar text_channel
-        player.text_channel = interaction.channel
+        self.bot.player_states.for_player(player).text_channel = interaction.channel
 
-        # Restaurar músicas
+        # Restaurar músicas: decode em lote dos blobs salvos, tocando assim que o primeiro estiver pronto
         added_count = 0
         failed_count = 0
         first_track = None
 
-        for cached in cached_tracks:
-            try:
-                # Usar URI ou busca por título
-                search_query = cached.get("uri") or cached.get("identifier") or f"{cached.get('title', '')} {cached.get('author', '')}"
-                if not search_query or not search_query.strip():
-                    failed_count += 1
-                    continue
-
-                # Pequeno delay entre buscas
-                if added_count > 0:
-                    await asyncio.sleep(0.15)
-
-                # Buscar track
-                tracks = await wavelink.Playable.search(search_query)
-                if tracks:
-                    track = tracks[0]
-                    track.requester = interaction.user  # type: ignore
-                    player.queue.put(track)
-                    added_count += 1
-
-                    if first_track is None:
-                        first_track = track
-                else:
-                    failed_count += 1
+        node = getattr(player, "node", None) or wavelink.Pool.get_node()
+        semaphore = asyncio.Semaphore(max(1, RESUME_SEARCH_CONCURRENCY))
+        chunk_size = max(1, RESUME_DECODE_CHUNK_SIZE)
+        chunks = [cached_tracks[:RESUME_FIRST_CHUNK_SIZE]]
+        chunks.extend(
+            cached_tracks[offset:offset + chunk_size]
+            for offset in range(RESUME_FIRST_CHUNK_SIZE, len(cached_tracks), chunk_size)
+        )
 
+        import time
+        started = time.perf_counter()
+        for chunk in chunks:
+            if not chunk:
+                continue
+            try:
+                resolved = await self._restore_chunk(node, chunk, semaphore)
             except Exception as e:
-                print(f"[ResumeQueue] Falha ao resolver track: {cached.get('title', 'unknown')} - {e}")
-                failed_count += 1
+                print(f"[ResumeQueue] Falha ao restaurar lote: {e}")
+                failed_count += len(chunk)
+                continue
 
-                # Se for erro de Lavalink, para de tentar
-                if "lavalink" in str(e).lower() or "node" in str(e).lower():
-                    break
+            for track in resolved:
+                if track is None:
+                    failed_count += 1
+                    continue
+                track.requester = interaction.user  # type: ignore
+                player.queue.put(track)
+                added_count += 1
+                if first_track is None:
+                    first_track = track
+
+            # Começa a tocar com o primeiro lote; o resto entra na fila em seguida
+            if first_track is not None and not player.playing and not player.paused and not player.current:
+                try:
+                    await player.play(player.queue.get())
+                except Exception as e:
+                    print(f"[ResumeQueue] Falha ao iniciar reprodução: {e}")
+
+        print(
+            f"[ResumeQueue] Guild {guild_id}: {added_count} restaurada(s), {failed_count} falha(s) "
+            f"em {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
 
         if added_count == 0:
             title = self._translate(
@@ -385,7 +474,7 @@ class ResumeQueueCog(commands.Cog):
         self.bot.queue_cache.clear_queue(guild_id)
 
         # Começar a tocar se não estiver tocando
-        if not player.playing and not player.paused:
+        if not player.playing and not player.paused and not player.current and not player.queue.is_empty:
             await player.play(player.queue.get())
 
         # Embed de sucesso
@@ -1,10 +1,10 @@
-import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
 import wavelink
 
-from commands import player_is_ready, resolve_wavelink_player
+from commands import hedged_search, player_is_ready, resolve_wavelink_player
+from commands.tracklist import IndexedPlayer
 
 
 class MusicControlView(discord.ui.View):
@@ -20,8 +20,9 @@ class MusicControlView(discord.ui.View):
 
         initial_mode = None
         if player:
-            if hasattr(player, "loop_mode_override"):
-                initial_mode = player.loop_mode_override
+            state = bot.player_states.peek(resolved_guild_id)
+            if state is not None and state.loop_mode_override is not None:
+                initial_mode = state.loop_mode_override
             elif getattr(player, "queue", None):
                 initial_mode = player.queue.mode
         self._apply_loop_button_state(initial_mode)
@@ -185,7 +186,7 @@ class MusicControlView(discord.ui.View):
             response_default = "🔁 Loop desativado."
 
         player.queue.mode = new_mode
-        player.loop_mode_override = new_mode
+        self.bot.player_states.for_player(player).loop_mode_override = new_mode
         if interaction.guild:
             self._guild_id = interaction.guild.id
         self._apply_loop_button_state(new_mode)
@@ -304,7 +305,7 @@ class MusicControlView(discord.ui.View):
         self._update_play_pause_button(player)
 
         try:
-            embed_message = getattr(player, "current_embed_message", None)
+            embed_message = self.bot.player_states.for_player(player).current_embed_message
             new_embed = None
             current_track = getattr(player, "current", None)
             build_embed = getattr(self.bot, "_build_now_playing_embed", None)
@@ -331,6 +332,7 @@ class MusicControlView(discord.ui.View):
             return
 
         await player.disconnect()
+        self.bot._release_guild_state(getattr(interaction.guild, "id", None))
         await self._send_ephemeral(
             interaction,
             self._translate(
@@ -523,7 +525,7 @@ class SearchDropdown(discord.ui.Select):
                     return
 
                 try:
-                    player = await voice_channel.connect(cls=wavelink.Player, self_deaf=True, reconnect=True)
+                    player = await voice_channel.connect(cls=IndexedPlayer, self_deaf=True, reconnect=True)
                 except Exception as e:
                     translator = getattr(self.bot, "translate", None)
                     message = f"❌ Erro ao conectar ao canal de voz: {e}"
@@ -552,22 +554,16 @@ class SearchDropdown(discord.ui.Select):
                     return
 
             # Define o canal de texto para mensagens automáticas (fim da playlist)
-            try:
-                player.text_channel = interaction.channel
-            except Exception:
-                pass
-
-            # Inicializa o dicionário de requesters se não existir
-            if not hasattr(player, "_track_requesters"):
-                player._track_requesters = {}
+            state = self.bot.player_states.for_player(player)
+            state.text_channel = interaction.channel
 
             # Define quem solicitou a música
             track.requester = interaction.user
             
-            # Armazena também em um dicionário personalizado
+            # Armazena também no estado do servidor
             track_id = getattr(track, "identifier", None) or getattr(track, "encoded", None)
             if track_id:
-                player._track_requesters[track_id] = interaction.user
+                state.remember_requester(track_id, interaction.user)
 
             # Se já está tocando algo, adiciona à fila ou substitui
             if player.playing:
@@ -850,10 +846,8 @@ class SearchCommands(commands.Cog):
         """Busca em múltiplas fontes com a mesma ordem padrão do /play (YTM → YT → SC → Spotify)."""
 
         async def _fetch(identifier: str):
-            try:
-                return await wavelink.Pool.fetch_tracks(identifier)
-            except Exception:
-                return await interaction.client.search_with_failover(identifier)
+            # Cache compartilhado + failover entre nós (MusicBot.load_tracks)
+            return await interaction.client.load_tracks(identifier)
 
         attempts: list[str]
         clean_query = self._strip_search_prefix(query)
@@ -879,46 +873,7 @@ class SearchCommands(commands.Cog):
         if max_attempts is not None:
             attempts = attempts[:max_attempts]
 
-        last_exc: Exception | None = None
-
-        for attempt in attempts:
-            try:
-                coro = _fetch(attempt)
-                tracks = await asyncio.wait_for(coro, timeout=timeout) if timeout else await coro
-            except Exception as exc:
-                last_exc = exc
-                continue
-
-            if not tracks:
-                continue
-
-            if isinstance(tracks, wavelink.Playlist):
-                if getattr(tracks, "tracks", None):
-                    return tracks
-                continue
-
-            playable_cls = getattr(wavelink, "Playable", None)
-            if playable_cls and isinstance(tracks, playable_cls):
-                return [tracks]
-
-            try:
-                tracks_list = list(tracks)
-            except TypeError:
-                tracks_list = []
-
-            if tracks_list:
-                return tracks_list
-
-        if last_exc:
-            raise last_exc
-        if is_url:
-            return None
-
-        fallback_attempts = default_attempts if max_attempts is None else default_attempts[:max_attempts]
-        if not fallback_attempts:
-            return None
-
-        return await _run_attempts(fallback_attempts)
+        return await hedged_search(_fetch, attempts, attempt_timeout=timeout)
 
     @app_commands.command(name="search", description="Search for tracks and choose which one to play")
     @app_commands.describe(query="Termo de busca ou URL para encontrar músicas")
@@ -0,0 +1,407 @@
+"""
+Retomada das sessões Lavalink entre restarts do bot.
+No desligamento (e periodicamente, para cobrir crashes) grava o session id de cada node e,
+por servidor, o node, o canal de voz, o canal de texto, o loop e a fila já resolvida.
+No start o node reconecta com o mesmo Session-Id (resuming do Lavalink v4), que manteve os
+players tocando; o bot volta para a call e remonta o Player a partir do que o Lavalink
+informa, sem resolver as faixas de novo.
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import discord
+import wavelink
+
+from commands.tracklist import IndexedPlayer
+
+
+# Segundos que o Lavalink segura a sessão depois que o bot cai (0 desativa a retomada)
+LAVALINK_RESUME_TIMEOUT_SECONDS = int(os.getenv("LAVALINK_RESUME_TIMEOUT_SECONDS", "60"))
+SESSION_SNAPSHOT_FILE = os.getenv("SESSION_SNAPSHOT_FILE", "lavalink_sessions.json")
+SESSION_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("SESSION_SNAPSHOT_INTERVAL_SECONDS", "30"))
+SESSION_RESTORE_MAX_CONCURRENCY = 5
+SESSION_RESTORE_CONNECT_TIMEOUT = 10.0
+
+
+class MongoSessionStore:
+    """Snapshot único numa coleção do MongoDB."""
+
+    name = "mongo"
+
+    def __init__(self, storage, collection):
+        self.storage = storage
+        self.collection = collection
+
+    async def load(self) -> Optional[dict]:
+        document = await self.storage.find_one(self.collection, {"_id": "snapshot"}, {"value": 1})
+        return document.get("value") if document else None
+
+    async def save(self, snapshot: dict) -> None:
+        await self.storage.update_one(
+            self.collection,
+            {"_id": "snapshot"},
+            {"$set": {"value": snapshot}},
+            upsert=True,
+        )
+
+
+class FileSessionStore:
+    """Snapshot num arquivo JSON local, gravado de forma atômica."""
+
+    name = "file"
+
+    def __init__(self, path: str | Path = SESSION_SNAPSHOT_FILE):
+        self.path = Path(path)
+
+    def _read(self) -> Optional[dict]:
+        if not self.path.exists():
+            return None
+        with self.path.open("r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        return data if isinstance(data, dict) else None
+
+    def _write(self, snapshot: dict) -> None:
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as fp:
+            json.dump(snapshot, fp, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    async def load(self) -> Optional[dict]:
+        return await asyncio.to_thread(self._read)
+
+    async def save(self, snapshot: dict) -> None:
+        await asyncio.to_thread(self._write, snapshot)
+
+
+class SessionResumer:
+    """Grava e restaura as sessões Lavalink/players do bot."""
+
+    def __init__(self, bot, *, resume_timeout: int = LAVALINK_RESUME_TIMEOUT_SECONDS):
+        self.bot = bot
+        self.resume_timeout = max(0, resume_timeout)
+        self.store: MongoSessionStore | FileSessionStore | None = None
+        self._sessions: dict[str, dict] = {}  # node_id -> {uri, sessionId} do snapshot carregado
+        self._pending: dict[int, dict] = {}  # guild_id -> entrada ainda não restaurada
+        self._restore_tasks: set[asyncio.Task] = set()
+        self._loop_task: asyncio.Task | None = None
+        self._expire_task: asyncio.Task | None = None
+        self._last_written: Optional[str] = None
+        self.saves = 0
+        self.save_errors = 0
+        self.restored = 0
+        self.failed = 0
+        self.fallbacks = 0
+        self.last_restore_ms: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.resume_timeout > 0
+
+    async def attach(self, store: MongoSessionStore | FileSessionStore) -> None:
+        """Anexa o store e carrega o snapshot do processo anterior (se ainda dentro da janela)."""
+        self.store = store
+        if not self.enabled:
+            return
+
+        try:
+            snapshot = await store.load()
+        except Exception as exc:
+            print(f"[Sessões] Falha ao carregar snapshot do store '{store.name}': {exc}")
+            return
+        if not snapshot:
+            return
+
+        # Snapshot mais velho que a janela de retomada: o Lavalink já descartou as sessões
+        age = time.time() - (snapshot.get("savedAt") or 0) / 1000
+        if age > self.resume_timeout + SESSION_SNAPSHOT_INTERVAL_SECONDS:
+            print(f"[Sessões] Snapshot de {age:.0f}s atrás expirou; nada a retomar.")
+            return
+
+        self._sessions = {
+            node_id: entry for node_id, entry in (snapshot.get("nodes") or {}).items()
+            if isinstance(entry, dict) and entry.get("sessionId")
+        }
+        for guild_id, entry in (snapshot.get("guilds") or {}).items():
+            if isinstance(entry, dict) and entry.get("node") in self._sessions:
+                self._pending[int(guild_id)] = entry
+        if self._pending:
+            print(f"[Sessões] {len(self._pending)} player(s) aguardando retomada em {len(self._sessions)} node(s)")
+            self._expire_task = asyncio.create_task(self._expire_pending())
+
+    def session_for(self, identifier: str, uri: str) -> Optional[str]:
+        """Session id a reaproveitar na conexão do node (apenas se a URI não mudou)."""
+        entry = self._sessions.get(identifier)
+        if not entry or entry.get("uri") != uri:
+            return None
+        return entry.get("sessionId")
+
+    def start(self) -> None:
+        if self.enabled and self.store is not None and self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(SESSION_SNAPSHOT_INTERVAL_SECONDS)
+            # Não sobrescreve o snapshot anterior enquanto ainda há players dele para retomar
+            if not self._pending:
+                await self.save()
+
+    def _serialize_player(self, player: wavelink.Player) -> Optional[dict]:
+        guild = getattr(player, "guild", None)
+        channel = getattr(player, "channel", None)
+        node = getattr(player, "node", None)
+        if guild is None or channel is None or node is None or not getattr(node, "session_id", None):
+            return None
+
+        current = getattr(player, "current", None)
+        queue = list(player.queue) if not player.queue.is_empty else []
+        if current is None and not queue:
+            return None
+
+        state = self.bot.player_states.for_player(player)
+        requesters: dict[str, int] = {}
+        for track in ([current] if current is not None else []) + queue:
+            track_id = getattr(track, "identifier", None) or getattr(track, "encoded", None)
+            user_id = getattr(state.requester_for(track), "id", None)
+            if track_id and user_id is not None:
+                requesters[track_id] = user_id
+
+        return {
+            "node": node.identifier,
+            "voiceChannel": channel.id,
+            "textChannel": getattr(state.text_channel, "id", None),
+            "loop": self.bot._get_loop_mode(player).name,
+            "autoplay": player.autoplay.name,
+            "current": current.raw_data if current is not None else None,
+            "queue": [track.raw_data for track in queue],
+            "requesters": requesters,
+        }
+
+    def build_snapshot(self) -> dict:
+        nodes = {
+            node.identifier: {"uri": node.uri, "sessionId": node.session_id}
+            for node in wavelink.Pool.nodes.values()
+            if node.status == wavelink.NodeStatus.CONNECTED and node.session_id
+        }
+        guilds: dict[str, dict] = {}
+        for voice_client in self.bot.voice_clients:
+            if not isinstance(voice_client, wavelink.Player):
+                continue
+            try:
+                entry = self._serialize_player(voice_client)
+            except Exception as exc:
+                print(f"[Sessões] Falha ao serializar player: {exc}")
+                continue
+            if entry is not None and entry["node"] in nodes:
+                guilds[str(voice_client.guild.id)] = entry
+        return {"nodes": nodes, "guilds": guilds}
+
+    async def save(self) -> None:
+        """Grava o snapshot atual, pulando a escrita quando nada mudou desde a última."""
+        if not self.enabled or self.store is None:
+            return
+
+        snapshot = self.build_snapshot()
+        serialized = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+        if serialized == self._last_written:
+            return
+
+        snapshot["savedAt"] = int(time.time() * 1000)
+        try:
+            await self.store.save(snapshot)
+        except Exception as exc:
+            self.save_errors += 1
+            print(f"[Sessões] Falha ao gravar snapshot no store '{self.store.name}': {exc}")
+            return
+        self._last_written = serialized
+        self.saves += 1
+
+    def detach_players(self) -> int:
+        """Solta os players sem destruí-los no Lavalink, para o close do discord.py não encerrar as sessões."""
+        detached = 0
+        for voice_client in list(self.bot.voice_clients):
+            if not isinstance(voice_client, wavelink.Player) or voice_client.guild is None:
+                continue
+            guild_id = voice_client.guild.id
+            self.bot._connection._remove_voice_client(guild_id)
+            try:
+                voice_client.node._players.pop(guild_id, None)
+            except Exception:
+                pass
+            detached += 1
+        return detached
+
+    async def close(self) -> None:
+        for task in (self._loop_task, self._expire_task, *self._restore_tasks):
+            if task is not None and not task.done():
+                task.cancel()
+        self._loop_task = None
+        self._expire_task = None
+        if not self.enabled or self.store is None:
+            return
+
+        # Players ainda não retomados continuam valendo para o próximo start
+        if not self._pending:
+            await self.save()
+        detached = self.detach_players()
+        if detached:
+            print(f"[Sessões] {detached} player(s) mantidos no Lavalink para retomada após o restart")
+
+    def on_node_ready(self, node: wavelink.Node, resumed: bool) -> None:
+        """Chamado quando um node conecta: retoma os players dele ou devolve as filas ao QueueCache."""
+        entries = {
+            guild_id: entry for guild_id, entry in self._pending.items()
+            if entry.get("node") == node.identifier
+        }
+        if not entries:
+            return
+        for guild_id in entries:
+            self._pending.pop(guild_id, None)
+        self._sessions.pop(node.identifier, None)
+
+        if not resumed:
+            print(f"[Sessões] Node {node.identifier} abriu sessão nova; {len(entries)} fila(s) vão para o /resumequeue")
+            for guild_id, entry in entries.items():
+                self._fallback(guild_id, entry)
+            return
+
+        task = asyncio.create_task(self._restore_node(node, entries))
+        self._restore_tasks.add(task)
+        task.add_done_callback(self._restore_tasks.discard)
+
+    async def _expire_pending(self) -> None:
+        # Nodes que não voltaram dentro da janela: as sessões deles já eram
+        await asyncio.sleep(self.resume_timeout + SESSION_RESTORE_CONNECT_TIMEOUT)
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._sessions.clear()
+        print(f"[Sessões] {len(pending)} player(s) não retomados a tempo; filas vão para o /resumequeue")
+        for guild_id, entry in pending.items():
+            self._fallback(guild_id, entry)
+
+    def _fallback(self, guild_id: int, entry: dict) -> None:
+        """Sem sessão para retomar: salva a fila no QueueCache, como numa queda de node."""
+        self.fallbacks += 1
+        current = wavelink.Playable(entry["current"]) if entry.get("current") else None
+        queue = [wavelink.Playable(data) for data in entry.get("queue") or []]
+        self.bot.queue_cache.save_queue(guild_id, current, queue)
+
+    async def _restore_node(self, node: wavelink.Node, entries: dict[int, dict]) -> None:
+        await self.bot.wait_until_ready()
+        semaphore = asyncio.Semaphore(SESSION_RESTORE_MAX_CONCURRENCY)
+        started = time.perf_counter()
+
+        async def _restore(guild_id: int, entry: dict) -> bool:
+            async with semaphore:
+                try:
+                    return await self._restore_guild(node, guild_id, entry)
+                except Exception as exc:
+                    print(f"[Sessões] Guild {guild_id}: falha ao retomar player: {exc!r}")
+                    self._fallback(guild_id, entry)
+                    return False
+
+        results = await asyncio.gather(*(_restore(guild_id, entry) for guild_id, entry in entries.items()))
+        restored = sum(1 for result in results if result)
+        self.restored += restored
+        self.failed += len(results) - restored
+        self.last_restore_ms = round((time.perf_counter() - started) * 1000, 1)
+        print(
+            f"[Sessões] Node {node.identifier}: {restored}/{len(results)} player(s) retomados "
+            f"em {self.last_restore_ms:.0f}ms"
+        )
+
+    async def _restore_guild(self, node: wavelink.Node, guild_id: int, entry: dict) -> bool:
+        guild = self.bot.get_guild(guild_id)
+        channel = guild.get_channel(entry.get("voiceChannel") or 0) if guild is not None else None
+        if channel is None or guild.voice_client is not None:
+            await self._discard_remote_player(node, guild_id)
+            return False
+
+        # O que o Lavalink ainda está tocando vale mais que o snapshot (a faixa pode ter terminado)
+        try:
+            remote = await node._fetch_player(guild_id)
+        except Exception:
+            remote = None
+        if remote is None:
+            self._fallback(guild_id, entry)
+            return False
+
+        queue = [wavelink.Playable(data) for data in entry.get("queue") or []]
+        track_data = remote.get("track")
+        if not track_data and not queue:
+            await self._discard_remote_player(node, guild_id)
+            return False
+
+        def _player_factory(client: discord.Client, ch: discord.abc.Connectable):
+            return IndexedPlayer(client, ch, nodes=[node])
+
+        # O VOICE_UPDATE da nova conexão é aplicado ao player que já existe na sessão retomada
+        player: wavelink.Player = await channel.connect(
+            cls=_player_factory,
+            self_deaf=True,
+            timeout=SESSION_RESTORE_CONNECT_TIMEOUT,
+        )
+
+        if track_data:
+            current = wavelink.Playable(track_data)
+            player._current = current
+            player._original = current
+            player._last_position = int((remote.get("state") or {}).get("position") or 0)
+            player._last_update = time.monotonic_ns()
+        player._volume = int(remote.get("volume", player._volume))
+        player._paused = bool(remote.get("paused", False))
+        if remote.get("filters"):
+            player._filters = wavelink.Filters(data=remote["filters"])
+        player._session_id = node.session_id
+
+        state = self.bot.player_states.for_player(player)
+        text_channel = guild.get_channel(entry.get("textChannel") or 0)
+        if text_channel is not None:
+            state.text_channel = text_channel
+        for track_id, user_id in (entry.get("requesters") or {}).items():
+            member = guild.get_member(user_id)
+            if member is not None:
+                state.remember_requester(track_id, member)
+
+        try:
+            player.autoplay = wavelink.AutoPlayMode[entry.get("autoplay") or "disabled"]
+        except KeyError:
+            pass
+        player.queue.put(queue)
+        try:
+            self.bot._apply_loop_mode(player, wavelink.QueueMode[entry.get("loop") or "normal"])
+        except KeyError:
+            pass
+        self.bot._set_session_node_affinity(guild_id, node.identifier)
+
+        # A faixa acabou enquanto o bot estava fora: segue para a próxima da fila
+        if not track_data:
+            await player.play(player.queue.get())
+
+        print(f"[Sessões] Guild {guild_id}: player retomado no node {node.identifier}")
+        return True
+
+    @staticmethod
+    async def _discard_remote_player(node: wavelink.Node, guild_id: int) -> None:
+        try:
+            await node._destroy_player(guild_id)
+        except Exception:
+            pass
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "store": self.store.name if self.store is not None else "none",
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "restored": self.restored,
+            "failed": self.failed,
+            "fallbacks": self.fallbacks,
+            "saves": self.saves,
+            "save_errors": self.save_errors,
+            "last_restore_ms": self.last_restore_ms,
+        }
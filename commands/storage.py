@@ -0,0 +1,144 @@
+"""
+Camada de persistência assíncrona para o MongoDB.
+O pymongo é síncrono, então toda operação roda em um pool de threads limitado,
+com timeout por operação e métricas de latência. Nenhum cog deve chamar a
+coleção diretamente a partir de uma corrotina.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+MONGO_MAX_WORKERS = int(os.getenv("MONGO_MAX_WORKERS", "4"))
+MONGO_OPERATION_TIMEOUT = float(os.getenv("MONGO_OPERATION_TIMEOUT", "5"))
+
+
+class _OperationStats:
+    """Métricas acumuladas de uma operação (ex.: guild_languages.find_one)."""
+
+    __slots__ = ("calls", "errors", "timeouts", "total_ms", "max_ms", "last_ms")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+        }
+
+
+class MongoStorage:
+    """Serviço assíncrono de acesso ao MongoDB compartilhado por todos os cogs"""
+
+    def __init__(
+        self,
+        database,
+        *,
+        max_workers: int = MONGO_MAX_WORKERS,
+        default_timeout: float = MONGO_OPERATION_TIMEOUT,
+    ):
+        self.database = database
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="mongo",
+        )
+        self._stats: dict[str, _OperationStats] = {}
+
+    async def run(
+        self,
+        operation: str,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Executa uma chamada bloqueante do pymongo fora do event loop."""
+        stats = self._stats.setdefault(operation, _OperationStats())
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            future = loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            return await asyncio.wait_for(future, timeout=timeout or self.default_timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.record((time.perf_counter() - started) * 1000)
+
+    async def find_one(
+        self,
+        collection,
+        filter: dict,
+        projection: Optional[dict] = None,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Optional[dict]:
+        return await self.run(
+            f"{collection.name}.find_one",
+            collection.find_one,
+            filter,
+            projection,
+            timeout=timeout,
+        )
+
+    async def find_many(
+        self,
+        collection,
+        filter: dict,
+        projection: Optional[dict] = None,
+        *,
+        timeout: Optional[float] = None,
+    ) -> list[dict]:
+        def _query() -> list[dict]:
+            return list(collection.find(filter, projection))
+
+        return await self.run(f"{collection.name}.find", _query, timeout=timeout)
+
+    async def update_one(
+        self,
+        collection,
+        filter: dict,
+        update: dict,
+        *,
+        upsert: bool = False,
+        timeout: Optional[float] = None,
+    ):
+        return await self.run(
+            f"{collection.name}.update_one",
+            collection.update_one,
+            filter,
+            update,
+            upsert=upsert,
+            timeout=timeout,
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Latência e contadores por operação."""
+        return {name: entry.as_dict() for name, entry in sorted(self._stats.items())}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
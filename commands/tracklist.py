@@ -0,0 +1,303 @@
+"""
+Fila indexada para filas muito grandes.
+O wavelink.Queue guarda os tracks numa lista simples e os cogs copiavam a fila inteira
+para pular, remover ou paginar. Aqui os tracks ficam em blocos com uma árvore de Fenwick
+dos tamanhos, então acesso/remoção/inserção por posição e fatias custam O(log n) para
+achar o bloco mais um deslocamento dentro de um bloco pequeno.
+"""
+from typing import Any, Iterable, Iterator
+
+import wavelink
+
+
+class TrackList:
+    """Sequência em blocos compatível com a lista interna do wavelink.Queue."""
+
+    __slots__ = ("_blocks", "_tree", "_len", "_total_length")
+
+    # Tamanho alvo de cada bloco (blocos são divididos ao passar de 2x)
+    _LOAD = 256
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._blocks: list[list[Any]] = []
+        self._tree: list[int] = [0]
+        self._len = 0
+        self._total_length = 0  # soma das durações (ms), mantida incrementalmente
+        self.extend(items)
+
+    # ------------------------------------------------------------------
+    # Índice de Fenwick sobre o tamanho dos blocos
+    # ------------------------------------------------------------------
+    def _rebuild(self) -> None:
+        tree = [0] + [len(block) for block in self._blocks]
+        size = len(tree)
+        for index in range(1, size):
+            parent = index + (index & -index)
+            if parent < size:
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _tree_add(self, block_index: int, delta: int) -> None:
+        tree = self._tree
+        index = block_index + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Converte uma posição (0 <= index < len) em (bloco, deslocamento)."""
+        tree = self._tree
+        size = len(tree)
+        position = 0
+        remaining = index
+        step = 1 << (size - 1).bit_length()
+        while step:
+            candidate = position + step
+            if candidate < size and tree[candidate] <= remaining:
+                position = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return position, remaining
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("TrackList index out of range")
+        return index
+
+    @staticmethod
+    def _duration(track: Any) -> int:
+        return getattr(track, "length", None) or 0
+
+    # ------------------------------------------------------------------
+    # Operações posicionais
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for block in self._blocks:
+            yield from block
+
+    def __reversed__(self) -> Iterator[Any]:
+        for block in reversed(self._blocks):
+            yield from reversed(block)
+
+    def __contains__(self, value: Any) -> bool:
+        return any(value in block for block in self._blocks)
+
+    def __repr__(self) -> str:
+        return f"TrackList(len={self._len}, blocks={len(self._blocks)})"
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return self._range(start, stop)
+            return list(self)[index]
+
+        block_index, offset = self._locate(self._normalize(index))
+        return self._blocks[block_index][offset]
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self._reset(items)
+            return
+
+        block_index, offset = self._locate(self._normalize(index))
+        block = self._blocks[block_index]
+        self._total_length += self._duration(value) - self._duration(block[offset])
+        block[offset] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                self._delete_range(start, stop)
+            else:
+                items = list(self)
+                del items[index]
+                self._reset(items)
+            return
+
+        self.pop(index)
+
+    def _range(self, start: int, stop: int) -> list[Any]:
+        if start >= stop:
+            return []
+
+        block_index, offset = self._locate(start)
+        needed = stop - start
+        out: list[Any] = []
+        while needed > 0:
+            chunk = self._blocks[block_index][offset:offset + needed]
+            out.extend(chunk)
+            needed -= len(chunk)
+            block_index += 1
+            offset = 0
+        return out
+
+    def _delete_range(self, start: int, stop: int) -> None:
+        if start >= stop:
+            return
+
+        block_index, offset = self._locate(start)
+        count = stop - start
+        while count > 0:
+            block = self._blocks[block_index]
+            take = min(count, len(block) - offset)
+            for track in block[offset:offset + take]:
+                self._total_length -= self._duration(track)
+            del block[offset:offset + take]
+            count -= take
+            if block:
+                block_index += 1
+            else:
+                del self._blocks[block_index]
+            offset = 0
+
+        self._len -= stop - start
+        self._rebuild()
+
+    def pop(self, index: int = -1) -> Any:
+        if not self._len:
+            raise IndexError("pop from empty TrackList")
+
+        block_index, offset = self._locate(self._normalize(index))
+        block = self._blocks[block_index]
+        value = block.pop(offset)
+        self._len -= 1
+        self._total_length -= self._duration(value)
+        if block:
+            self._tree_add(block_index, -1)
+        else:
+            del self._blocks[block_index]
+            self._rebuild()
+        return value
+
+    def insert(self, index: int, value: Any) -> None:
+        # Mesma semântica de list.insert para índices fora do intervalo
+        if index < 0:
+            index = max(0, index + self._len)
+        index = min(index, self._len)
+
+        if not self._blocks:
+            self._blocks.append([value])
+            block_index = 0
+            self._rebuild()
+        else:
+            if index == self._len:
+                block_index = len(self._blocks) - 1
+                self._blocks[block_index].append(value)
+            else:
+                block_index, offset = self._locate(index)
+                self._blocks[block_index].insert(offset, value)
+            self._tree_add(block_index, 1)
+
+        self._len += 1
+        self._total_length += self._duration(value)
+
+        block = self._blocks[block_index]
+        if len(block) > 2 * self._LOAD:
+            self._blocks.insert(block_index + 1, block[self._LOAD:])
+            del block[self._LOAD:]
+            self._rebuild()
+
+    def append(self, value: Any) -> None:
+        self.insert(self._len, value)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        items = list(items)
+        if not items:
+            return
+
+        self._len += len(items)
+        self._total_length += sum(self._duration(track) for track in items)
+
+        if self._blocks and len(self._blocks[-1]) < self._LOAD:
+            fill = self._LOAD - len(self._blocks[-1])
+            self._blocks[-1].extend(items[:fill])
+            items = items[fill:]
+
+        for start in range(0, len(items), self._LOAD):
+            self._blocks.append(items[start:start + self._LOAD])
+        self._rebuild()
+
+    def move(self, source: int, destination: int) -> None:
+        """Move o item da posição source para destination (semântica de pop + insert)."""
+        self.insert(destination, self.pop(source))
+
+    def index(self, value: Any) -> int:
+        offset = 0
+        for block in self._blocks:
+            try:
+                return offset + block.index(value)
+            except ValueError:
+                offset += len(block)
+        raise ValueError("value is not in TrackList")
+
+    def remove(self, value: Any) -> None:
+        self.pop(self.index(value))
+
+    def clear(self) -> None:
+        self._blocks = []
+        self._tree = [0]
+        self._len = 0
+        self._total_length = 0
+
+    def _reset(self, items: Iterable[Any]) -> None:
+        self.clear()
+        self.extend(items)
+
+    def copy(self) -> "TrackList":
+        return TrackList(self)
+
+    @property
+    def total_length(self) -> int:
+        """Duração somada dos tracks, em ms."""
+        return self._total_length
+
+
+class IndexedQueue(wavelink.Queue):
+    """wavelink.Queue com armazenamento em TrackList e operações posicionais para os cogs."""
+
+    def __init__(self, *, history: bool = True) -> None:
+        super().__init__(history=history)
+        self._items = TrackList()
+
+    def copy(self) -> "IndexedQueue":
+        copy_queue = IndexedQueue(history=self.history is not None)
+        copy_queue._items = self._items.copy()
+        return copy_queue
+
+    def slice(self, start: int, stop: int) -> list[wavelink.Playable]:
+        return self._items[start:stop]
+
+    def move(self, source: int, destination: int) -> None:
+        self._items.move(source, destination)
+
+    @property
+    def total_length(self) -> int:
+        return self._items.total_length
+
+
+class IndexedPlayer(wavelink.Player):
+    """Player cuja fila principal é uma IndexedQueue."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.queue = IndexedQueue()
+
+
+def queue_total_length(queue: wavelink.Queue) -> int:
+    """Duração total da fila em ms, sem percorrer a fila quando ela é indexada."""
+    total = getattr(queue, "total_length", None)
+    if isinstance(total, int):
+        return total
+    return sum(getattr(track, "length", None) or 0 for track in queue)
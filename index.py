@@ -9,9 +9,10 @@ import sys
 import json
 import argparse
 import aiohttp
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
 
 from pymongo import MongoClient
 from pymongo import errors as pymongo_errors
@@ -22,8 +23,27 @@ from rich.live import Live
 from rich.console import Console
 from rich.panel import Panel
 
+from commands import normalize_search_result
 from commands.play import MusicControlView
 from commands.logger import BotLogger
+from commands.storage import MongoStorage
+from commands.http_client import HttpClient
+from commands.player_state import PLAYER_STATE_RELEASE_GRACE_SECONDS, PlayerStateRegistry
+from commands.node_registry import (
+    LAVALINK_NODES_FILE,
+    FileNodeStore,
+    MongoNodeStore,
+    NodeRegistry,
+    node_uri,
+)
+from commands.session_resume import (
+    LAVALINK_RESUME_TIMEOUT_SECONDS,
+    SESSION_SNAPSHOT_FILE,
+    FileSessionStore,
+    MongoSessionStore,
+    SessionResumer,
+)
+from commands.i18n import LocaleTemplate, build_locale_tables
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -33,13 +53,202 @@ load_dotenv()
 # QueueCache - Sistema para salvar filas quando um node cai
 # ============================================================================
 QUEUE_CACHE_TTL_MS = 60 * 60 * 1000  # 1 hora em ms
+# "mongo", "file" ou "memory" (padrão: mongo se conectado, senão arquivo local)
+QUEUE_CACHE_BACKEND = os.getenv("QUEUE_CACHE_BACKEND", "").strip().lower()
+QUEUE_CACHE_FILE = os.getenv("QUEUE_CACHE_FILE", "queue_cache.json")
+QUEUE_CACHE_FLUSH_DELAY_SECONDS = float(os.getenv("QUEUE_CACHE_FLUSH_DELAY_SECONDS", "2"))
+
+# Forma compacta de um track salvo: só o blob encoded + metadados mínimos para fallback
+_QUEUE_TRACK_KEYS = {
+    "encoded": "e",
+    "title": "t",
+    "author": "a",
+    "uri": "u",
+    "identifier": "i",
+    "length": "l",
+    "sourceName": "s",
+}
+
+
+class MongoQueueCacheBackend:
+    """Snapshots das filas numa coleção do MongoDB, com expiração feita por índice TTL."""
+
+    name = "mongo"
+
+    def __init__(self, storage: MongoStorage, collection):
+        self.storage = storage
+        self.collection = collection
+
+    async def load(self) -> dict[int, dict]:
+        from datetime import datetime, timezone
+
+        await self.storage.run(
+            "queue_cache.create_index",
+            self.collection.create_index,
+            "expiresAt",
+            expireAfterSeconds=0,
+        )
+        documents = await self.storage.find_many(
+            self.collection,
+            {"expiresAt": {"$gt": datetime.now(timezone.utc)}},
+        )
+        entries: dict[int, dict] = {}
+        for document in documents:
+            try:
+                entries[int(document["_id"])] = {
+                    "tracks": document.get("t") or [],
+                    "savedAt": int(document.get("s") or 0),
+                    "expiresAt": int(document["expiresAt"].replace(tzinfo=timezone.utc).timestamp() * 1000),
+                }
+            except Exception:
+                continue
+        return entries
+
+    async def write_batch(self, upserts: dict[int, dict], deletes: set[int]) -> None:
+        from datetime import datetime, timezone
+        from pymongo import DeleteOne, ReplaceOne
+
+        operations = [
+            ReplaceOne(
+                {"_id": guild_id},
+                {
+                    "_id": guild_id,
+                    "t": entry["tracks"],
+                    "s": entry["savedAt"],
+                    "expiresAt": datetime.fromtimestamp(entry["expiresAt"] / 1000, tz=timezone.utc),
+                },
+                upsert=True,
+            )
+            for guild_id, entry in upserts.items()
+        ]
+        operations.extend(DeleteOne({"_id": guild_id}) for guild_id in deletes)
+        if operations:
+            await self.storage.run(
+                "queue_cache.bulk_write",
+                self.collection.bulk_write,
+                operations,
+                ordered=False,
+            )
+
+
+class FileQueueCacheBackend:
+    """Snapshots das filas num arquivo JSON local; entradas vencidas são descartadas a cada escrita."""
+
+    name = "file"
+
+    def __init__(self, path: str | Path = QUEUE_CACHE_FILE):
+        self.path = Path(path)
+        self._entries: dict[int, dict] = {}
+
+    @staticmethod
+    def _prune(entries: dict[int, dict]) -> dict[int, dict]:
+        import time
+        now = int(time.time() * 1000)
+        return {guild_id: entry for guild_id, entry in entries.items() if entry.get("x", 0) > now}
+
+    def _read(self) -> dict[int, dict]:
+        if not self.path.exists():
+            return {}
+        with self.path.open("r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        if not isinstance(data, dict):
+            return {}
+        return {int(guild_id): entry for guild_id, entry in data.items() if isinstance(entry, dict)}
+
+    def _write(self, entries: dict[int, dict]) -> None:
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as fp:
+            json.dump({str(guild_id): entry for guild_id, entry in entries.items()}, fp, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    async def load(self) -> dict[int, dict]:
+        self._entries = self._prune(await asyncio.to_thread(self._read))
+        return {
+            guild_id: {"tracks": entry.get("t") or [], "savedAt": entry.get("s", 0), "expiresAt": entry["x"]}
+            for guild_id, entry in self._entries.items()
+        }
+
+    async def write_batch(self, upserts: dict[int, dict], deletes: set[int]) -> None:
+        for guild_id in deletes:
+            self._entries.pop(guild_id, None)
+        for guild_id, entry in upserts.items():
+            self._entries[guild_id] = {"t": entry["tracks"], "s": entry["savedAt"], "x": entry["expiresAt"]}
+        self._entries = self._prune(self._entries)
+        await asyncio.to_thread(self._write, dict(self._entries))
 
 
 class QueueCache:
-    """Cache de filas para recuperação após queda de node."""
+    """Cache de filas para recuperação após queda de node.
 
-    def __init__(self):
+    A leitura é sempre em memória; com um backend anexado, as alterações são gravadas
+    em lote (Mongo ou arquivo) e recarregadas no próximo start do bot.
+    """
+
+    def __init__(self, flush_delay: float = QUEUE_CACHE_FLUSH_DELAY_SECONDS):
         self._cache: dict[int, dict] = {}  # guild_id -> {tracks, savedAt, expiresAt}
+        self.backend: MongoQueueCacheBackend | FileQueueCacheBackend | None = None
+        self.flush_delay = max(0.0, flush_delay)
+        self._dirty: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+        self.flushes = 0
+        self.flush_errors = 0
+
+    async def attach(self, backend: MongoQueueCacheBackend | FileQueueCacheBackend) -> None:
+        """Anexa um backend persistente e recupera as filas salvas antes do restart."""
+        self.backend = backend
+        try:
+            restored = await backend.load()
+        except Exception as exc:
+            print(f"[QueueCache] Falha ao carregar filas do backend '{backend.name}': {exc}")
+            return
+
+        for guild_id, entry in restored.items():
+            self._cache.setdefault(guild_id, entry)
+        print(f"[QueueCache] Backend '{backend.name}' ativo; {len(restored)} fila(s) recuperada(s)")
+
+    def _mark_dirty(self, guild_id: int) -> None:
+        if self.backend is None:
+            return
+        self._dirty.add(guild_id)
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+            except RuntimeError:
+                pass
+
+    async def _delayed_flush(self) -> None:
+        # Junta as gravações próximas (ex.: todos os players de um node que caiu) num só lote
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Grava no backend as filas alteradas desde a última gravação."""
+        if self.backend is None or not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        upserts = {guild_id: self._cache[guild_id] for guild_id in dirty if guild_id in self._cache}
+        deletes = {guild_id for guild_id in dirty if guild_id not in self._cache}
+        try:
+            await self.backend.write_batch(upserts, deletes)
+            self.flushes += 1
+        except BaseException as exc:
+            # Devolve o lote mesmo se a gravação for cancelada no meio (ex.: close())
+            self._dirty |= dirty
+            if not isinstance(exc, Exception):
+                raise
+            self.flush_errors += 1
+            print(f"[QueueCache] Falha ao gravar {len(dirty)} fila(s) no backend: {exc}")
+
+    async def close(self) -> None:
+        flush_task, self._flush_task = self._flush_task, None
+        if flush_task and not flush_task.done():
+            flush_task.cancel()
+            try:
+                await flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
 
     def save_queue(
         self,
@@ -71,6 +280,7 @@ class QueueCache:
             "savedAt": now,
             "expiresAt": now + QUEUE_CACHE_TTL_MS,
         }
+        self._mark_dirty(guild_id)
         print(f"[QueueCache] Salvou {len(tracks)} track(s) para guild {guild_id}")
 
     def get_queue(self, guild_id: int) -> list[dict] | None:
@@ -90,12 +300,13 @@ class QueueCache:
             print(f"[QueueCache] Cache expirado para guild {guild_id}")
             return None
 
-        return entry["tracks"]
+        return [self._expand_track(track) for track in entry["tracks"]]
 
     def clear_queue(self, guild_id: int) -> None:
         """Limpa o cache de um servidor."""
         if guild_id in self._cache:
             del self._cache[guild_id]
+            self._mark_dirty(guild_id)
             print(f"[QueueCache] Limpou cache para guild {guild_id}")
 
     def has_cache(self, guild_id: int) -> bool:
@@ -123,22 +334,935 @@ class QueueCache:
         import time
         return int(time.time() * 1000) - entry["savedAt"]
 
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend.name if self.backend is not None else "memory",
+            "queues": len(self._cache),
+            "pending": len(self._dirty),
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+        }
+
     def _serialize_track(self, track: wavelink.Playable) -> dict:
-        """Serializa um track para armazenamento."""
+        """Serializa um track na forma compacta (chaves curtas, sem campos vazios)."""
         requester = getattr(track, "requester", None)
-        return {
+        values = {
             "encoded": getattr(track, "encoded", None),
             "title": getattr(track, "title", None),
             "author": getattr(track, "author", None),
             "uri": getattr(track, "uri", None),
             "identifier": getattr(track, "identifier", None),
             "length": getattr(track, "length", None),
-            "artworkUrl": getattr(track, "artwork", None) or getattr(track, "artworkUrl", None),
             "sourceName": getattr(track, "source", None),
-            "requester": {
-                "id": requester.id,
-                "username": requester.name,
-            } if requester else None,
+        }
+        compact = {_QUEUE_TRACK_KEYS[key]: value for key, value in values.items() if value is not None}
+        requester_id = getattr(requester, "id", None)
+        if requester_id is not None:
+            compact["r"] = requester_id
+        return compact
+
+    @staticmethod
+    def _expand_track(compact: dict) -> dict:
+        track = {key: compact.get(short) for key, short in _QUEUE_TRACK_KEYS.items()}
+        requester_id = compact.get("r")
+        track["requester"] = {"id": requester_id} if requester_id is not None else None
+        return track
+
+
+# ============================================================================
+# GuildLanguageCache - Cache em memória dos idiomas por servidor
+# ============================================================================
+LANGUAGE_CACHE_TTL_SECONDS = int(os.getenv("LANGUAGE_CACHE_TTL_SECONDS", "600"))  # 10 minutos
+
+
+class GuildLanguageCache:
+    """Cache local dos idiomas configurados, para o translate não consultar o MongoDB."""
+
+    def __init__(self, ttl_seconds: int = LANGUAGE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = max(30, int(ttl_seconds))
+        self._languages: dict[int, str] = {}  # guild_id -> idioma
+        self._loaded_at: float | None = None
+        # Cada set() avança a geração; gravações feitas durante uma recarga sobrevivem ao snapshot
+        self._generation = 0
+        self._recent_sets: dict[int, tuple[int, str]] = {}  # guild_id -> (geração, idioma)
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def get(self, guild_id: int) -> str | None:
+        """Retorna o idioma salvo do servidor (None se não houver preferência)."""
+        language = self._languages.get(guild_id)
+        # Com o snapshot carregado, servidor sem registro é resposta certa (idioma padrão), não erro
+        if language is None and not self.loaded:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return language
+
+    def set(self, guild_id: int, language: str) -> None:
+        """Atualiza imediatamente o idioma de um servidor."""
+        self._generation += 1
+        self._languages[int(guild_id)] = language
+        self._recent_sets[int(guild_id)] = (self._generation, language)
+
+    def generation(self) -> int:
+        """Marca a ser lida antes de buscar um snapshot (ver replace_all)."""
+        return self._generation
+
+    def replace_all(self, languages: dict[int, str], since: int | None = None) -> None:
+        """Substitui o conteúdo do cache por um snapshot completo do banco.
+
+        since: geração lida antes da busca; set() feitos depois dela prevalecem sobre o snapshot.
+        """
+        import time
+        languages = dict(languages)
+        if since is not None:
+            for guild_id, (generation, language) in self._recent_sets.items():
+                if generation > since:
+                    languages[guild_id] = language
+        self._recent_sets.clear()
+        self._languages = languages
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Contadores de acerto/erro para acompanhar o cache sob carga."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._languages),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "refreshes": self.refreshes,
+        }
+
+
+# ============================================================================
+# SearchResultCache - Cache de resultados de busca/carregamento do Lavalink
+# ============================================================================
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2000"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB
+SEARCH_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_NEGATIVE_TTL_SECONDS", "60"))
+# TTL por tipo de fonte (URLs de streaming do YouTube expiram antes dos metadados do Spotify)
+SEARCH_CACHE_TTL_SECONDS: dict[str, int] = {
+    "youtube": 30 * 60,
+    "soundcloud": 60 * 60,
+    "spotify": 6 * 60 * 60,
+    "deezer": 6 * 60 * 60,
+    "applemusic": 6 * 60 * 60,
+    "other": 5 * 60,
+}
+
+_SEARCH_PREFIX_SOURCES = {
+    "ytsearch": "youtube",
+    "ytmsearch": "youtube",
+    "scsearch": "soundcloud",
+    "spsearch": "spotify",
+    "dzsearch": "deezer",
+    "amsearch": "applemusic",
+}
+_URL_HOST_SOURCES = (
+    ("youtube.com", "youtube"),
+    ("youtu.be", "youtube"),
+    ("soundcloud.com", "soundcloud"),
+    ("spotify.com", "spotify"),
+    ("deezer.com", "deezer"),
+    ("deezer.page.link", "deezer"),
+    ("music.apple.com", "applemusic"),
+)
+_URL_TRACKING_PARAMS = {"si", "feature", "utm_source", "utm_medium", "utm_campaign", "utm_content", "utm_term"}
+
+
+class SearchResultCache:
+    """Cache LRU com TTL dos resultados do Lavalink, compartilhado entre todos os servidores.
+
+    Guarda apenas os payloads crus (encoded + info) e recria os Playables a cada acerto,
+    porque cada servidor altera requester/extras dos objetos que recebe.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        max_bytes: int = SEARCH_CACHE_MAX_BYTES,
+        negative_ttl: int = SEARCH_CACHE_NEGATIVE_TTL_SECONDS,
+        ttl_by_source: dict[str, int] | None = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.negative_ttl = negative_ttl
+        self.ttl_by_source = dict(ttl_by_source or SEARCH_CACHE_TTL_SECONDS)
+        self._entries: OrderedDict[str, dict] = OrderedDict()  # chave -> {kind, payload, size, expiresAt, loadMs}
+        self._bytes = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+
+    @staticmethod
+    def normalize_identifier(identifier: str) -> str:
+        value = (identifier or "").strip()
+        prefix, sep, rest = value.partition(":")
+        if sep and prefix.lower() in _SEARCH_PREFIX_SOURCES:
+            return f"{prefix.lower()}:{' '.join(rest.split()).casefold()}"
+
+        if value.lower().startswith(("http://", "https://")):
+            try:
+                parsed = urlparse(value)
+                query = [
+                    (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                    if k.lower() not in _URL_TRACKING_PARAMS
+                ]
+                return urlunparse(parsed._replace(
+                    scheme=parsed.scheme.lower(),
+                    netloc=parsed.netloc.lower(),
+                    query=urlencode(query),
+                    fragment="",
+                ))
+            except Exception:
+                return value
+
+        return " ".join(value.split())
+
+    @staticmethod
+    def source_of(identifier: str) -> str:
+        prefix, sep, _ = identifier.partition(":")
+        if sep and prefix in _SEARCH_PREFIX_SOURCES:
+            return _SEARCH_PREFIX_SOURCES[prefix]
+        try:
+            host = urlparse(identifier).netloc
+        except Exception:
+            host = ""
+        for suffix, source in _URL_HOST_SOURCES:
+            if host == suffix or host.endswith("." + suffix):
+                return source
+        return "other"
+
+    def get(self, identifier: str) -> tuple[bool, wavelink.Playlist | list[wavelink.Playable] | None]:
+        """Retorna (acertou, resultado). Resultado None com acerto = cache negativo."""
+        import time
+        key = self.normalize_identifier(identifier)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        if time.monotonic() >= entry["expiresAt"]:
+            self._remove(key)
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.saved_ms += entry["loadMs"]
+        if entry["kind"] == "empty":
+            self.negative_hits += 1
+            return True, None
+
+        self.hits += 1
+        try:
+            return True, self.deserialize(entry["kind"], entry["payload"])
+        except Exception as exc:
+            print(f"[SearchCache] Entrada inválida para '{key}': {exc}")
+            self._remove(key)
+            return False, None
+
+    def put(self, identifier: str, result: Any, load_ms: float = 0.0) -> None:
+        import time
+        key = self.normalize_identifier(identifier)
+        normalized = normalize_search_result(result)
+
+        if normalized is None:
+            if self.negative_ttl <= 0:
+                return
+            kind, payload, size, ttl = "empty", None, len(key) + 64, self.negative_ttl
+        else:
+            ttl = self.ttl_by_source.get(self.source_of(key), self.ttl_by_source.get("other", 0))
+            if ttl <= 0:
+                return
+            kind, payload = self.serialize(normalized)
+            tracks_data = payload["tracks"] if kind == "playlist" else payload
+            size = len(key) + sum(self._estimate_track_size(data) for data in tracks_data)
+            if size > self.max_bytes:
+                return
+
+        self._remove(key)
+        self._entries[key] = {
+            "kind": kind,
+            "payload": payload,
+            "size": size,
+            "expiresAt": time.monotonic() + ttl,
+            "loadMs": load_ms,
+        }
+        self._bytes += size
+        self._evict()
+
+    @staticmethod
+    def serialize(result: wavelink.Playlist | list[wavelink.Playable]) -> tuple[str, Any]:
+        """Extrai os payloads crus de um resultado normalizado."""
+        if isinstance(result, wavelink.Playlist):
+            return "playlist", {
+                "info": {"name": result.name, "selectedTrack": result.selected},
+                "pluginInfo": {
+                    key_name: value
+                    for key_name, value in (
+                        ("type", result.type),
+                        ("url", result.url),
+                        ("artworkUrl", result.artwork),
+                        ("author", result.author),
+                    )
+                    if value is not None
+                },
+                "tracks": [track.raw_data for track in result.tracks],
+            }
+        return "tracks", [track.raw_data for track in result]
+
+    @staticmethod
+    def deserialize(kind: str, payload: Any) -> wavelink.Playlist | list[wavelink.Playable]:
+        if kind == "playlist":
+            return wavelink.Playlist(payload)
+        return [wavelink.Playable(data) for data in payload]
+
+    @classmethod
+    def clone(cls, result: Any) -> Any:
+        """Cria cópias independentes dos Playables (para entregar o mesmo resultado a vários servidores)."""
+        normalized = normalize_search_result(result)
+        if normalized is None:
+            return result
+        try:
+            return cls.deserialize(*cls.serialize(normalized))
+        except Exception:
+            return result
+
+    @staticmethod
+    def _estimate_track_size(data: dict) -> int:
+        info = data.get("info") or {}
+        return (
+            len(data.get("encoded") or "")
+            + len(info.get("title") or "")
+            + len(info.get("author") or "")
+            + len(info.get("uri") or "")
+            + len(info.get("artworkUrl") or "")
+            + 256
+        )
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry["size"]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": ((self.hits + self.negative_hits) / lookups) if lookups else 0.0,
+            "saved_ms": round(self.saved_ms, 1),
+        }
+
+# ============================================================================
+# SingleFlight - Coalesce carregamentos idênticos em andamento
+# ============================================================================
+class SingleFlight:
+    """Garante uma única chamada em voo por chave; chamadas concorrentes aguardam a mesma."""
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.deduplicated = 0
+
+    async def do(self, key: str, factory) -> tuple[Any, bool]:
+        """Executa factory() uma vez por chave. Retorna (resultado, compartilhado)."""
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.deduplicated += 1
+        else:
+            # Task própria: se quem iniciou for cancelado (ex.: busca hedged), os demais continuam esperando
+            task = asyncio.create_task(factory())
+            self._calls[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # evita aviso de exceção nunca recuperada
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "deduplicated": self.deduplicated,
+        }
+
+# ============================================================================
+# NodeScoreboard - Pontuação de carga dos nodes Lavalink
+# ============================================================================
+NODE_STATS_STALE_SECONDS = 180  # stats mais antigos que isso são ignorados
+NODE_FAILURE_WINDOW_SECONDS = 300  # janela das falhas recentes consideradas na pontuação
+NODE_LATENCY_EWMA_ALPHA = 0.3
+NODE_PROBE_TIMEOUT_SECONDS = 8.0
+NODE_PROBE_HISTORY_SIZE = 20
+# Failover em lote quando um node cai: players migrados em paralelo, com teto de concorrência
+NODE_FAILOVER_MAX_CONCURRENCY = int(os.getenv("NODE_FAILOVER_MAX_CONCURRENCY", "8"))
+NODE_FAILOVER_PLAYER_TIMEOUT_SECONDS = 10.0
+NODE_FAILOVER_HISTORY_SIZE = 500
+# O wavelink tenta reconectar para sempre (retries=None); um connect que passa disso é abandonado
+LAVALINK_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LAVALINK_CONNECT_TIMEOUT_SECONDS", "15"))
+
+
+class NodeScoreboard:
+    """Calcula uma penalidade por node (menor = melhor) a partir dos stats do Lavalink."""
+
+    def __init__(self):
+        self._stats: dict[str, dict[str, Any]] = {}  # node_id -> stats normalizados + updatedAt
+        self._latency_ewma: dict[str, float] = {}  # node_id -> latência REST suavizada (ms)
+        self._failures: dict[str, deque] = {}  # node_id -> timestamps (monotonic) de falhas recentes
+
+    @staticmethod
+    def _normalize_stats(stats: Any) -> dict[str, Any] | None:
+        """Aceita o payload do wavelink (fetch_stats) ou o JSON cru de /v4/stats."""
+        if stats is None:
+            return None
+        if isinstance(stats, dict):
+            cpu = stats.get("cpu") or {}
+            frames = stats.get("frameStats") or {}
+            return {
+                "players": int(stats.get("players") or 0),
+                "playing": int(stats.get("playingPlayers") or 0),
+                "cores": int(cpu.get("cores") or 0),
+                "system_load": float(cpu.get("systemLoad") or 0.0),
+                "lavalink_load": float(cpu.get("lavalinkLoad") or 0.0),
+                "deficit": int(frames.get("deficit") or 0),
+                "nulled": int(frames.get("nulled") or 0),
+            }
+        cpu = getattr(stats, "cpu", None)
+        frames = getattr(stats, "frames", None)
+        return {
+            "players": int(getattr(stats, "players", 0) or 0),
+            "playing": int(getattr(stats, "playing", 0) or 0),
+            "cores": int(getattr(cpu, "cores", 0) or 0),
+            "system_load": float(getattr(cpu, "system_load", 0.0) or 0.0),
+            "lavalink_load": float(getattr(cpu, "lavalink_load", 0.0) or 0.0),
+            "deficit": int(getattr(frames, "deficit", 0) or 0),
+            "nulled": int(getattr(frames, "nulled", 0) or 0),
+        }
+
+    def record_stats(self, node_id: str, stats: Any) -> None:
+        import time
+        normalized = self._normalize_stats(stats)
+        if normalized is None:
+            return
+        normalized["updatedAt"] = time.monotonic()
+        self._stats[node_id] = normalized
+
+    def record_latency(self, node_id: str, latency_ms: float) -> None:
+        previous = self._latency_ewma.get(node_id)
+        if previous is None:
+            self._latency_ewma[node_id] = float(latency_ms)
+        else:
+            self._latency_ewma[node_id] = previous + NODE_LATENCY_EWMA_ALPHA * (latency_ms - previous)
+
+    def record_failure(self, node_id: str) -> None:
+        import time
+        self._failures.setdefault(node_id, deque(maxlen=50)).append(time.monotonic())
+
+    def recent_failures(self, node_id: str) -> int:
+        import time
+        failures = self._failures.get(node_id)
+        if not failures:
+            return 0
+        cutoff = time.monotonic() - NODE_FAILURE_WINDOW_SECONDS
+        while failures and failures[0] < cutoff:
+            failures.popleft()
+        return len(failures)
+
+    def latency(self, node_id: str) -> float | None:
+        return self._latency_ewma.get(node_id)
+
+    def breakdown(self, node: wavelink.Node) -> dict[str, float]:
+        """Componentes da penalidade de um node."""
+        import time
+        node_id = getattr(node, "identifier", "") or ""
+        local_players = len(getattr(node, "players", {}) or {})
+
+        stats = self._stats.get(node_id)
+        if stats and time.monotonic() - stats["updatedAt"] > NODE_STATS_STALE_SECONDS:
+            stats = None
+
+        # Players: o maior entre o que o Lavalink reporta (todos os bots do node) e o que sabemos localmente
+        playing = max(local_players, stats["playing"] if stats else 0)
+        players_penalty = float(playing)
+
+        cpu_penalty = 0.0
+        deficit_penalty = 0.0
+        nulled_penalty = 0.0
+        if stats:
+            cpu_penalty = (1.05 ** (100 * stats["system_load"])) * 10 - 10
+            # Frames por minuto (3000 = 1 min de áudio): penalidade cresce exponencialmente com a perda
+            deficit_penalty = (1.03 ** (500 * (stats["deficit"] / 3000))) * 600 - 600
+            nulled_penalty = ((1.03 ** (500 * (stats["nulled"] / 3000))) * 300 - 300) * 2
+
+        failures_penalty = self.recent_failures(node_id) * 100.0
+        latency = self._latency_ewma.get(node_id)
+        latency_penalty = (latency / 10.0) if latency is not None else 0.0
+
+        return {
+            "players": players_penalty,
+            "cpu": cpu_penalty,
+            "deficit": deficit_penalty,
+            "nulled": nulled_penalty,
+            "failures": failures_penalty,
+            "latency": latency_penalty,
+        }
+
+    def score(self, node: wavelink.Node) -> float:
+        return sum(self.breakdown(node).values())
+
+    def rank(self, nodes: list[wavelink.Node]) -> list[wavelink.Node]:
+        """Ordena nodes pela penalidade (estável: empate mantém a ordem recebida)."""
+        return sorted(nodes, key=self.score)
+
+# ============================================================================
+# ProgressScheduler - Atualização centralizada das barras de progresso
+# ============================================================================
+PROGRESS_BASE_INTERVAL_SECONDS = 5.0
+PROGRESS_PAUSED_INTERVAL_SECONDS = 7.0
+PROGRESS_MAX_INTERVAL_SECONDS = 60.0
+PROGRESS_TICK_SECONDS = 0.5
+# Orçamento global de edições por segundo (todas as guilds somadas)
+PROGRESS_EDITS_PER_SECOND = float(os.getenv("PROGRESS_EDITS_PER_SECOND", "20"))
+# Espaço mínimo entre edições no mesmo canal (limite do Discord: ~5 por 5s por canal)
+PROGRESS_CHANNEL_MIN_SPACING_SECONDS = 1.0
+
+
+class ProgressScheduler:
+    """Uma única tarefa cuida de todas as embeds de "tocando agora".
+
+    Respeita um orçamento global de edições, espaça edições por canal, pula edições cujo
+    conteúdo não mudou e aumenta o intervalo quando há mais players do que o orçamento comporta.
+    """
+
+    def __init__(self, bot: "MusicBot", edits_per_second: float = PROGRESS_EDITS_PER_SECOND):
+        self.bot = bot
+        self.edits_per_second = max(1.0, edits_per_second)
+        self._sessions: dict[int, dict] = {}  # guild_id -> {player, trackId, nextDue, digest}
+        self._in_flight: set[int] = set()
+        self._channel_next_allowed: dict[int, float] = {}  # channel_id -> loop time
+        self._tokens = self.edits_per_second
+        self._task: asyncio.Task | None = None
+        self.interval = PROGRESS_BASE_INTERVAL_SECONDS
+        self.edits = 0
+        self.skipped_unchanged = 0
+        self.rate_limited = 0
+
+    @staticmethod
+    def _track_id(track: Any) -> Any:
+        return (
+            getattr(track, "track", None)
+            or getattr(track, "identifier", None)
+            or getattr(track, "id", None)
+        )
+
+    def register(self, player: wavelink.Player, track: wavelink.Playable | None) -> None:
+        guild_id = getattr(getattr(player, "guild", None), "id", None)
+        if guild_id is None or track is None:
+            return
+        loop = asyncio.get_running_loop()
+        self._sessions[guild_id] = {
+            "player": player,
+            "trackId": self._track_id(track),
+            "nextDue": loop.time() + self.interval,
+            "digest": None,
+        }
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unregister(self, guild_id: int | None) -> None:
+        if guild_id is not None:
+            self._sessions.pop(guild_id, None)
+
+    def _unregister_session(self, guild_id: int, session: dict) -> None:
+        # Edição atrasada da mensagem da faixa anterior (já apagada) não pode derrubar a sessão nova
+        if self._sessions.get(guild_id) is session:
+            self._sessions.pop(guild_id, None)
+
+    def stop(self) -> None:
+        self._sessions.clear()
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def _adaptive_interval(self) -> float:
+        # Edições desejadas por segundo com o intervalo base; acima do orçamento, o intervalo cresce
+        demand = len(self._sessions) / PROGRESS_BASE_INTERVAL_SECONDS
+        if demand <= self.edits_per_second:
+            return PROGRESS_BASE_INTERVAL_SECONDS
+        return min(PROGRESS_MAX_INTERVAL_SECONDS, len(self._sessions) / self.edits_per_second)
+
+    def _render(self, session: dict) -> tuple[discord.Message, discord.Embed, int] | None:
+        """Monta a embed atual. None = sessão terminou (outra música, sem mensagem, etc.)."""
+        player = session["player"]
+        current_track = getattr(player, "current", None)
+        if current_track is None:
+            return None
+
+        current_id = self._track_id(current_track)
+        if session["trackId"] and current_id and current_id != session["trackId"]:
+            return None
+
+        message = self.bot.player_states.for_player(player).current_embed_message
+        if not message:
+            return None
+
+        embed = self.bot._build_now_playing_embed(player, current_track)
+        if embed is None:
+            return None
+
+        digest = hash(json.dumps(embed.to_dict(), sort_keys=True, default=str))
+        return message, embed, digest
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_refill = loop.time()
+        try:
+            while self._sessions:
+                await asyncio.sleep(PROGRESS_TICK_SECONDS)
+                now = loop.time()
+                self._tokens = min(self.edits_per_second, self._tokens + (now - last_refill) * self.edits_per_second)
+                last_refill = now
+                self.interval = self._adaptive_interval()
+
+                due = sorted(
+                    (
+                        (guild_id, session) for guild_id, session in self._sessions.items()
+                        if session["nextDue"] <= now and guild_id not in self._in_flight
+                    ),
+                    key=lambda item: item[1]["nextDue"],
+                )
+
+                for guild_id, session in due:
+                    if self._tokens < 1:
+                        break
+
+                    try:
+                        rendered = self._render(session)
+                    except Exception as exc:
+                        print(f"Erro ao montar embed de progresso: {exc}")
+                        rendered = None
+                    if rendered is None:
+                        self.unregister(guild_id)
+                        continue
+
+                    message, embed, digest = rendered
+                    paused = not getattr(session["player"], "playing", False)
+                    interval = max(self.interval, PROGRESS_PAUSED_INTERVAL_SECONDS) if paused else self.interval
+
+                    if digest == session["digest"]:
+                        self.skipped_unchanged += 1
+                        session["nextDue"] = now + interval
+                        continue
+
+                    channel_id = getattr(message.channel, "id", None)
+                    allowed_at = self._channel_next_allowed.get(channel_id, 0.0)
+                    if now < allowed_at:
+                        session["nextDue"] = allowed_at
+                        continue
+
+                    self._tokens -= 1
+                    self._channel_next_allowed[channel_id] = now + PROGRESS_CHANNEL_MIN_SPACING_SECONDS
+                    self._in_flight.add(guild_id)
+                    asyncio.create_task(self._edit(guild_id, session, message, embed, digest, interval))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+
+    async def _edit(
+        self,
+        guild_id: int,
+        session: dict,
+        message: discord.Message,
+        embed: discord.Embed,
+        digest: int,
+        interval: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        channel_id = getattr(message.channel, "id", None)
+        started = loop.time()
+        try:
+            await message.edit(embed=embed)
+            session["digest"] = digest
+            self.edits += 1
+        except discord.NotFound:
+            state = self.bot.player_states.peek(guild_id)
+            if state is not None and state.current_embed_message is message:
+                state.current_embed_message = None
+            self._unregister_session(guild_id, session)
+        except discord.HTTPException as exc:
+            if exc.status == 429:
+                self.rate_limited += 1
+                retry_after = float(getattr(exc, "retry_after", None) or 5.0)
+                self._channel_next_allowed[channel_id] = loop.time() + retry_after
+            else:
+                print(f"Erro ao atualizar embed de reprodução: {exc}")
+                self._unregister_session(guild_id, session)
+        except Exception as exc:
+            print(f"Erro ao atualizar embed de reprodução: {exc}")
+            self._unregister_session(guild_id, session)
+        finally:
+            self._in_flight.discard(guild_id)
+            elapsed = loop.time() - started
+            if elapsed > 2.0:
+                # A lib segurou a requisição por rate limit: recua o canal pelo mesmo tempo
+                self._channel_next_allowed[channel_id] = loop.time() + elapsed
+            if self._sessions.get(guild_id) is session:
+                session["nextDue"] = loop.time() + interval
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "interval": self.interval,
+            "edits": self.edits,
+            "skipped_unchanged": self.skipped_unchanged,
+            "rate_limited": self.rate_limited,
+        }
+
+# ============================================================================
+# SideEffectSupervisor - Efeitos de início de faixa em segundo plano
+# ============================================================================
+TRACK_START_EFFECT_TIMEOUT_SECONDS = float(os.getenv("TRACK_START_EFFECT_TIMEOUT_SECONDS", "15"))
+# Fallback de artwork: ID do vídeo a partir da URL do YouTube
+_YOUTUBE_VIDEO_ID_PATTERNS = (
+    re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([^&\n?#]+)'),
+    re.compile(r'youtube\.com\/embed\/([^&\n?#]+)'),
+)
+
+
+class SideEffectSupervisor:
+    """Roda os efeitos de um evento (status do canal, embed, log) como tarefas independentes.
+
+    Cada efeito tem timeout próprio, um efeito novo da mesma guild substitui o anterior ainda
+    pendente e o tempo de cada um é medido para o painel.
+    """
+
+    def __init__(self, timeout: float = TRACK_START_EFFECT_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._jobs: dict[tuple[int, str], asyncio.Task] = {}  # (guild_id, efeito) -> tarefa
+        self._stats: dict[str, dict[str, float]] = {}  # efeito -> contadores e tempos (ms)
+
+    def launch(self, guild_id: int, name: str, coro, *, timeout: float | None = None) -> asyncio.Task:
+        self.cancel(guild_id, name)
+        task = asyncio.create_task(self._supervise(name, coro, timeout or self.timeout))
+        key = (guild_id, name)
+        self._jobs[key] = task
+        task.add_done_callback(lambda done, key=key, coro=coro: self._finished(key, done, coro))
+        return task
+
+    def _finished(self, key: tuple[int, str], task: asyncio.Task, coro) -> None:
+        if self._jobs.get(key) is task:
+            self._jobs.pop(key, None)
+        # Substituído antes de rodar: a corrotina nunca foi aguardada e precisa ser fechada
+        # (fechar uma corrotina já encerrada não faz nada)
+        try:
+            coro.close()
+        except Exception:
+            pass
+
+    def cancel(self, guild_id: int, name: str | None = None) -> None:
+        """Cancela o efeito pendente (ou todos os da guild quando name é None)."""
+        keys = [key for key in self._jobs if key[0] == guild_id and (name is None or key[1] == name)]
+        for key in keys:
+            task = self._jobs.pop(key)
+            if not task.done():
+                task.cancel()
+                self._entry(key[1])["superseded"] += 1
+
+    def _entry(self, name: str) -> dict[str, float]:
+        return self._stats.setdefault(
+            name,
+            {"runs": 0, "timeouts": 0, "errors": 0, "superseded": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0},
+        )
+
+    async def _supervise(self, name: str, coro, timeout: float) -> None:
+        import time
+
+        entry = self._entry(name)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            entry["timeouts"] += 1
+            print(f"[Efeitos] '{name}' excedeu {timeout:.0f}s e foi cancelado")
+        except Exception as exc:
+            entry["errors"] += 1
+            print(f"[Efeitos] Falha em '{name}': {exc}")
+        # Substituídos (CancelledError) não entram na média
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        entry["runs"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["last_ms"] = elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "runs": int(entry["runs"]),
+                "timeouts": int(entry["timeouts"]),
+                "errors": int(entry["errors"]),
+                "superseded": int(entry["superseded"]),
+                "avg_ms": round(entry["total_ms"] / entry["runs"], 1) if entry["runs"] else 0.0,
+                "max_ms": round(entry["max_ms"], 1),
+                "last_ms": round(entry["last_ms"], 1),
+            }
+            for name, entry in sorted(self._stats.items())
+        }
+
+# ============================================================================
+# GuildEventDispatcher - Eventos do Lavalink serializados por guild
+# ============================================================================
+# Teto de eventos pendentes por guild (o mais antigo é descartado)
+GUILD_EVENT_QUEUE_MAX = 32
+# Evento que demora mais que isso é reportado no console (não é cancelado)
+GUILD_EVENT_SLOW_SECONDS = 10.0
+
+
+class _PendingEvent:
+    __slots__ = ("kind", "key", "handler", "queued_at")
+
+    def __init__(self, kind: str, key: Any, handler, queued_at: float) -> None:
+        self.kind = kind
+        self.key = key
+        self.handler = handler
+        self.queued_at = queued_at
+
+
+class GuildEventDispatcher:
+    """Fila de eventos por guild com um worker por guild ativa.
+
+    Eventos da mesma guild rodam em ordem, um de cada vez. Um evento idêntico ainda na fila
+    (mesmo tipo e mesma chave) é fundido, e um evento pode substituir pendentes de tipos que
+    ele torna obsoletos (ex.: um track_start novo descarta um track_start antigo não processado).
+    """
+
+    def __init__(self, max_pending: int = GUILD_EVENT_QUEUE_MAX):
+        self.max_pending = max(1, max_pending)
+        self._queues: dict[int, deque[_PendingEvent]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+        self.max_depth = 0
+
+    def _entry(self, kind: str) -> dict[str, float]:
+        return self._stats.setdefault(
+            kind,
+            {"processed": 0, "merged": 0, "dropped": 0, "errors": 0,
+             "wait_ms": 0.0, "run_ms": 0.0, "max_latency_ms": 0.0},
+        )
+
+    def drop(self, kind: str) -> None:
+        """Conta um evento descartado antes de entrar na fila."""
+        self._entry(kind)["dropped"] += 1
+
+    def submit(self, guild_id: int, kind: str, key: Any, handler, *, supersedes: tuple[str, ...] = ()) -> None:
+        """Enfileira handler() para a guild. key identifica eventos duplicados."""
+        import time
+
+        queue = self._queues.setdefault(guild_id, deque())
+        for pending in queue:
+            if pending.kind == kind and pending.key == key:
+                self._entry(kind)["merged"] += 1
+                return
+
+        if supersedes and queue:
+            kept = deque()
+            for pending in queue:
+                if pending.kind in supersedes:
+                    self._entry(pending.kind)["dropped"] += 1
+                else:
+                    kept.append(pending)
+            queue.clear()
+            queue.extend(kept)
+
+        while len(queue) >= self.max_pending:
+            self._entry(queue.popleft().kind)["dropped"] += 1
+
+        queue.append(_PendingEvent(kind, key, handler, time.perf_counter()))
+        self.max_depth = max(self.max_depth, len(queue))
+
+        worker = self._workers.get(guild_id)
+        if worker is None or worker.done():
+            self._workers[guild_id] = asyncio.create_task(self._run(guild_id))
+
+    async def _run(self, guild_id: int) -> None:
+        import time
+
+        queue = self._queues.get(guild_id)
+        try:
+            while queue:
+                event = queue.popleft()
+                entry = self._entry(event.kind)
+                started = time.perf_counter()
+                try:
+                    await event.handler()
+                except Exception as exc:
+                    entry["errors"] += 1
+                    print(f"[Eventos] Erro ao processar {event.kind} da guild {guild_id}: {exc}")
+                finished = time.perf_counter()
+                run_ms = (finished - started) * 1000
+                entry["processed"] += 1
+                entry["wait_ms"] += (started - event.queued_at) * 1000
+                entry["run_ms"] += run_ms
+                entry["max_latency_ms"] = max(entry["max_latency_ms"], (finished - event.queued_at) * 1000)
+                if run_ms > GUILD_EVENT_SLOW_SECONDS * 1000:
+                    print(f"[Eventos] {event.kind} da guild {guild_id} levou {run_ms / 1000:.1f}s")
+        finally:
+            if self._workers.get(guild_id) is asyncio.current_task():
+                self._workers.pop(guild_id, None)
+            if not self._queues.get(guild_id):
+                self._queues.pop(guild_id, None)
+
+    def depth(self, guild_id: int) -> int:
+        return len(self._queues.get(guild_id) or ())
+
+    def stats(self) -> dict[str, Any]:
+        kinds = {}
+        for kind, entry in sorted(self._stats.items()):
+            processed = entry["processed"]
+            kinds[kind] = {
+                "processed": int(processed),
+                "merged": int(entry["merged"]),
+                "dropped": int(entry["dropped"]),
+                "errors": int(entry["errors"]),
+                "avg_wait_ms": round(entry["wait_ms"] / processed, 1) if processed else 0.0,
+                "avg_run_ms": round(entry["run_ms"] / processed, 1) if processed else 0.0,
+                "max_latency_ms": round(entry["max_latency_ms"], 1),
+            }
+        return {
+            "active_guilds": len(self._workers),
+            "pending": sum(len(queue) for queue in self._queues.values()),
+            "max_depth": self.max_depth,
+            "kinds": kinds,
         }
 
 # Parse argumentos de linha de comando
@@ -170,7 +1294,10 @@ class MusicBot(commands.Bot):
             proxy=proxy
         )
         self.synced = False
-        # Guarda configs do Lavalink para possíveis reconexões
+        # Sessão HTTP compartilhada pelos cogs (LRCLib, pings, /nodes)
+        self.http_client = HttpClient(proxy=proxy)
+        # Guarda configs do Lavalink para possíveis reconexões (espelho de node_registry.configs())
+        self.node_registry = NodeRegistry()
         self._lavalink_cfgs = []
         self._watchdog_task = None
         self._panel_task = None
@@ -182,6 +1309,8 @@ class MusicBot(commands.Bot):
         self.default_language = "en"
         self.supported_languages: set[str] = set()
         self.locales: dict[str, dict[str, Any]] = {}
+        # Tabelas planas "chave -> template compilado" por locale (fallback para o padrão já embutido)
+        self._locale_tables: dict[str, dict[str, LocaleTemplate]] = {}
         self.locale_dir = Path(os.getenv("LOCALES_DIR", Path(__file__).resolve().parent / "locales"))
         self.mongo_client: MongoClient | None = None
         self.mongo_db = None
@@ -189,7 +1318,12 @@ class MusicBot(commands.Bot):
         self.presence_collection = None
         self.logs_collection = None
         self.warp_collection = None
+        # Camada assíncrona (pool de threads) usada para todo acesso ao MongoDB após a inicialização
+        self.storage: MongoStorage | None = None
         self._mongo_connected = False
+        # Cache em memória dos idiomas por servidor (carregado de uma vez na inicialização)
+        self.language_cache = GuildLanguageCache()
+        self._language_refresh_task = None
         self._alone_tasks: dict[int, asyncio.Task] = {}
         self.owner_ids: set[int] = self._load_owner_ids()
         self.logger = None
@@ -203,8 +1337,30 @@ class MusicBot(commands.Bot):
         self._node_connected_at: dict[str, float] = {}  # node_id -> timestamp quando conectou
         # Rastreamento de downtime dos nodes (timestamps de quando desconectaram)
         self._node_disconnected_at: dict[str, float] = {}  # node_id -> timestamp quando desconectou
+        # Pontuação de carga dos nodes (stats do Lavalink, falhas recentes e latência REST)
+        self.node_scores = NodeScoreboard()
+        # Histórico dos health checks do watchdog: node_id -> deque[(timestamp, latência ms | None se falhou)]
+        self._node_probe_history: dict[str, deque] = {}
+        self._last_health_sweep_ms: float | None = None
+        # Failover em lote: tempo de migração por guild (ms) e contadores
+        self._failover_timings: deque[float] = deque(maxlen=NODE_FAILOVER_HISTORY_SIZE)
+        self._failover_counts: dict[str, int] = {"migrated": 0, "failed": 0, "batches": 0}
+        self._last_failover_batch: dict[str, Any] | None = None
         # Cache de filas para recuperação após queda de node
         self.queue_cache = QueueCache()
+        # Cache compartilhado de resultados de busca/URLs resolvidas no Lavalink
+        self.search_cache = SearchResultCache()
+        # Carregamentos idênticos simultâneos (mesma URL em vários servidores) viram uma única requisição
+        self._load_flights = SingleFlight()
+        # Atualizações das barras de progresso de todos os players (uma única tarefa)
+        self.progress_scheduler = ProgressScheduler(self)
+        # Estado por servidor (canal de texto, embed atual, loop, fallback, WARP...)
+        self.player_states = PlayerStateRegistry()
+        self._state_release_tasks: dict[int, asyncio.Task] = {}
+        self.track_start_effects = SideEffectSupervisor()
+        self.event_dispatcher = GuildEventDispatcher()
+        # Sessões Lavalink e players gravados no desligamento e retomados no próximo start
+        self.session_resumer = SessionResumer(self)
         # Cache de notificações pendentes de node down (para não notificar se reconectar rápido)
         self._pending_node_notifications: dict[str, asyncio.Task] = {}
         # TTL para notificações de node down (não notifica a mesma guild duas vezes em 2 min)
@@ -214,7 +1370,6 @@ class MusicBot(commands.Bot):
             print("Aviso: BOT_OWNER_IDS não definidos. Comandos de administrador do bot ficarão indisponíveis.")
 
         self._init_mongo()
-        self.enable_warp_reconnect = self._load_warp_setting()
         self._load_locales()
         self._init_logger()
 
@@ -290,6 +1445,7 @@ class MusicBot(commands.Bot):
             self.presence_collection = self.mongo_db["bot_presence"]
             self.logs_collection = self.mongo_db["logs_settings"]
             self.warp_collection = self.mongo_db["warp_settings"]
+            self.storage = MongoStorage(self.mongo_db)
             self._mongo_connected = True
             print("MongoDB conectado com sucesso. Preferências de idioma e presença ativadas!")
         except pymongo_errors.OperationFailure as exc:
@@ -299,6 +1455,34 @@ class MusicBot(commands.Bot):
         except Exception as exc:
             print(f"Erro inesperado ao inicializar MongoDB: {exc}")
 
+    async def _attach_queue_cache_backend(self) -> None:
+        backend_name = QUEUE_CACHE_BACKEND or ("mongo" if self.storage is not None else "file")
+        if backend_name == "memory":
+            return
+        if backend_name == "mongo" and self.storage is None:
+            print("[QueueCache] QUEUE_CACHE_BACKEND=mongo sem MongoDB conectado; usando arquivo local.")
+            backend_name = "file"
+
+        if backend_name == "mongo":
+            backend = MongoQueueCacheBackend(self.storage, self.mongo_db["queue_cache"])
+        else:
+            backend = FileQueueCacheBackend(QUEUE_CACHE_FILE)
+        await self.queue_cache.attach(backend)
+
+    async def _attach_node_store(self) -> None:
+        if self.storage is not None:
+            store = MongoNodeStore(self.storage, self.mongo_db["lavalink_nodes"])
+        else:
+            store = FileNodeStore(LAVALINK_NODES_FILE)
+        await self.node_registry.attach(store)
+
+    async def _attach_session_store(self) -> None:
+        if self.storage is not None:
+            store = MongoSessionStore(self.storage, self.mongo_db["lavalink_sessions"])
+        else:
+            store = FileSessionStore(SESSION_SNAPSHOT_FILE)
+        await self.session_resumer.attach(store)
+
     def _init_logger(self) -> None:
         """Inicializa o sistema de logs do bot"""
         from commands.logger import BotLogger
@@ -329,6 +1513,7 @@ class MusicBot(commands.Bot):
         try:
             if not self.locale_dir.exists():
                 print(f"Diretório de locales não encontrado em {self.locale_dir}. Usando apenas mensagens padrão em inglês.")
+                self._locale_tables = {self.default_language: {}}
                 return
 
             for locale_file in self.locale_dir.glob("*.json"):
@@ -348,18 +1533,7 @@ class MusicBot(commands.Bot):
             print(f"Falha ao carregar arquivos de locale: {exc}")
             self.locales = {self.default_language: {}}
 
-    def _resolve_locale_value(self, locale: str, key: str) -> Any:
-        data = self.locales.get(locale)
-        if not data:
-            return None
-
-        current: Any = data
-        for part in key.split('.'):
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-        return current
+        self._locale_tables = build_locale_tables(self.locales, self.default_language)
 
     def translate(
         self,
@@ -376,26 +1550,27 @@ class MusicBot(commands.Bot):
         if not target_locale:
             target_locale = self.default_language
 
-        text = self._resolve_locale_value(target_locale, key)
-        if text is None and target_locale != self.default_language:
-            text = self._resolve_locale_value(self.default_language, key)
+        table = self._locale_tables.get(target_locale)
+        if table is None:
+            table = self._locale_tables.get(self.default_language, {})
 
-        if text is None:
-            if default is not None:
-                text = default
-            else:
+        template = table.get(key)
+        if template is None:
+            if default is None:
                 return key
-
-        if isinstance(text, str):
             if kwargs:
                 try:
-                    return text.format(**kwargs)
+                    return default.format(**kwargs)
                 except Exception as exc:
                     print(f"Erro ao formatar tradução '{key}' ({target_locale}): {exc}")
-                    return text
-            return text
+            return default
 
-        return text
+        if kwargs:
+            try:
+                return template.render(kwargs)
+            except Exception as exc:
+                print(f"Erro ao formatar tradução '{key}' ({target_locale}): {exc}")
+        return template.text
 
     def _get_loop_mode(self, player: wavelink.Player | None) -> wavelink.QueueMode:
         if not isinstance(player, wavelink.Player):
@@ -406,18 +1581,30 @@ class MusicBot(commands.Bot):
         except Exception:
             queue_mode = wavelink.QueueMode.normal
 
-        return getattr(player, "loop_mode_override", queue_mode)
+        override = self.player_states.for_player(player).loop_mode_override
+        return override if override is not None else queue_mode
 
     def _apply_loop_mode(self, player: wavelink.Player | None, mode: wavelink.QueueMode) -> None:
         if not isinstance(player, wavelink.Player):
             return
 
-        player.loop_mode_override = mode
+        self.player_states.for_player(player).loop_mode_override = mode
         try:
             player.queue.mode = mode
         except Exception:
             pass
 
+    def _node_failover_inflight(self, guild_id: int | None) -> bool:
+        state = self.player_states.peek(guild_id)
+        return state is not None and state.node_failover_inflight
+
+    def _release_guild_state(self, guild_id: int | None) -> None:
+        """Descarta o estado do servidor quando o bot sai da call de vez (não na reconstrução do player)."""
+        if guild_id is None:
+            return
+        self.player_states.release(guild_id)
+        self.track_start_effects.cancel(guild_id)
+
     def _count_non_bot_listeners(self, channel: discord.abc.Connectable | None) -> int:
         if channel is None or not hasattr(channel, "members"):
             return 0
@@ -436,8 +1623,8 @@ class MusicBot(commands.Bot):
         player: wavelink.Player | None,
         guild: discord.Guild | None,
     ) -> discord.abc.Messageable | None:
-        if player and hasattr(player, "text_channel"):
-            text_channel = getattr(player, "text_channel", None)
+        if player:
+            text_channel = self.player_states.for_player(player).text_channel
             if text_channel is not None and guild is not None:
                 me = guild.me
                 if me and text_channel.permissions_for(me).send_messages:
@@ -463,10 +1650,11 @@ class MusicBot(commands.Bot):
         if channel is None:
             return
 
-        if getattr(player, "afk_pause_active", False):
+        state = self.player_states.for_player(player)
+        if state.afk_pause_active:
             return
 
-        player.afk_pause_active = True
+        state.afk_pause_active = True
 
         if getattr(player, "playing", False) and not player.paused:
             try:
@@ -494,9 +1682,8 @@ class MusicBot(commands.Bot):
                     color=0xffa500,  # Orange
                 )
                 pause_msg = await message_channel.send(embed=embed)
-                player.lonely_pause_message = pause_msg
-                if hasattr(player, "text_channel"):
-                    player.text_channel = message_channel
+                state.lonely_pause_message = pause_msg
+                state.text_channel = message_channel
             except Exception as exc:
                 print(f"Falha ao enviar aviso de pausa por ausência: {exc}")
 
@@ -521,19 +1708,20 @@ class MusicBot(commands.Bot):
             except Exception as exc:
                 print(f"Falha ao aguardar cancelamento de tarefa AFK: {exc}")
 
-        if not getattr(player, "afk_pause_active", False):
+        state = self.player_states.for_player(player)
+        if not state.afk_pause_active:
             return
 
-        player.afk_pause_active = False
+        state.afk_pause_active = False
 
         # Delete the pause message if it exists
-        pause_msg = getattr(player, "lonely_pause_message", None)
+        pause_msg = state.lonely_pause_message
         if pause_msg:
             try:
                 await pause_msg.delete()
             except Exception:
                 pass
-            player.lonely_pause_message = None
+            state.lonely_pause_message = None
 
         if getattr(player, "paused", False) and getattr(player, "current", None):
             try:
@@ -564,8 +1752,7 @@ class MusicBot(commands.Bot):
                 resume_msg = await message_channel.send(embed=embed)
                 # Auto-delete after 10 seconds
                 asyncio.create_task(self._delete_message_after(resume_msg, 10))
-                if hasattr(player, "text_channel"):
-                    player.text_channel = message_channel
+                state.text_channel = message_channel
             except Exception as exc:
                 print(f"Falha ao enviar aviso de retomada: {exc}")
 
@@ -621,8 +1808,7 @@ class MusicBot(commands.Bot):
                         color=0xff0000,  # Red
                     )
                     await message_channel.send(embed=embed)
-                    if hasattr(player, "text_channel"):
-                        player.text_channel = message_channel
+                    self.player_states.for_player(player).text_channel = message_channel
                 except Exception as exc:
                     print(f"Falha ao enviar aviso de desconexão por ausência: {exc}")
 
@@ -640,6 +1826,7 @@ class MusicBot(commands.Bot):
 
             try:
                 await player.disconnect()
+                self._release_guild_state(guild_id)
             except Exception as exc:
                 print(f"Falha ao desconectar após ausência prolongada: {exc}")
         finally:
@@ -655,8 +1842,9 @@ class MusicBot(commands.Bot):
                     lyrics_cog.cleanup_guild_lyrics(guild_id)
             except Exception:
                 pass
-            if player is not None:
-                player.afk_pause_active = False
+            state = self.player_states.peek(guild_id)
+            if state is not None:
+                state.afk_pause_active = False
 
             current_task = asyncio.current_task()
             stored_task = self._alone_tasks.get(guild_id)
@@ -690,6 +1878,57 @@ class MusicBot(commands.Bot):
         else:
             await self._cancel_lonely_pause(guild, player)
 
+    async def _fetch_guild_languages(self) -> dict[int, str]:
+        """Lê todos os idiomas salvos com uma única consulta."""
+        languages: dict[int, str] = {}
+        if self.storage is None or self.language_collection is None:
+            return languages
+
+        documents = await self.storage.find_many(
+            self.language_collection,
+            {},
+            {"_id": 0, "guild_id": 1, "language": 1},
+            timeout=15.0,
+        )
+        for document in documents:
+            guild_id = document.get("guild_id")
+            language = document.get("language")
+            if guild_id is None or language not in self.supported_languages:
+                continue
+            try:
+                languages[int(guild_id)] = language
+            except (TypeError, ValueError):
+                continue
+        return languages
+
+    async def _load_guild_languages(self) -> None:
+        generation = self.language_cache.generation()
+        try:
+            languages = await self._fetch_guild_languages()
+        except Exception as exc:
+            print(f"Erro ao carregar idiomas dos servidores: {exc}")
+            return
+        self.language_cache.replace_all(languages, since=generation)
+        print(f"🌐 Idiomas carregados para {len(languages)} servidor(es)")
+
+    async def _language_cache_refresher(self) -> None:
+        """Recarrega periodicamente o cache de idiomas (mudanças feitas por outras instâncias)."""
+        while not self.is_closed():
+            try:
+                await asyncio.sleep(self.language_cache.ttl_seconds)
+                if self.language_collection is None:
+                    continue
+                generation = self.language_cache.generation()
+                languages = await self._fetch_guild_languages()
+                self.language_cache.replace_all(languages, since=generation)
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:
+                print(f"Erro ao atualizar cache de idiomas: {exc}")
+
+    def language_cache_stats(self) -> dict[str, Any]:
+        return self.language_cache.stats()
+
     def get_guild_language(self, guild_id: int) -> str:
         if guild_id is None:
             return self.default_language
@@ -697,37 +1936,52 @@ class MusicBot(commands.Bot):
         if self.language_collection is None:
             return self.default_language
 
-        try:
-            document = self.language_collection.find_one({"guild_id": guild_id}, {"_id": 0, "language": 1})
-            if document and document.get("language") in self.supported_languages:
-                return document["language"]
-        except Exception as exc:
-            print(f"Erro ao obter idioma para o servidor {guild_id}: {exc}")
+        # Caminho quente: somente memória. Servidores sem registro usam o idioma padrão.
+        language = self.language_cache.get(guild_id)
+        if language in self.supported_languages:
+            return language
 
         return self.default_language
 
-    def set_guild_language(self, guild_id: int, language: str) -> bool:
+    async def set_guild_language(self, guild_id: int, language: str) -> bool:
         if language not in self.supported_languages:
             print(f"Idioma '{language}' não suportado. Idiomas disponíveis: {sorted(self.supported_languages)}")
             return False
 
-        if self.language_collection is None:
+        if self.storage is None or self.language_collection is None:
             return False
 
         try:
-            self.language_collection.update_one(
+            await self.storage.update_one(
+                self.language_collection,
                 {"guild_id": guild_id},
                 {"$set": {"language": language}},
                 upsert=True,
             )
+            self.language_cache.set(guild_id, language)
             return True
         except Exception as exc:
             print(f"Erro ao salvar idioma para o servidor {guild_id}: {exc}")
             return False
 
     async def setup_hook(self):
+        # Preferências persistidas (via camada assíncrona do MongoDB)
+        if self.storage is not None:
+            self.enable_warp_reconnect = await self._load_warp_setting()
+            await self._load_guild_languages()
+
+        await self.http_client.start()
+
+        # Filas salvas sobrevivem ao restart (Mongo ou arquivo local)
+        await self._attach_queue_cache_backend()
+
+        # Nós do .env + alterações feitas em runtime; snapshot das sessões do processo anterior
+        await self._attach_node_store()
+        await self._attach_session_store()
+
         # Conecta ao Lavalink (usa helper para permitir reconectar depois)
         await self.connect_lavalink()
+        self.session_resumer.start()
 
         # Inicia watchdog que mantém a conexão viva e tenta reconectar se cair
         if not self._watchdog_task:
@@ -741,6 +1995,10 @@ class MusicBot(commands.Bot):
             print("Agendando restauração da presença salva...")
             asyncio.create_task(self._apply_presence_when_ready())
 
+        # Mantém o cache de idiomas atualizado em background
+        if not self._language_refresh_task and self.language_collection is not None:
+            self._language_refresh_task = asyncio.create_task(self._language_cache_refresher())
+
         # Inicia atalho de teclado para alternar logs/painel
         if not self._key_listener_started:
             Thread(target=self._keyboard_listener, daemon=True).start()
@@ -778,6 +2036,19 @@ class MusicBot(commands.Bot):
               f"message_content={self.intents.message_content}")
 
     async def close(self):
+        # Antes de tudo: grava as sessões e solta os players para o Lavalink mantê-los tocando
+        await self.session_resumer.close()
+        if self.logger is not None:
+            await self.logger.close()
+        self.progress_scheduler.stop()
+        await self.queue_cache.close()
+        await self.http_client.close()
+        if self._language_refresh_task:
+            self._language_refresh_task.cancel()
+            self._language_refresh_task = None
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
         if self.mongo_client:
             try:
                 self.mongo_client.close()
@@ -808,8 +2079,30 @@ class MusicBot(commands.Bot):
             await self._evaluate_voice_channel(member.guild)
             return
 
+        # Bot saiu da call por fora dos fluxos normais (kick, canal apagado): solta o estado
+        # depois de uma carência, já que reconstruções do player reconectam logo em seguida.
+        if after.channel is None:
+            self._schedule_state_release(member.guild.id)
+
         await self._evaluate_voice_channel(member.guild)
 
+    def _schedule_state_release(self, guild_id: int) -> None:
+        existing = self._state_release_tasks.get(guild_id)
+        if existing is not None and not existing.done():
+            return
+
+        async def _release_if_gone() -> None:
+            try:
+                await asyncio.sleep(PLAYER_STATE_RELEASE_GRACE_SECONDS)
+                guild = self.get_guild(guild_id)
+                if guild is None or guild.voice_client is None:
+                    self._release_guild_state(guild_id)
+            finally:
+                if self._state_release_tasks.get(guild_id) is asyncio.current_task():
+                    self._state_release_tasks.pop(guild_id, None)
+
+        self._state_release_tasks[guild_id] = asyncio.create_task(_release_if_gone())
+
     @commands.Cog.listener()
     async def on_wavelink_websocket_closed(self, payload: wavelink.WebsocketClosedEventPayload):
         """Detecta quando a conexão WebSocket com um node é perdida"""
@@ -822,7 +2115,7 @@ class MusicBot(commands.Bot):
             guild = getattr(player, "guild", None)
             # Durante failover de node não queremos nenhum cleanup agressivo que derrube a call.
             try:
-                if guild is not None and getattr(guild, "_node_failover_inflight", False):
+                if guild is not None and self._node_failover_inflight(guild.id):
                     return
             except Exception:
                 pass
@@ -844,6 +2137,8 @@ class MusicBot(commands.Bot):
                     lyrics_cog = self.get_cog("LyricsCommands")
                     if lyrics_cog and guild:
                         lyrics_cog.cleanup_guild_lyrics(guild.id)
+                    if guild:
+                        self._release_guild_state(guild.id)
                 except Exception as exc:
                     print(f"⚠️ Erro ao desconectar player: {exc}")
         except Exception as e:
@@ -858,6 +2153,9 @@ class MusicBot(commands.Bot):
         self._node_connected_at[node.identifier] = time.time()
         # Remove timestamp de desconexão se existir
         self._node_disconnected_at.pop(node.identifier, None)
+
+        # Sessão retomada do processo anterior: remonta os players que ainda estão tocando
+        self.session_resumer.on_node_ready(node, bool(getattr(payload, "resumed", False)))
         
         # Quando um nó reconecta, limpa sessões antigas dos players
         # Isso força o rebuild na próxima interação, evitando o bug de "entrar e sair da call"
@@ -918,62 +2216,28 @@ class MusicBot(commands.Bot):
             except Exception as exc:
                 print(f"Erro ao enviar log de erro geral: {exc}")
 
-    async def connect_lavalink(self):
-        """Estabelece conexão com o(s) nós Lavalink usando variáveis de ambiente."""
-        configs: list[dict[str, str | bool]] = []
-        self._lavalink_cfgs = []
-
-        for idx in range(1, 11):  # Suporta até 10 nodes (NODE1 até NODE10)
-            host = (os.getenv(f"LAVALINK_NODE{idx}_HOST", "") or "").strip()
-            if not host:
-                continue
+    async def connect_lavalink(self) -> dict[str, list[str]]:
+        """Conecta (em paralelo) os nós do registro que ainda não estão conectados no pool.
 
-            name = (os.getenv(f"LAVALINK_NODE{idx}_NAME", "") or "").strip()
-
-            port = (os.getenv(f"LAVALINK_NODE{idx}_PORT", "2333") or "2333").strip() or "2333"
-            password = os.getenv(f"LAVALINK_NODE{idx}_PASSWORD", "youshallnotpass")
-            secure = (os.getenv(f"LAVALINK_NODE{idx}_SECURE", "false") or "false").lower() == "true"
-            protocol = "wss" if secure else "ws"
-            configs.append({
-                "id": f"node{idx}",
-                "name": name,
-                "protocol": protocol,
-                "host": host,
-                "port": port,
-                "password": password,
-                "secure": secure,
-            })
-
-        # Compatibilidade com configuração antiga (apenas um nó)
-        if not configs:
-            host = (os.getenv("LAVALINK_HOST", "") or "").strip()
-            if host:
-                name = (os.getenv("LAVALINK_NODE1_NAME", "") or os.getenv("LAVALINK_NAME", "") or "").strip()
-                port = (os.getenv("LAVALINK_PORT", "2333") or "2333").strip() or "2333"
-                password = os.getenv("LAVALINK_PASSWORD", "youshallnotpass")
-                secure = (os.getenv("LAVALINK_SECURE", "false") or "false").lower() == "true"
-                protocol = "wss" if secure else "ws"
-                configs.append({
-                    "id": "node1",
-                    "name": name,
-                    "protocol": protocol,
-                    "host": host,
-                    "port": port,
-                    "password": password,
-                    "secure": secure,
-                })
-
-        self._lavalink_cfgs = configs
+        Retorna os nós que conectaram agora, os que falharam e os pulados por estarem na blacklist.
+        """
+        self._lavalink_cfgs = self.node_registry.configs()
+        result: dict[str, list[str]] = {"connected": [], "failed": [], "blacklisted": []}
 
         if not self._lavalink_cfgs:
             print("Nenhum nó Lavalink configurado!")
-            return
+            return result
 
         nodes_to_connect: list[wavelink.Node] = []
 
         for cfg in self._lavalink_cfgs:
             identifier = cfg["id"]
-            uri = f"{cfg['protocol']}://{cfg['host']}:{cfg['port']}"
+            uri = node_uri(cfg)
+
+            if self.is_node_blacklisted(identifier):
+                # Caiu há pouco: o watchdog reconecta quando a blacklist expirar
+                result["blacklisted"].append(identifier)
+                continue
 
             try:
                 existing = wavelink.Pool.get_node(identifier)
@@ -991,18 +2255,39 @@ class MusicBot(commands.Bot):
                 except Exception as exc:
                     print(f"Erro ao fechar nó {identifier} antes de reconectar: {exc}")
 
-            nodes_to_connect.append(wavelink.Node(uri=uri, password=cfg["password"], identifier=identifier))
+            node = wavelink.Node(
+                uri=uri,
+                password=cfg["password"],
+                identifier=identifier,
+                resume_timeout=LAVALINK_RESUME_TIMEOUT_SECONDS,
+            )
+            # Reaproveita a sessão do processo anterior (o Lavalink segura os players pela janela de retomada)
+            resume_session_id = self.session_resumer.session_for(identifier, node.uri)
+            if resume_session_id:
+                node._session_id = resume_session_id
+            nodes_to_connect.append(node)
 
         if nodes_to_connect:
-            try:
-                await wavelink.Pool.connect(client=self, nodes=nodes_to_connect)
-            except Exception as e:
-                print(f"Erro ao conectar aos nós Lavalink: {e}")
+            # Pool.connect conecta um nó por vez; um connect por nó deixa o handshake de todos em paralelo
+            results = await asyncio.gather(
+                *(self._connect_node(node) for node in nodes_to_connect),
+                return_exceptions=True,
+            )
+            for node, outcome in zip(nodes_to_connect, results):
+                if isinstance(outcome, BaseException):
+                    print(f"Erro ao conectar ao nó {node.identifier}: {outcome!r}")
+                    result["failed"].append(node.identifier)
+                elif outcome:
+                    result["connected"].append(node.identifier)
+                else:
+                    print(f"Erro ao conectar ao nó {node.identifier}: conexão recusada pelo Lavalink")
+                    result["failed"].append(node.identifier)
+            if result["failed"]:
                 print("Certifique-se de que os servidores Lavalink estão rodando!")
-            else:
+            if result["connected"]:
                 for cfg in self._lavalink_cfgs:
                     identifier = cfg["id"]
-                    uri = f"{cfg['protocol']}://{cfg['host']}:{cfg['port']}"
+                    uri = node_uri(cfg)
                     try:
                         node = wavelink.Pool.get_node(identifier)
                         status_name = getattr(node.status, "name", str(node.status))
@@ -1010,12 +2295,147 @@ class MusicBot(commands.Bot):
                         status_name = "DESCONHECIDO"
                     print(f"Nó {identifier}: {uri} • status={status_name}")
 
+        return result
+
+    async def _connect_node(self, node: wavelink.Node) -> bool:
+        """Pool.connect com prazo. Retorna se o nó ficou conectado no pool."""
+        try:
+            await asyncio.wait_for(
+                wavelink.Pool.connect(client=self, nodes=[node]),
+                timeout=LAVALINK_CONNECT_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            # Cancelado no meio das tentativas: o nó não entrou no pool, mas a sessão HTTP ficou aberta
+            try:
+                await node.close(eject=True)
+            except Exception:
+                pass
+            session = getattr(node, "_session", None)
+            if session is not None and not session.closed:
+                await session.close()
+            raise asyncio.TimeoutError(f"sem resposta em {LAVALINK_CONNECT_TIMEOUT_SECONDS:.0f}s")
+
+        try:
+            return wavelink.Pool.get_node(node.identifier).status == wavelink.NodeStatus.CONNECTED
+        except wavelink.InvalidNodeException:
+            # Senha errada ou versão incompatível: o wavelink só registra no log
+            return False
+
+    async def sync_lavalink_nodes(self) -> dict[str, list[str]]:
+        """Aplica o registro ao wavelink.Pool: tira nós removidos/alterados e conecta os novos."""
+        removed: list[str] = []
+        changed: list[str] = []
+        for node in list(wavelink.Pool.nodes.values()):
+            cfg = self.node_registry.get(node.identifier)
+            if cfg is None:
+                removed.append(node.identifier)
+            elif node.uri != node_uri(cfg) or node.password != cfg["password"]:
+                changed.append(node.identifier)
+
+        # Nós que saem (ou mudam de endereço) primeiro passam os players para os demais
+        for identifier in removed + changed:
+            await self._retire_node(identifier)
+
+        pool_before = set(wavelink.Pool.nodes)
+        connected = await self.connect_lavalink()
+        added = [
+            identifier for identifier in connected["connected"]
+            if identifier not in pool_before and identifier not in changed
+        ]
+        if removed or changed or added or connected["failed"]:
+            print(
+                f"[Nodes] Registro aplicado: +{len(added)} novo(s), {len(changed)} alterado(s), "
+                f"-{len(removed)} removido(s), {len(connected['failed'])} sem conexão"
+            )
+        return {
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+            "failed": connected["failed"],
+            "blacklisted": connected["blacklisted"],
+        }
+
+    async def reload_lavalink_nodes(self) -> dict[str, list[str]]:
+        """Relê o .env e o store do registro e aplica as diferenças sem reiniciar o bot."""
+        await self.node_registry.reload()
+        return await self.sync_lavalink_nodes()
+
+    async def add_lavalink_node(self, cfg: dict) -> dict[str, list[str]]:
+        await self.node_registry.add(cfg)
+        return await self.sync_lavalink_nodes()
+
+    async def drain_lavalink_node(self, identifier: str) -> tuple[int, int]:
+        """Para de mandar players novos ao nó e migra os atuais. Retorna (migrados, total)."""
+        if not self.node_registry.drain(identifier):
+            return 0, 0
+        # A afinidade levaria a próxima música da guild de volta ao nó em drain
+        for guild_id, node_id in list(self._session_node_affinity.items()):
+            if node_id == identifier:
+                self._clear_session_node_affinity(guild_id)
+        try:
+            total = len(wavelink.Pool.get_node(identifier).players)
+        except wavelink.InvalidNodeException:
+            return 0, 0
+        # O nó segue vivo: o player antigo é destruído nele depois da troca
+        migrated, failed_players = await self._batch_failover(identifier, destroy_old=True)
+        # Falhou no destino depois de sair do nó: não toca em lugar nenhum, cai no fluxo de queda
+        await self._drop_stranded_players(identifier, self._stranded_players(identifier, failed_players))
+        return len(migrated), total
+
+    async def remove_lavalink_node(self, identifier: str) -> bool:
+        if not await self.node_registry.remove(identifier):
+            return False
+        await self._retire_node(identifier)
+        self._lavalink_cfgs = self.node_registry.configs()
+        return True
+
+    async def _drop_stranded_players(self, identifier: str, players: list[wavelink.Player]) -> None:
+        """Salva a fila, avisa e desconecta players que ficaram sem node depois de um failover falho."""
+        if not players:
+            return
+        affected: list[tuple[int, discord.TextChannel | None]] = []
+        for player in players:
+            guild_id = player.guild.id
+            current_track = getattr(player, "current", None)
+            queue_tracks = list(player.queue) if hasattr(player, "queue") else []
+            if current_track or queue_tracks:
+                self.queue_cache.save_queue(guild_id, current_track, queue_tracks)
+            affected.append((guild_id, self.player_states.for_player(player).text_channel))
+        await self._disconnect_players(players)
+        await self._schedule_node_down_notification(identifier, affected)
+
+    async def _disconnect_players(self, players: list[wavelink.Player]) -> None:
+        for player in players:
+            try:
+                await player.disconnect()
+            except Exception as exc:
+                print(f"[Nodes] Erro ao desconectar player: {exc}")
+
+    async def _retire_node(self, identifier: str) -> None:
+        """Migra os players de um nó que está saindo do pool e o desconecta."""
+        try:
+            node = wavelink.Pool.get_node(identifier)
+        except wavelink.InvalidNodeException:
+            return
+
+        migrated, failed_players = await self._batch_failover(identifier, destroy_old=True)
+        stranded = self._stranded_players(identifier, failed_players)
+        await self._save_queue_and_notify_node_down(identifier, skip_guilds=migrated, extra_players=stranded)
+        await self._disconnect_players(stranded)
+        try:
+            await node.close(eject=True)
+        except Exception as exc:
+            print(f"[Nodes] Erro ao fechar nó {identifier}: {exc}")
+        self._node_blacklist.pop(identifier, None)
+        print(f"[Nodes] Nó {identifier} retirado do pool ({len(migrated)} player(s) migrados)")
+
     async def mark_node_as_failed(self, node_identifier: str) -> None:
         """Marca um nó como falho e o remove do pool (não tenta reconectar por 2 minutos)."""
         # Adiciona à lista negra temporária (120 segundos = 2 minutos)
         import time
         blacklist_duration = 120.0
         self._node_blacklist[node_identifier] = asyncio.get_event_loop().time() + blacklist_duration
+        self.node_scores.record_failure(node_identifier)
         print(f"🚫 Node {node_identifier} na lista negra por {int(blacklist_duration)}s (watchdog não tentará reconectar)")
         
         # Registra timestamp de desconexão para tracking de downtime
@@ -1023,8 +2443,18 @@ class MusicBot(commands.Bot):
         # Remove timestamp de conexão se existir
         self._node_connected_at.pop(node_identifier, None)
         
+        # Migra os players para os nodes saudáveis; só os que não migraram ficam para o fluxo de queda
+        migrated_guilds, failed_players = await self._batch_failover(node_identifier)
+        stranded = self._stranded_players(node_identifier, failed_players)
+
         # Salva filas de players afetados e agenda notificação
-        await self._save_queue_and_notify_node_down(node_identifier)
+        await self._save_queue_and_notify_node_down(
+            node_identifier,
+            skip_guilds=migrated_guilds,
+            extra_players=stranded,
+        )
+        # Os que falharam já no node de destino ficariam mudos lá
+        await self._disconnect_players(stranded)
         
         # Destrói todos os players do node imediatamente para evitar ghost state
         try:
@@ -1091,7 +2521,12 @@ class MusicBot(commands.Bot):
         
         # Reconecta apenas este nó (suprime logging temporariamente)
         uri = f"{cfg['protocol']}://{cfg['host']}:{cfg['port']}"
-        new_node = wavelink.Node(uri=uri, password=cfg["password"], identifier=node_identifier)
+        new_node = wavelink.Node(
+            uri=uri,
+            password=cfg["password"],
+            identifier=node_identifier,
+            resume_timeout=LAVALINK_RESUME_TIMEOUT_SECONDS,
+        )
         
         # Suprime temporariamente o logging do Wavelink
         wavelink_logger = logging.getLogger("wavelink")
@@ -1099,7 +2534,7 @@ class MusicBot(commands.Bot):
         wavelink_logger.setLevel(logging.CRITICAL)
         
         try:
-            await wavelink.Pool.connect(client=self, nodes=[new_node])
+            await self._connect_node(new_node)
         except Exception:
             return False
         finally:
@@ -1131,9 +2566,185 @@ class MusicBot(commands.Bot):
         blacklist_expiry = self._node_blacklist.get(node_identifier, 0)
         return current_time < blacklist_expiry
 
+    def _failover_targets(self, failed_identifier: str) -> list[wavelink.Node]:
+        """Nodes conectados, fora da blacklist e diferentes do que caiu, do menos ao mais carregado."""
+        candidates = [
+            node for node in wavelink.Pool.nodes.values()
+            if node.identifier != failed_identifier
+            and node.status == wavelink.NodeStatus.CONNECTED
+            and not self.is_node_blacklisted(node.identifier)
+            and not self.node_registry.is_draining(node.identifier)
+        ]
+        return self.rank_nodes(candidates)
+
+    async def _batch_failover(
+        self,
+        node_identifier: str,
+        *,
+        destroy_old: bool = False,
+    ) -> tuple[set[int], list[wavelink.Player]]:
+        """Migra todos os players do node em paralelo. Retorna (guilds migradas, players que falharam).
+
+        destroy_old=False para node caído (não responde); True quando o node sai por drain/remoção.
+        Um player que falhou pode já ter saído do node (falha no play depois da troca): ele não
+        aparece mais em node.players, então quem chama precisa tratá-lo pela lista devolvida.
+        """
+        import time
+
+        try:
+            node = wavelink.Pool.get_node(node_identifier)
+            players = list(node.players.values())
+        except wavelink.InvalidNodeException:
+            players = []
+
+        seen = {id(player) for player in players}
+        players.extend(
+            vc for vc in self.voice_clients
+            if isinstance(vc, wavelink.Player)
+            and id(vc) not in seen
+            and getattr(getattr(vc, "node", None), "identifier", None) == node_identifier
+        )
+        players = [player for player in players if getattr(player, "guild", None) and getattr(player, "channel", None)]
+        if not players:
+            return set(), []
+
+        targets = self._failover_targets(node_identifier)
+        if not targets:
+            print(f"[Failover] Nenhum node saudável para receber os {len(players)} player(s) de {node_identifier}")
+            return set(), players
+
+        # Distribui os players entre os destinos: menos atribuídos primeiro, empate pela pontuação de carga
+        rank = {target.identifier: index for index, target in enumerate(targets)}
+        assigned = {target.identifier: 0 for target in targets}
+        plan: list[tuple[wavelink.Player, wavelink.Node]] = []
+        for player in players:
+            target = min(targets, key=lambda n: (assigned[n.identifier], rank[n.identifier]))
+            assigned[target.identifier] += 1
+            plan.append((player, target))
+
+        semaphore = asyncio.Semaphore(max(1, NODE_FAILOVER_MAX_CONCURRENCY))
+        batch_started = time.perf_counter()
+
+        async def _migrate(player: wavelink.Player, target: wavelink.Node) -> bool:
+            guild_id = player.guild.id
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    migrated = await asyncio.wait_for(
+                        self._failover_player(player, target, destroy_old=destroy_old),
+                        timeout=NODE_FAILOVER_PLAYER_TIMEOUT_SECONDS,
+                    )
+                except Exception as exc:
+                    print(f"[Failover] Guild {guild_id}: falha ao migrar para {target.identifier}: {exc!r}")
+                    migrated = False
+                elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if migrated:
+                self._failover_counts["migrated"] += 1
+                self._failover_timings.append(elapsed_ms)
+                print(f"[Failover] Guild {guild_id}: {node_identifier} → {target.identifier} em {elapsed_ms:.0f}ms")
+                return True
+            self._failover_counts["failed"] += 1
+            return False
+
+        results = await asyncio.gather(*(_migrate(player, target) for player, target in plan))
+        migrated_guilds = {player.guild.id for (player, _), migrated in zip(plan, results) if migrated}
+        failed_players = [player for (player, _), migrated in zip(plan, results) if not migrated]
+        batch_ms = (time.perf_counter() - batch_started) * 1000
+
+        self._failover_counts["batches"] += 1
+        self._last_failover_batch = {
+            "node": node_identifier,
+            "players": len(plan),
+            "migrated": len(migrated_guilds),
+            "duration_ms": round(batch_ms, 1),
+            "targets": {identifier: count for identifier, count in assigned.items() if count},
+        }
+        print(
+            f"[Failover] Node {node_identifier}: {len(migrated_guilds)}/{len(plan)} player(s) migrados em {batch_ms:.0f}ms"
+        )
+        return migrated_guilds, failed_players
+
+    @staticmethod
+    def _stranded_players(node_identifier: str, players: list[wavelink.Player]) -> list[wavelink.Player]:
+        """Players cujo failover falhou depois de já terem saído do node (mudos no destino)."""
+        return [
+            player for player in players
+            if getattr(getattr(player, "node", None), "identifier", None) != node_identifier
+        ]
+
+    async def _failover_player(
+        self,
+        player: wavelink.Player,
+        target: wavelink.Node,
+        *,
+        destroy_old: bool = False,
+    ) -> bool:
+        """Move um player para target preservando faixa, posição, volume, pausa, filtros e fila."""
+        state = self.player_states.for_player(player)
+        track = getattr(player, "current", None)
+        position = int(getattr(player, "position", 0) or 0)
+        volume = getattr(player, "volume", 100)
+        paused = bool(getattr(player, "paused", False))
+        filters = getattr(player, "filters", None)
+        loop_mode = self._get_loop_mode(player)
+
+        # Eventos de fim disparados pela troca não podem seguir o fluxo normal (que desconecta)
+        state.node_failover_inflight = True
+        try:
+            if not await self._move_player_to_node(player, target, destroy_old=destroy_old):
+                return False
+
+            if track is not None:
+                start = 0
+                length = getattr(track, "length", None) or 0
+                if length and not getattr(track, "is_stream", False):
+                    start = max(0, min(position, length - 1000))
+                await player.play(
+                    track,
+                    start=start,
+                    volume=volume,
+                    paused=paused,
+                    filters=filters,
+                    add_history=False,
+                )
+            else:
+                if filters is not None:
+                    await player.set_filters(filters)
+                await player.set_volume(volume)
+
+            # A fila é a do próprio player (mesmo objeto), só reaplica o modo de loop
+            self._apply_loop_mode(player, loop_mode)
+            return True
+        finally:
+            state.node_failover_inflight = False
+
+    def failover_stats(self) -> dict[str, Any]:
+        timings = sorted(self._failover_timings)
+
+        def percentile(fraction: float) -> float:
+            if not timings:
+                return 0.0
+            return round(timings[min(len(timings) - 1, int(fraction * len(timings)))], 1)
+
+        return {
+            **self._failover_counts,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(timings[-1], 1) if timings else 0.0,
+            "last_batch": self._last_failover_batch,
+        }
+
+    def rank_nodes(self, nodes: list[wavelink.Node]) -> list[wavelink.Node]:
+        """Ordena nodes do menos para o mais carregado (ver NodeScoreboard); nodes em drain vão para o fim."""
+        ranked = self.node_scores.rank(nodes)
+        if not self.node_registry.draining:
+            return ranked
+        return sorted(ranked, key=lambda node: self.node_registry.is_draining(node.identifier))
+
     def get_least_used_node(self) -> wavelink.Node | None:
-        """Retorna o node com menos players ativos (e que não está na blacklist)."""
-        candidates: list[tuple[wavelink.Node, int]] = []
+        """Retorna o node com menor penalidade de carga (e que não está na blacklist)."""
+        candidates: list[wavelink.Node] = []
 
         for node in wavelink.Pool.nodes.values():
             identifier = getattr(node, "identifier", None)
@@ -1148,15 +2759,12 @@ class MusicBot(commands.Bot):
             if node.status != wavelink.NodeStatus.CONNECTED:
                 continue
 
-            player_count = len(node.players) if hasattr(node, "players") else 0
-            candidates.append((node, player_count))
+            candidates.append(node)
 
         if not candidates:
             return None
 
-        # Ordena por número de players (menor primeiro)
-        candidates.sort(key=lambda x: x[1])
-        return candidates[0][0]
+        return self.rank_nodes(candidates)[0]
 
     def has_healthy_node(self) -> bool:
         """Verifica se existe pelo menos um node saudável (conectado e não na blacklist)."""
@@ -1173,8 +2781,16 @@ class MusicBot(commands.Bot):
 
         return False
 
-    async def _save_queue_and_notify_node_down(self, node_identifier: str) -> None:
-        """Salva filas de players afetados e agenda notificação de node down."""
+    async def _save_queue_and_notify_node_down(
+        self,
+        node_identifier: str,
+        skip_guilds: set[int] | None = None,
+        extra_players: list[wavelink.Player] | None = None,
+    ) -> None:
+        """Salva filas de players afetados e agenda notificação de node down.
+
+        extra_players: players do node que já não estão em node.players (failover que falhou no destino).
+        """
         import time
 
         try:
@@ -1191,6 +2807,10 @@ class MusicBot(commands.Bot):
                 and getattr(getattr(vc, "node", None), "identifier", None) == node_identifier
             ]
 
+        if extra_players:
+            seen = {id(player) for player in players}
+            players.extend(player for player in extra_players if id(player) not in seen)
+
         if not players:
             print(f"[NodeDown] Nenhum player afetado pelo node {node_identifier}")
             return
@@ -1203,6 +2823,8 @@ class MusicBot(commands.Bot):
                 continue
 
             guild_id = guild.id
+            if skip_guilds and guild_id in skip_guilds:
+                continue
             current_track = getattr(player, "current", None)
             queue_tracks = list(player.queue) if hasattr(player, "queue") else []
 
@@ -1211,7 +2833,7 @@ class MusicBot(commands.Bot):
                 self.queue_cache.save_queue(guild_id, current_track, queue_tracks)
 
             # Obtém text_channel para notificação
-            text_channel = getattr(player, "text_channel", None)
+            text_channel = self.player_states.for_player(player).text_channel
             if text_channel is None and current_track:
                 requester = getattr(current_track, "requester", None)
                 if requester and hasattr(requester, "channel"):
@@ -1476,8 +3098,34 @@ class MusicBot(commands.Bot):
 
         return True
 
+    async def load_tracks(self, identifier: str):
+        """Resolve um identificador (URL ou prefixo de busca) passando pelo cache de buscas."""
+        hit, cached = self.search_cache.get(identifier)
+        if hit:
+            return cached
+
+        async def _load():
+            import time
+            started = time.perf_counter()
+            try:
+                result = await wavelink.Pool.fetch_tracks(identifier)
+            except Exception:
+                result = await self._search_with_failover_uncoalesced(identifier)
+
+            self.search_cache.put(identifier, result, (time.perf_counter() - started) * 1000)
+            return result
+
+        key = f"load:{self.search_cache.normalize_identifier(identifier)}"
+        result, shared = await self._load_flights.do(key, _load)
+        return SearchResultCache.clone(result) if shared else result
+
     async def search_with_failover(self, query: str):
         """Realiza buscas no Lavalink com failover entre os nós configurados."""
+        key = f"search:{self.search_cache.normalize_identifier(query)}"
+        result, shared = await self._load_flights.do(key, lambda: self._search_with_failover_uncoalesced(query))
+        return SearchResultCache.clone(result) if shared else result
+
+    async def _search_with_failover_uncoalesced(self, query: str):
 
         attempt_nodes: list[wavelink.Node] = []
         seen: set[str] = set()
@@ -1505,17 +3153,73 @@ class MusicBot(commands.Bot):
         if not attempt_nodes:
             raise RuntimeError("Nenhum nó Lavalink disponível para busca.")
 
+        import time
         errors: list[str] = []
-        for node in attempt_nodes:
+        for node in self.rank_nodes(attempt_nodes):
             try:
-                return await wavelink.Playable.search(query, node=node)
+                started = time.perf_counter()
+                result = await wavelink.Playable.search(query, node=node)
+                self.node_scores.record_latency(node.identifier, (time.perf_counter() - started) * 1000)
+                return result
             except Exception as exc:
+                self.node_scores.record_failure(node.identifier)
                 error_msg = f"{node.identifier}: {exc}"
                 errors.append(error_msg)
                 print(f"Erro ao buscar em {node.identifier}: {exc}. Tentando próximo nó...")
 
         raise RuntimeError("Falha ao buscar em todos os nós disponíveis. " + "; ".join(errors))
 
+    async def _probe_node(self, identifier: str) -> bool | None:
+        """Health check de um node via /v4/stats. Retorna None se o node não foi verificado."""
+        import time
+        try:
+            node = wavelink.Pool.get_node(identifier)
+        except wavelink.InvalidNodeException:
+            return None  # Node não existe no pool
+
+        if node.status != wavelink.NodeStatus.CONNECTED:
+            return None
+
+        history = self._node_probe_history.setdefault(identifier, deque(maxlen=NODE_PROBE_HISTORY_SIZE))
+        started = time.perf_counter()
+        try:
+            stats = await asyncio.wait_for(node.fetch_stats(), timeout=NODE_PROBE_TIMEOUT_SECONDS)
+        except Exception:
+            history.append((time.time(), None))
+            print(f"❌ Node {identifier} não respondeu ao ping - marcando como failed")
+            # Marca imediatamente, sem esperar os outros nodes da varredura
+            await self.mark_node_as_failed(identifier)
+            return False
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        history.append((time.time(), latency_ms))
+        self.node_scores.record_stats(identifier, stats)
+        self.node_scores.record_latency(identifier, latency_ms)
+        return True
+
+    async def _run_node_health_sweep(self) -> None:
+        """Verifica todos os nodes em paralelo; a duração fica limitada ao timeout de um único probe."""
+        import time
+        current_loop_time = asyncio.get_event_loop().time()
+        identifiers = [
+            cfg["id"] for cfg in self._lavalink_cfgs
+            # Pula nodes que estão na blacklist
+            if current_loop_time >= self._node_blacklist.get(cfg["id"], 0)
+        ]
+        if not identifiers:
+            return
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._probe_node(identifier) for identifier in identifiers),
+            return_exceptions=True,
+        )
+        self._last_health_sweep_ms = (time.perf_counter() - started) * 1000
+
+        for identifier, result in zip(identifiers, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Erro ao verificar node {identifier}: {result}")
+
     async def _lavalink_watchdog(self):
         """Tarefa em background que mantém a conexão ativa e tenta reconectar quando necessário."""
         await self.wait_until_ready()
@@ -1532,28 +3236,7 @@ class MusicBot(commands.Bot):
                     current_time = time.time()
                     # Ping a cada 30s usando /stats (universal, todos Lavalink suportam)
                     if current_time - last_health_check >= 30:
-                        for cfg in self._lavalink_cfgs:
-                            identifier = cfg["id"]
-                            
-                            # Pula nodes que estão na blacklist
-                            blacklist_expiry = self._node_blacklist.get(identifier, 0)
-                            if current_time < blacklist_expiry:
-                                continue
-                            
-                            try:
-                                node = wavelink.Pool.get_node(identifier)
-                                if node.status == wavelink.NodeStatus.CONNECTED:
-                                    # Ping com /stats (universal, funciona em todos Lavalink)
-                                    try:
-                                        await asyncio.wait_for(node.fetch_stats(), timeout=8.0)
-                                    except (asyncio.TimeoutError, Exception):
-                                        print(f"❌ Node {identifier} não respondeu ao ping - marcando como failed")
-                                        await self.mark_node_as_failed(identifier)
-                            except wavelink.InvalidNodeException:
-                                pass  # Node não existe no pool
-                            except Exception as exc:
-                                print(f"⚠️ Erro ao verificar node {identifier}: {exc}")
-                        
+                        await self._run_node_health_sweep()
                         last_health_check = current_time
                     
                     # Verifica se há nodes pendentes para ajustar intervalo
@@ -1666,7 +3349,14 @@ class MusicBot(commands.Bot):
                 if time_parts:
                     time_info = f" | {' | '.join(time_parts)}"
 
-            node_lines.append(f"{node_id}: {status_icon} calls={call_count} tocando={playing_count}{time_info}")
+            score_info = ""
+            if node and node.status == wavelink.NodeStatus.CONNECTED:
+                score_info = f" score={self.node_scores.score(node):.1f}"
+                history = self._node_probe_history.get(node_id)
+                if history and history[-1][1] is not None:
+                    score_info += f" ping={history[-1][1]:.0f}ms"
+
+            node_lines.append(f"{node_id}: {status_icon} calls={call_count} tocando={playing_count}{score_info}{time_info}")
 
         if self._lavalink_cfgs:
             seen_ids: set[str] = set()
@@ -1679,22 +3369,131 @@ class MusicBot(commands.Bot):
                 build_line(identifier, node)
                 seen_ids.add(identifier)
 
-            for identifier, node in wavelink.Pool.nodes.items():
-                if identifier in seen_ids:
-                    continue
-                build_line(identifier, node)
-        else:
-            for identifier, node in wavelink.Pool.nodes.items():
-                build_line(identifier, node)
+            for identifier, node in wavelink.Pool.nodes.items():
+                if identifier in seen_ids:
+                    continue
+                build_line(identifier, node)
+        else:
+            for identifier, node in wavelink.Pool.nodes.items():
+                build_line(identifier, node)
+
+        if not node_lines:
+            node_lines.append("Nenhum nó conectado")
+
+        nodes_status = "\n".join(node_lines)
+
+        cache_stats = self.search_cache.stats()
+        cache_line = (
+            f"Cache de busca: {cache_stats['entries']} entradas | "
+            f"acertos={cache_stats['hit_rate'] * 100:.0f}% | "
+            f"economizado={self._format_duration(cache_stats['saved_ms'] / 1000)} | "
+            f"deduplicadas={self._load_flights.deduplicated}"
+        )
+
+        progress = self.progress_scheduler.stats()
+        progress_line = (
+            f"Barras de progresso: {progress['sessions']} | intervalo={progress['interval']:.0f}s | "
+            f"edições={progress['edits']} iguais={progress['skipped_unchanged']} 429={progress['rate_limited']}\n"
+        )
+
+        queues = self.queue_cache.stats()
+        progress_line += (
+            f"Filas salvas: {queues['queues']} ({queues['backend']}) | pendentes={queues['pending']} "
+            f"gravações={queues['flushes']} erros={queues['flush_errors']}\n"
+        )
+
+        busiest_hosts = sorted(
+            self.http_client.stats().items(),
+            key=lambda item: item[1]["requests"],
+            reverse=True,
+        )[:3]
+        if busiest_hosts:
+            progress_line += "HTTP: " + " | ".join(
+                f"{host} {entry['requests']}req {entry['avg_ms']:.0f}ms erros={entry['errors'] + entry['timeouts']}"
+                for host, entry in busiest_hosts
+            ) + "\n"
+
+        languages = self.language_cache_stats()
+        if languages["hits"] or languages["misses"]:
+            progress_line += (
+                f"Idiomas: {languages['entries']} servidor(es) | acertos={languages['hits']} "
+                f"erros={languages['misses']} taxa={languages['hit_rate']:.0%} recargas={languages['refreshes']}\n"
+            )
+
+        player_states = self.player_states.stats()
+        progress_line += (
+            f"Estados de player: {player_states['states']} | criados={player_states['created']} "
+            f"liberados={player_states['released']}\n"
+        )
+
+        failover = self.failover_stats()
+        if failover["batches"]:
+            progress_line += (
+                f"Failover: migrados={failover['migrated']} falhas={failover['failed']} lotes={failover['batches']} | "
+                f"p50={failover['p50_ms']:.0f}ms p95={failover['p95_ms']:.0f}ms máx={failover['max_ms']:.0f}ms\n"
+            )
 
-        if not node_lines:
-            node_lines.append("Nenhum nó conectado")
+        events = self.event_dispatcher.stats()
+        if events["kinds"]:
+            progress_line += (
+                f"Eventos: guilds ativas={events['active_guilds']} pendentes={events['pending']} "
+                f"fila máx={events['max_depth']} | " + " | ".join(
+                    f"{kind} {entry['processed']} espera={entry['avg_wait_ms']:.0f}ms exec={entry['avg_run_ms']:.0f}ms "
+                    f"máx={entry['max_latency_ms']:.0f}ms fundidos={entry['merged']} descartados={entry['dropped']}"
+                    for kind, entry in events["kinds"].items()
+                ) + "\n"
+            )
 
-        nodes_status = "\n".join(node_lines)
+        effects = self.track_start_effects.stats()
+        if effects:
+            progress_line += "Início de faixa: " + " | ".join(
+                f"{name} {entry['avg_ms']:.0f}ms (máx {entry['max_ms']:.0f}) timeouts={entry['timeouts']} "
+                f"erros={entry['errors']}"
+                for name, entry in effects.items()
+            ) + "\n"
+
+        if self.logger is not None:
+            logs = self.logger.stats()
+            progress_line += (
+                f"Logs: fila={logs['queued']} enviados={logs['sent_events']} em {logs['sent_messages']} msgs "
+                f"descartados={logs['dropped']} desabilitados={logs['disabled']} falhas={logs['failed']}\n"
+            )
+
+        lyrics_cog = self.get_cog("LyricsCommands")
+        lyrics_cache = getattr(lyrics_cog, "lyrics_cache", None)
+        if lyrics_cache is not None:
+            lyrics = lyrics_cache.stats()
+            variants = ", ".join(f"{name}={wins}" for name, wins in list(lyrics_cog.lrclib_variant_stats().items())[:3])
+            progress_line += (
+                f"Letras em cache: {lyrics['entries']} ({lyrics['store']}) | acerto={lyrics['hit_rate'] * 100:.0f}% "
+                f"mem={lyrics['memory_hits']} store={lyrics['store_hits']} neg={lyrics['negative_hits']} "
+                f"buscas={lyrics['misses']}" + (f" | variantes: {variants}" if variants else "") + "\n"
+            )
+            prefetch = lyrics_cog.prefetch_stats()
+            if prefetch:
+                progress_line += (
+                    f"Prefetch de letras: agendados={prefetch.get('scheduled', 0)} buscados={prefetch.get('fetched', 0)} "
+                    f"já em cache={prefetch.get('cached', 0)} sem letra={prefetch.get('not_found', 0)} "
+                    f"erros={prefetch.get('errors', 0)}\n"
+                )
+
+        sessions = self.session_resumer.stats()
+        if sessions["restored"] or sessions["failed"] or sessions["pending"]:
+            progress_line += (
+                f"Sessões retomadas: {sessions['restored']} falhas={sessions['failed']} "
+                f"pendentes={sessions['pending']} fila salva={sessions['fallbacks']}\n"
+            )
+
+        sweep_line = ""
+        if self._last_health_sweep_ms is not None:
+            sweep_line = f"Última verificação dos nós: {self._last_health_sweep_ms:.0f}ms\n"
 
         return (
             f"Calls totais: {total_calls}\n"
             f"Tocando (total): {total_playing}\n"
+            f"{cache_line}\n"
+            f"{progress_line}"
+            f"{sweep_line}"
             f"Por nó:\n{nodes_status}"
         )
 
@@ -1733,104 +3532,167 @@ class MusicBot(commands.Bot):
                 print(f"Erro no listener de teclado: {e}")
                 break
 
+    @staticmethod
+    def _event_track_key(track: wavelink.Playable | None) -> str | None:
+        if track is None:
+            return None
+        return getattr(track, "encoded", None) or getattr(track, "identifier", None)
+
+    def _dispatch_guild_event(self, player: wavelink.Player, kind: str, key: Any, handler, **kwargs) -> bool:
+        """Envia o evento para a fila da guild; sem guild, o chamador processa direto."""
+        guild = getattr(player, "guild", None)
+        if guild is None:
+            return False
+        self.event_dispatcher.submit(guild.id, kind, key, handler, **kwargs)
+        return True
+
     async def on_wavelink_track_start(self, payload: wavelink.TrackStartEventPayload):
+        player = payload.player
+        if not player:
+            return
+        # Um track_start novo torna obsoleto qualquer track_start ainda não processado
+        if not self._dispatch_guild_event(
+            player,
+            "track_start",
+            self._event_track_key(payload.track),
+            lambda: self._handle_track_start(payload),
+            supersedes=("track_start",),
+        ):
+            await self._handle_track_start(payload)
+
+    async def on_wavelink_track_end(self, payload: wavelink.TrackEndEventPayload):
+        player = payload.player
+        if not player:
+            return
+        reason = str(getattr(payload, "reason", "") or "").upper()
+        # Eventos gerados pelo próprio failover (disconnect/reconnect) não entram na fila:
+        # quando fossem processados o failover já teria terminado e o fluxo normal derrubaria a call.
+        guild = getattr(player, "guild", None)
+        if guild is not None and self._node_failover_inflight(guild.id) and reason not in ("LOAD_FAILED", "LOADFAILED"):
+            self.event_dispatcher.drop("track_end")
+            return
+        if not self._dispatch_guild_event(
+            player,
+            "track_end",
+            (self._event_track_key(payload.track), reason),
+            lambda: self._handle_track_end(payload),
+        ):
+            await self._handle_track_end(payload)
+
+    async def on_wavelink_track_exception(self, payload: wavelink.TrackExceptionEventPayload):
+        player = payload.player
+        if not player:
+            return
+        if not self._dispatch_guild_event(
+            player,
+            "track_exception",
+            self._event_track_key(payload.track),
+            lambda: self._handle_track_exception(payload),
+        ):
+            await self._handle_track_exception(payload)
+
+    async def _handle_track_start(self, payload: wavelink.TrackStartEventPayload):
         player = payload.player
         if not player:
             return
         await self._apply_track_start_effects(player, payload.track)
         
         # Envia log de início de música
-        if self.logger and payload.track:
-            try:
-                guild = player.guild
-                channel = getattr(player, "channel", None)
-                
-                # Obtém informações da track
-                track_name = getattr(payload.track, "title", "Unknown")
-                track_url = getattr(payload.track, "uri", None)
-                
-                # Tenta obter a artwork de várias formas
-                artwork_url = None
-                if hasattr(payload.track, "artwork"):
-                    artwork = getattr(payload.track, "artwork", None)
-                    if artwork:
-                        artwork_url = getattr(artwork, "url", None) or str(artwork) if artwork else None
-                
-                # Se não encontrou, tenta pegar do artworkUrl direto (algumas versões do wavelink)
-                if not artwork_url and hasattr(payload.track, "artworkUrl"):
-                    artwork_url = getattr(payload.track, "artworkUrl", None)
-                
-                # Fallback: tenta pegar thumbnail do YouTube se for URL do YouTube
-                if not artwork_url and track_url and "youtube.com" in track_url or "youtu.be" in track_url:
-                    # Extrai o ID do vídeo do YouTube
-                    import re
-                    youtube_patterns = [
-                        r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([^&\n?#]+)',
-                        r'youtube\.com\/embed\/([^&\n?#]+)',
-                    ]
-                    for pattern in youtube_patterns:
-                        match = re.search(pattern, track_url)
-                        if match:
-                            video_id = match.group(1)
-                            artwork_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-                            break
-                
-                # Obtém informações do canal e usuário
-                channel_name = channel.name if channel else "Unknown"
-                
-                # Tenta obter o requester de várias formas
-                requester = getattr(payload.track, "requester", None)
-                requester_name = "Unknown"
-                
-                # Tenta obter de um dicionário personalizado no player
-                if not requester and hasattr(player, "_track_requesters"):
-                    track_id = getattr(payload.track, "identifier", None) or getattr(payload.track, "encoded", None)
-                    if track_id and track_id in player._track_requesters:
-                        requester = player._track_requesters.get(track_id)
-                
-                if requester:
-                    # Se for um objeto discord.Member ou discord.User
-                    if hasattr(requester, "display_name"):
-                        requester_name = f"{requester.display_name} (@{requester.name})"
-                    elif hasattr(requester, "name"):
-                        requester_name = f"@{requester.name}"
-                    elif hasattr(requester, "id"):
-                        requester_name = f"<@{requester.id}>"
-                    else:
-                        requester_name = str(requester)
-                
-                guild_name = guild.name if guild else "Unknown"
-                guild_id = guild.id if guild else None
-                
-                await self.logger.log_music_start(
-                    track_name=track_name,
-                    track_url=track_url,
-                    artwork_url=artwork_url,
-                    channel_name=channel_name,
-                    requester_name=requester_name,
-                    guild_name=guild_name,
-                    guild_id=guild_id,
-                )
-            except Exception as exc:
-                print(f"Erro ao enviar log de início de música: {exc}")
+        if self.logger and payload.track and getattr(player, "guild", None) is not None:
+            self.track_start_effects.launch(player.guild.id, "log", self._log_track_start(player, payload.track))
+
+    async def _log_track_start(self, player: wavelink.Player, track: wavelink.Playable) -> None:
+        guild = player.guild
+        channel = getattr(player, "channel", None)
+        
+        # Obtém informações da track
+        track_name = getattr(track, "title", "Unknown")
+        track_url = getattr(track, "uri", None)
+        
+        # Tenta obter a artwork de várias formas
+        artwork_url = None
+        if hasattr(track, "artwork"):
+            artwork = getattr(track, "artwork", None)
+            if artwork:
+                artwork_url = getattr(artwork, "url", None) or str(artwork)
+        
+        # Se não encontrou, tenta pegar do artworkUrl direto (algumas versões do wavelink)
+        if not artwork_url and hasattr(track, "artworkUrl"):
+            artwork_url = getattr(track, "artworkUrl", None)
+        
+        # Fallback: tenta pegar thumbnail do YouTube se for URL do YouTube
+        if not artwork_url and track_url and ("youtube.com" in track_url or "youtu.be" in track_url):
+            for pattern in _YOUTUBE_VIDEO_ID_PATTERNS:
+                match = pattern.search(track_url)
+                if match:
+                    video_id = match.group(1)
+                    artwork_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+                    break
+        
+        # Obtém informações do canal e usuário
+        channel_name = channel.name if channel else "Unknown"
+        
+        # Tenta obter o requester de várias formas
+        requester = getattr(track, "requester", None)
+        requester_name = "Unknown"
+        
+        # Tenta obter de um dicionário personalizado no player
+        if not requester:
+            requester = self.player_states.for_player(player).requester_for(track)
+        
+        if requester:
+            # Se for um objeto discord.Member ou discord.User
+            if hasattr(requester, "display_name"):
+                requester_name = f"{requester.display_name} (@{requester.name})"
+            elif hasattr(requester, "name"):
+                requester_name = f"@{requester.name}"
+            elif hasattr(requester, "id"):
+                requester_name = f"<@{requester.id}>"
+            else:
+                requester_name = str(requester)
+        
+        guild_name = guild.name if guild else "Unknown"
+        guild_id = guild.id if guild else None
+        
+        await self.logger.log_music_start(
+            track_name=track_name,
+            track_url=track_url,
+            artwork_url=artwork_url,
+            channel_name=channel_name,
+            requester_name=requester_name,
+            guild_name=guild_name,
+            guild_id=guild_id,
+        )
 
     async def _apply_track_start_effects(self, player: wavelink.Player, track: wavelink.Playable | None) -> None:
+        """Reseta o estado da faixa e dispara status do canal e embed em segundo plano."""
         if not player:
             return
         if track is None:
             track = getattr(player, "current", None)
             if track is None:
                 return
+        # Reset de fallback e das tentativas de failover por node para a faixa atual
+        self.player_states.for_player(player).reset_track_attempts()
+        loop_mode = self._get_loop_mode(player)
+        self._apply_loop_mode(player, loop_mode)
+
+        guild = getattr(player, "guild", None)
+        if guild is None:
+            await self._update_voice_channel_status(player, track)
+            await self._refresh_now_playing(player, track)
+            return
+        self.track_start_effects.launch(guild.id, "voice_status", self._update_voice_channel_status(player, track))
+        self.track_start_effects.launch(guild.id, "now_playing", self._refresh_now_playing(player, track))
+
+    async def _update_voice_channel_status(self, player: wavelink.Player, track: wavelink.Playable) -> None:
         try:
             channel = getattr(player, "channel", None)
             if channel and isinstance(channel, discord.VoiceChannel):
-                if not hasattr(player, "_original_channel_status"):
-                    player._original_channel_status = getattr(channel, "status", None)
-                if not hasattr(player, "_channel_status_overridden"):
-                    player._channel_status_overridden = False
-                if not player._channel_status_overridden:
-                    current_status = getattr(channel, "status", None)
-                    player._original_channel_status = current_status
+                state = self.player_states.for_player(player)
+                if not state.channel_status_overridden:
+                    state.original_channel_status = getattr(channel, "status", None)
+                    state.channel_status_captured = True
                 track_title = getattr(track, "title", None)
                 if track_title:
                     new_status = f"🎵 {track_title}".strip()
@@ -1838,29 +3700,25 @@ class MusicBot(commands.Bot):
                         new_status = new_status[:97] + "..."
                     if getattr(channel, "status", None) != new_status:
                         await channel.edit(status=new_status)
-                        player._channel_status_overridden = True
+                        state.channel_status_overridden = True
         except discord.Forbidden:
             pass
         except Exception as exc:
             print(f"Falha ao atualizar status do canal de voz: {exc}")
-        if not hasattr(player, "_fallback_attempts"):
-            player._fallback_attempts = set()
-        player._fallback_in_progress = False
-        # Reset de tentativas de failover por node para a faixa atual
-        try:
-            player._unavailable_failover_attempts = set()
-        except Exception:
-            pass
-        loop_mode = self._get_loop_mode(player)
-        self._apply_loop_mode(player, loop_mode)
+
+    async def _refresh_now_playing(self, player: wavelink.Player, track: wavelink.Playable) -> None:
         await self._cancel_progress_task(player)
         await self._send_now_playing_embed(player, track)
         self._start_progress_task(player, track)
 
-    async def on_wavelink_track_end(self, payload: wavelink.TrackEndEventPayload):
+    async def _handle_track_end(self, payload: wavelink.TrackEndEventPayload):
         player = payload.player
         if not player:
             return
+        # Um status ainda pendente da faixa que acabou não pode sobrescrever a restauração
+        guild = getattr(player, "guild", None)
+        if guild is not None:
+            self.track_start_effects.cancel(guild.id, "voice_status")
         await self._restore_voice_channel_status(player)
 
         reason = (getattr(payload, "reason", "Unknown") or "Unknown")
@@ -1870,26 +3728,27 @@ class MusicBot(commands.Bot):
 
         # Evita que eventos disparados por disconnect/reconnect durante failover
         # executem o fluxo normal (que pode desconectar a call).
-        try:
-            guild = getattr(player, "guild", None)
-            if guild is not None and getattr(guild, "_node_failover_inflight", False) and reason_upper != "LOAD_FAILED":
-                return
-        except Exception:
-            pass
+        state = self.player_states.for_player(player)
+        if state.node_failover_inflight and reason_upper != "LOAD_FAILED":
+            return
 
         print(f"Track finalizado. Razão: {reason_upper}. Guild: {getattr(player.guild, 'name', 'Desconhecido')}")
 
         if reason_upper == "LOAD_FAILED":
-            exception_info = getattr(player, "_last_error", None)
+            exception_info = state.last_error
+
+            failed_node_id = getattr(getattr(player, "node", None), "identifier", None)
+            if failed_node_id:
+                self.node_scores.record_failure(failed_node_id)
 
-            pending = getattr(player, "_warp_retry_future", None)
+            pending = state.warp_retry_future
             if pending and not pending.done():
                 try:
                     success = await pending
                 except Exception as exc:
                     print(f"Warp retry future falhou: {exc}")
                     success = False
-                player._last_error = None
+                state.last_error = None
                 if success:
                     return
 
@@ -1899,17 +3758,17 @@ class MusicBot(commands.Bot):
                 except Exception as exc:
                     print(f"Warp retry future result erro: {exc}")
                     success = False
-                player._last_error = None
+                state.last_error = None
                 if success:
                     return
 
-            if getattr(player, "_warp_retry_pending", False) and not getattr(player, "_warp_retry_attempted", False):
-                player._warp_retry_attempted = True
-                retry_track = getattr(player, "_warp_retry_track", None) or payload.track
+            if state.warp_retry_pending and not state.warp_retry_attempted:
+                state.warp_retry_attempted = True
+                retry_track = state.warp_retry_track or payload.track
                 scheduled = await self._schedule_warp_retry(player, retry_track)
-                player._warp_retry_pending = False
-                player._warp_retry_track = None
-                player._last_error = None
+                state.warp_retry_pending = False
+                state.warp_retry_track = None
+                state.last_error = None
                 if scheduled:
                     return
 
@@ -1920,7 +3779,7 @@ class MusicBot(commands.Bot):
                 payload.track,
                 exception_info,
             )
-            player._last_error = None
+            state.last_error = None
             if node_failover_started:
                 return
 
@@ -1934,7 +3793,7 @@ class MusicBot(commands.Bot):
                 pass
 
             fallback_started = await self._try_play_fallback(player, payload.track, exception_info)
-            player._last_error = None
+            state.last_error = None
             if fallback_started:
                 return
 
@@ -1996,13 +3855,14 @@ class MusicBot(commands.Bot):
         else:
             await self._handle_queue_finished(player, reason_upper, failed_track=payload.track)
 
-    async def on_wavelink_track_exception(self, payload: wavelink.TrackExceptionEventPayload):
+    async def _handle_track_exception(self, payload: wavelink.TrackExceptionEventPayload):
         player = payload.player
         if not player:
             return
 
+        state = self.player_states.for_player(player)
         if isinstance(payload.exception, dict):
-            player._last_error = payload.exception
+            state.last_error = payload.exception
             track_title = getattr(payload.track, "title", "Unknown")
             severity = payload.exception.get("severity")
             message = payload.exception.get("message")
@@ -2016,12 +3876,12 @@ class MusicBot(commands.Bot):
                 )
             )
             if self._should_reconnect_warp(track_title, severity, message):
-                player._warp_retry_pending = True
-                player._warp_retry_track = payload.track
-                player._warp_retry_attempted = False
-                existing = getattr(player, "_warp_retry_future", None)
+                state.warp_retry_pending = True
+                state.warp_retry_track = payload.track
+                state.warp_retry_attempted = False
+                existing = state.warp_retry_future
                 if not existing or existing.done():
-                    player._warp_retry_future = asyncio.create_task(
+                    state.warp_retry_future = asyncio.create_task(
                         self._warp_reconnect_flow(player, payload.track)
                     )
             
@@ -2043,7 +3903,7 @@ class MusicBot(commands.Bot):
                 except Exception as exc:
                     print(f"Erro ao enviar log de erro do Lavalink: {exc}")
         else:
-            player._last_error = None
+            state.last_error = None
 
     def _is_video_unavailable_error(self, exception: dict | None) -> bool:
         if not isinstance(exception, dict):
@@ -2076,7 +3936,106 @@ class MusicBot(commands.Bot):
             nodes.append(node)
             seen.add(node.identifier)
 
-        return nodes
+        # Ordem da config só desempata: o node menos carregado vem primeiro
+        return self.rank_nodes(nodes)
+
+    async def _move_player_to_node(
+        self,
+        player: wavelink.Player,
+        target_node: wavelink.Node,
+        *,
+        destroy_old: bool = True,
+    ) -> bool:
+        """Migra o MESMO player para outro node Lavalink sem reconectar voz no Discord."""
+        if target_node is None:
+            return False
+
+        try:
+            if target_node.status != wavelink.NodeStatus.CONNECTED:
+                return False
+        except Exception:
+            pass
+
+        guild_id = getattr(getattr(player, "guild", None), "id", None)
+        if not guild_id:
+            return False
+
+        # Precisa de voice state completo para mandar o VOICE_UPDATE para o novo node.
+        try:
+            voice_data = getattr(player, "_voice_state", {}).get("voice", {})
+        except Exception:
+            voice_data = {}
+
+        session_id = voice_data.get("session_id")
+        token = voice_data.get("token")
+        endpoint = voice_data.get("endpoint")
+        if not session_id or not token or not endpoint:
+            return False
+
+        old_node = getattr(player, "node", None)
+        if old_node is target_node:
+            return True
+
+        # "Mata" o player no node antigo (best-effort) pra não ficar player fantasma.
+        try:
+            if destroy_old and old_node is not None and getattr(old_node, "session_id", None):
+                await old_node._destroy_player(int(guild_id))
+        except Exception:
+            pass
+
+        # Atualiza mapeamentos internos antes de mandar eventos pro novo node.
+        try:
+            if old_node is not None:
+                old_node._players.pop(int(guild_id), None)
+        except Exception:
+            pass
+
+        try:
+            player._node = target_node
+        except Exception:
+            return False
+
+        try:
+            target_node._players[int(guild_id)] = player
+        except Exception:
+            pass
+
+        request = {"voice": {"sessionId": session_id, "token": token, "endpoint": endpoint}}
+        try:
+            await target_node._update_player(int(guild_id), data=request)
+        except BaseException as exc:
+            # Reverte se falhar (inclusive timeout/cancelamento do failover), sem derrubar a call.
+            try:
+                target_node._players.pop(int(guild_id), None)
+            except Exception:
+                pass
+            try:
+                if old_node is not None:
+                    player._node = old_node
+                    try:
+                        old_node._players[int(guild_id)] = player
+                    except Exception:
+                        pass
+            except Exception:
+                pass
+            if not isinstance(exc, Exception):
+                raise
+            return False
+
+        # Atualiza o rastreamento de sessão do player para evitar rebuild desnecessário
+        # quando o usuário adiciona mais músicas logo após o failover.
+        try:
+            player._session_id = getattr(target_node, "session_id", None)
+        except Exception:
+            pass
+
+        # Mantém afinidade com o node atual enquanto durar a sessão na call.
+        try:
+            self._set_session_node_affinity(int(guild_id), getattr(target_node, "identifier", None))
+        except Exception:
+            pass
+
+        return True
 
     async def _try_play_node_failover_for_unavailable(
         self,
@@ -2100,9 +4059,8 @@ class MusicBot(commands.Bot):
         current_id = getattr(current_node, "identifier", None)
         original_node = current_node
 
-        tried = getattr(player, "_unavailable_failover_attempts", None)
-        if not isinstance(tried, set):
-            tried = set()
+        state = self.player_states.for_player(player)
+        tried = state.unavailable_failover_attempts
         if current_id:
             tried.add(str(current_id))
 
@@ -2112,103 +4070,10 @@ class MusicBot(commands.Bot):
             return False
 
         # Marca que estamos em failover para evitar fluxos paralelos de track_end.
-        try:
-            setattr(guild, "_node_failover_inflight", True)
-        except Exception:
-            pass
+        state.node_failover_inflight = True
 
         loop_mode = self._get_loop_mode(player)
 
-        async def _migrate_player_to_node(target_node: wavelink.Node) -> bool:
-            """Migra o MESMO player para outro node Lavalink sem reconectar voz no Discord."""
-            if target_node is None:
-                return False
-
-            try:
-                if target_node.status != wavelink.NodeStatus.CONNECTED:
-                    return False
-            except Exception:
-                pass
-
-            guild_id = getattr(guild, "id", None)
-            if not guild_id:
-                return False
-
-            # Precisa de voice state completo para mandar o VOICE_UPDATE para o novo node.
-            try:
-                voice_data = getattr(player, "_voice_state", {}).get("voice", {})
-            except Exception:
-                voice_data = {}
-
-            session_id = voice_data.get("session_id")
-            token = voice_data.get("token")
-            endpoint = voice_data.get("endpoint")
-            if not session_id or not token or not endpoint:
-                return False
-
-            old_node = getattr(player, "node", None)
-            if old_node is target_node:
-                return True
-
-            # "Mata" o player no node antigo (best-effort) pra não ficar player fantasma.
-            try:
-                if old_node is not None and getattr(old_node, "session_id", None):
-                    await old_node._destroy_player(int(guild_id))
-            except Exception:
-                pass
-
-            # Atualiza mapeamentos internos antes de mandar eventos pro novo node.
-            try:
-                if old_node is not None:
-                    old_node._players.pop(int(guild_id), None)
-            except Exception:
-                pass
-
-            try:
-                player._node = target_node
-            except Exception:
-                return False
-
-            try:
-                target_node._players[int(guild_id)] = player
-            except Exception:
-                pass
-
-            request = {"voice": {"sessionId": session_id, "token": token, "endpoint": endpoint}}
-            try:
-                await target_node._update_player(int(guild_id), data=request)
-            except Exception:
-                # Reverte se falhar, sem derrubar a call.
-                try:
-                    target_node._players.pop(int(guild_id), None)
-                except Exception:
-                    pass
-                try:
-                    if old_node is not None:
-                        player._node = old_node
-                        try:
-                            old_node._players[int(guild_id)] = player
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                return False
-
-            # Atualiza o rastreamento de sessão do player para evitar rebuild desnecessário
-            # quando o usuário adiciona mais músicas logo após o failover.
-            try:
-                player._session_id = getattr(target_node, "session_id", None)
-            except Exception:
-                pass
-
-            # Mantém afinidade com o node atual enquanto durar a sessão na call.
-            try:
-                self._set_session_node_affinity(int(guild_id), getattr(target_node, "identifier", None))
-            except Exception:
-                pass
-
-            return True
-
         try:
             # Ordem: tenta todos os nodes conectados exceto o atual e os já tentados.
             for node in candidates:
@@ -2224,16 +4089,13 @@ class MusicBot(commands.Bot):
                 tried.add(str(node_id))
 
                 try:
-                    migrated = await _migrate_player_to_node(node)
+                    migrated = await self._move_player_to_node(player, node)
                     if not migrated:
                         continue
 
                     await player.play(track)
                     self._apply_loop_mode(player, loop_mode)
-                    try:
-                        player._unavailable_failover_attempts = tried
-                    except Exception:
-                        pass
+                    state.unavailable_failover_attempts = tried
                     return True
                 except Exception as exc:
                     print(f"Falha ao fazer failover para node '{node_id}': {exc}")
@@ -2242,21 +4104,15 @@ class MusicBot(commands.Bot):
             # Esgotou alternativas: volta para o node original (best-effort), sem derrubar a call.
             try:
                 if original_node is not None:
-                    await _migrate_player_to_node(original_node)
+                    await self._move_player_to_node(player, original_node)
             except Exception:
                 pass
 
-            try:
-                player._unavailable_failover_attempts = tried
-            except Exception:
-                pass
+            state.unavailable_failover_attempts = tried
 
             return False
         finally:
-            try:
-                setattr(guild, "_node_failover_inflight", False)
-            except Exception:
-                pass
+            state.node_failover_inflight = False
 
     def _should_reconnect_warp(self, track_title: str | None, severity: Any, message: Any) -> bool:
         """Confere se o erro atual deve disparar o script de reconexao do WARP."""
@@ -2280,14 +4136,15 @@ class MusicBot(commands.Bot):
         if track is None:
             return False
 
-        player._warp_retry_pending = True
-        player._warp_retry_track = track
-        player._warp_retry_attempted = False
+        state = self.player_states.for_player(player)
+        state.warp_retry_pending = True
+        state.warp_retry_track = track
+        state.warp_retry_attempted = False
 
         guild = getattr(player, "guild", None)
         guild_id = getattr(guild, "id", None)
 
-        channel = getattr(player, "text_channel", None)
+        channel = state.text_channel
         if channel is None:
             requester = getattr(track, "requester", None)
             if requester and hasattr(requester, "channel"):
@@ -2318,7 +4175,7 @@ class MusicBot(commands.Bot):
                 print(f"Falha ao enviar aviso de retry WARP: {exc}")
 
         try:
-            player._warp_retry_inflight = True
+            state.warp_retry_inflight = True
             await self._run_warp_reconnect_script()
             connected = await self.ensure_lavalink_connected()
             if not connected:
@@ -2331,29 +4188,27 @@ class MusicBot(commands.Bot):
             await player.play(track)
             loop_mode = self._get_loop_mode(player)
             self._apply_loop_mode(player, loop_mode)
-            player._warp_retry_pending = False
-            player._warp_retry_attempted = False
-            player._warp_retry_track = None
+            state.warp_retry_pending = False
+            state.warp_retry_attempted = False
+            state.warp_retry_track = None
             return True
         except Exception as exc:
             print(f"Falha no fluxo de retry WARP: {exc}")
             return False
         finally:
-            player._warp_retry_inflight = False
-            try:
-                player._warp_retry_future = None
-            except Exception:
-                pass
+            state.warp_retry_inflight = False
+            state.warp_retry_future = None
 
     async def _schedule_warp_retry(self, player: wavelink.Player, track: wavelink.Playable | None, delay_seconds: float = 5.0) -> bool:
         """Avisa o usuario e tenta reproduzir novamente apos a reconexao WARP."""
         if track is None:
             return False
+        state = self.player_states.for_player(player)
 
         guild = getattr(player, "guild", None)
         guild_id = getattr(guild, "id", None)
 
-        channel = getattr(player, "text_channel", None)
+        channel = state.text_channel
         if channel is None:
             requester = getattr(track, "requester", None)
             if requester and hasattr(requester, "channel"):
@@ -2373,7 +4228,7 @@ class MusicBot(commands.Bot):
             except Exception as exc:
                 print(f"Falha ao avisar sobre nova tentativa de reproducao: {exc}")
 
-        reconnect_task = getattr(player, "_warp_reconnect_task", None)
+        reconnect_task = state.warp_reconnect_task
         if reconnect_task and not reconnect_task.done():
             try:
                 await reconnect_task
@@ -2394,9 +4249,9 @@ class MusicBot(commands.Bot):
             await player.play(track)
             loop_mode = self._get_loop_mode(player)
             self._apply_loop_mode(player, loop_mode)
-            player._warp_retry_pending = False
-            player._warp_retry_attempted = False
-            player._warp_retry_track = None
+            state.warp_retry_pending = False
+            state.warp_retry_attempted = False
+            state.warp_retry_track = None
             return True
         except Exception as exc:
             print(f"Nao foi possivel re-tentar a faixa apos reconexao WARP: {exc}")
@@ -2449,13 +4304,15 @@ class MusicBot(commands.Bot):
         if reason and reason.upper() == "REPLACED":
             return
 
+        state = self.player_states.for_player(player)
+
         if reason and reason.upper() == "LOAD_FAILED":
             suppress_finished_embed = True
             if failed_track:
                 await self._notify_track_failure(
                     player,
                     failed_track,
-                    getattr(player, "_last_error", None),
+                    state.last_error,
                 )
 
         if suppress_finished_embed:
@@ -2468,7 +4325,7 @@ class MusicBot(commands.Bot):
         # Envia embed avisando que a fila acabou
         if send_finished_embed:
             try:
-                channel = getattr(player, "text_channel", None)
+                channel = state.text_channel
                 if channel is None and getattr(player, "current", None):
                     requester = getattr(player.current, "requester", None)
                     if requester and hasattr(requester, "channel"):
@@ -2491,8 +4348,8 @@ class MusicBot(commands.Bot):
                 print(f"Erro ao enviar embed de fila finalizada: {e}")
 
         # Limpa referências para evitar updates de progresso pendentes
-        if hasattr(player, "current_embed_message"):
-            player.current_embed_message = None
+        state.current_embed_message = None
+        state.last_error = None
 
         # Desconecta do canal de voz
         try:
@@ -2503,6 +4360,7 @@ class MusicBot(commands.Bot):
                 except Exception:
                     pass
                 await player.disconnect()
+                self._release_guild_state(guild_id)
                 guild_name = getattr(player.guild, "name", "Desconhecido")
                 print(f"Desconectado do canal de voz após finalizar fila no servidor: {guild_name}")
                 
@@ -2516,16 +4374,13 @@ class MusicBot(commands.Bot):
         except Exception as e:
             print(f"Erro ao desconectar após finalizar fila: {e}")
 
-        if hasattr(player, "_last_error"):
-            player._last_error = None
-
     async def _notify_track_failure(
         self,
         player: wavelink.Player,
         track: wavelink.Playable | None,
         exception: dict | None,
     ) -> None:
-        channel = getattr(player, "text_channel", None)
+        channel = self.player_states.for_player(player).text_channel
 
         if channel is None and track:
             requester = getattr(track, "requester", None)
@@ -2683,7 +4538,7 @@ class MusicBot(commands.Bot):
         original_track: wavelink.Playable | None,
         fallback_track: wavelink.Playable,
     ) -> None:
-        channel = getattr(player, "text_channel", None)
+        channel = self.player_states.for_player(player).text_channel
         if channel is None and original_track is not None:
             requester = getattr(original_track, "requester", None)
             if requester and hasattr(requester, "channel"):
@@ -2726,23 +4581,21 @@ class MusicBot(commands.Bot):
         if not player or track is None:
             return False
 
-        if getattr(player, "_fallback_in_progress", False):
+        state = self.player_states.for_player(player)
+        if state.fallback_in_progress:
             return False
 
         if not self._should_try_fallback(exception):
             return False
 
         fallback_key = self._track_fallback_key(track)
-        attempts = getattr(player, "_fallback_attempts", None)
-        if not isinstance(attempts, set):
-            attempts = set()
+        attempts = state.fallback_attempts
 
         if fallback_key and fallback_key in attempts:
             return False
 
         if fallback_key:
             attempts.add(fallback_key)
-        player._fallback_attempts = attempts
 
         queries = self._build_fallback_queries(track)
         if not queries:
@@ -2774,7 +4627,7 @@ class MusicBot(commands.Bot):
                     setattr(candidate, "requester", requester)
 
             try:
-                player._fallback_in_progress = True
+                state.fallback_in_progress = True
                 await self._send_fallback_notice(player, track, candidate)
                 await player.play(candidate)
                 fallback_success = True
@@ -2782,7 +4635,7 @@ class MusicBot(commands.Bot):
             except Exception as exc:
                 print(f"Erro ao tocar fallback '{query}': {exc}")
             finally:
-                player._fallback_in_progress = False
+                state.fallback_in_progress = False
 
         return fallback_success
 
@@ -2790,24 +4643,11 @@ class MusicBot(commands.Bot):
         if player is None or track is None:
             return
 
-        task = asyncio.create_task(self.update_progress_bar(player, track))
-        player._kenny_progress_task = task
+        self.progress_scheduler.register(player, track)
 
     async def _cancel_progress_task(self, player: wavelink.Player) -> None:
-        task = getattr(player, "_kenny_progress_task", None)
-        if not isinstance(task, asyncio.Task):
-            return
-
-        if not task.done():
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            except Exception as exc:
-                print(f"Erro ao cancelar tarefa de progresso: {exc}")
-
-        player._kenny_progress_task = None
+        guild_id = getattr(getattr(player, "guild", None), "id", None)
+        self.progress_scheduler.unregister(guild_id)
 
     async def _send_now_playing_embed(
         self,
@@ -2817,7 +4657,8 @@ class MusicBot(commands.Bot):
         if not track:
             return
 
-        channel = getattr(player, "text_channel", None)
+        state = self.player_states.for_player(player)
+        channel = state.text_channel
         if channel is None:
             requester = getattr(track, "requester", None)
             if requester and hasattr(requester, "channel"):
@@ -2825,7 +4666,7 @@ class MusicBot(commands.Bot):
         if channel is None:
             return
 
-        player.text_channel = channel
+        state.text_channel = channel
 
         embed = self._build_now_playing_embed(player, track)
         if embed is None:
@@ -2836,7 +4677,7 @@ class MusicBot(commands.Bot):
             player=player,
             guild_id=getattr(getattr(player, "guild", None), "id", None),
         )
-        previous_message = getattr(player, "current_embed_message", None)
+        previous_message = state.current_embed_message
 
         if previous_message:
             try:
@@ -2846,7 +4687,7 @@ class MusicBot(commands.Bot):
             except Exception as exc:
                 print(f"Falha ao remover embed anterior de reprodução: {exc}")
             finally:
-                player.current_embed_message = None
+                state.current_embed_message = None
 
         try:
             message = await channel.send(embed=embed, view=view)
@@ -2854,7 +4695,7 @@ class MusicBot(commands.Bot):
             print(f"Erro ao enviar embed de reprodução: {exc}")
             return
 
-        player.current_embed_message = message
+        state.current_embed_message = message
         return
 
     def _detect_track_source(self, track: wavelink.Playable | None) -> str | None:
@@ -2938,9 +4779,10 @@ class MusicBot(commands.Bot):
         if channel is None or not isinstance(channel, discord.VoiceChannel):
             return
 
-        original_status = getattr(player, "_original_channel_status", None)
+        state = self.player_states.for_player(player)
+        original_status = state.original_channel_status
 
-        if getattr(player, "_channel_status_overridden", False):
+        if state.channel_status_overridden:
             try:
                 await channel.edit(status=original_status)
             except discord.Forbidden:
@@ -2948,16 +4790,18 @@ class MusicBot(commands.Bot):
             except Exception as exc:
                 print(f"Falha ao restaurar status do canal de voz: {exc}")
             finally:
-                player._channel_status_overridden = False
+                state.channel_status_overridden = False
 
-        if not hasattr(player, "_original_channel_status"):
-            player._original_channel_status = getattr(channel, "status", None)
+        if not state.channel_status_captured:
+            state.original_channel_status = getattr(channel, "status", None)
+            state.channel_status_captured = True
 
     async def _clear_now_playing_message(self, player: wavelink.Player) -> None:
         await self._cancel_progress_task(player)
         await self._restore_voice_channel_status(player)
 
-        message = getattr(player, "current_embed_message", None)
+        state = self.player_states.for_player(player)
+        message = state.current_embed_message
         if not message:
             return
 
@@ -2968,7 +4812,7 @@ class MusicBot(commands.Bot):
         except Exception as exc:
             print(f"Erro ao remover embed de reprodução: {exc}")
         finally:
-            player.current_embed_message = None
+            state.current_embed_message = None
 
     def _build_now_playing_embed(
         self,
@@ -3121,59 +4965,6 @@ class MusicBot(commands.Bot):
 
         return embed
 
-    async def update_progress_bar(self, player: wavelink.Player, track: wavelink.Playable | None):
-        expected_track_id = None
-        if track is not None:
-            expected_track_id = (
-                getattr(track, "track", None)
-                or getattr(track, "identifier", None)
-                or getattr(track, "id", None)
-            )
-
-        current_task = asyncio.current_task()
-
-        try:
-            while player and getattr(player, "current", None):
-                current_track = getattr(player, "current", None)
-
-                if expected_track_id:
-                    current_track_id = (
-                        getattr(current_track, "track", None)
-                        or getattr(current_track, "identifier", None)
-                        or getattr(current_track, "id", None)
-                    )
-                    if current_track_id and current_track_id != expected_track_id:
-                        break
-
-                embed_message = getattr(player, "current_embed_message", None)
-                if not embed_message:
-                    break
-
-                try:
-                    embed_source = current_track or track
-                    if embed_source is None:
-                        break
-
-                    embed = self._build_now_playing_embed(player, embed_source)
-                    if embed is None:
-                        break
-                    await embed_message.edit(embed=embed)
-                except discord.NotFound:
-                    player.current_embed_message = None
-                    break
-                except Exception as e:
-                    print(f"Erro ao atualizar embed de reprodução: {e}")
-                    break
-
-                await asyncio.sleep(5)
-                if not player.playing:
-                    # Se a música pausou, esperamos até retomar ou terminar
-                    await asyncio.sleep(2)
-        finally:
-            stored_task = getattr(player, "_kenny_progress_task", None)
-            if isinstance(stored_task, asyncio.Task) and stored_task is current_task:
-                player._kenny_progress_task = None
-
     def format_time(self, milliseconds):
         if milliseconds is None:
             return "00:00"
@@ -3182,13 +4973,13 @@ class MusicBot(commands.Bot):
         seconds = seconds % 60
         return f"{minutes:02d}:{seconds:02d}"
 
-    def _load_warp_setting(self) -> bool:
+    async def _load_warp_setting(self) -> bool:
         """Carrega flag de auto-reconnect do WARP do MongoDB (padrão: True)."""
-        if not self._mongo_connected or self.warp_collection is None:
+        if not self._mongo_connected or self.storage is None or self.warp_collection is None:
             return True
 
         try:
-            doc = self.warp_collection.find_one({"_id": "warp_reconnect"})
+            doc = await self.storage.find_one(self.warp_collection, {"_id": "warp_reconnect"})
             if not doc:
                 return True
             value = doc.get("enabled")
@@ -3197,14 +4988,15 @@ class MusicBot(commands.Bot):
             print(f"Falha ao carregar configuração de WARP do MongoDB: {exc}")
             return True
 
-    def save_warp_setting(self, enabled: bool) -> bool:
+    async def save_warp_setting(self, enabled: bool) -> bool:
         """Salva flag de auto-reconnect do WARP no MongoDB."""
-        if not self._mongo_connected or self.warp_collection is None:
+        if not self._mongo_connected or self.storage is None or self.warp_collection is None:
             print("MongoDB não conectado. Não foi possível salvar configuração de WARP.")
             return False
 
         try:
-            self.warp_collection.update_one(
+            await self.storage.update_one(
+                self.warp_collection,
                 {"_id": "warp_reconnect"},
                 {"$set": {"enabled": bool(enabled)}},
                 upsert=True,
@@ -3214,15 +5006,15 @@ class MusicBot(commands.Bot):
             print(f"Falha ao salvar configuração de WARP no MongoDB: {exc}")
             return False
 
-    def _load_presence_config(self) -> dict:
+    async def _load_presence_config(self) -> dict:
         """Carrega configuração de presença do MongoDB."""
-        if not self._mongo_connected or self.presence_collection is None:
+        if not self._mongo_connected or self.storage is None or self.presence_collection is None:
             print("MongoDB não conectado. Usando presença padrão.")
             return {}
         
         try:
             # Busca documento com _id="bot_presence" (único documento)
-            doc = self.presence_collection.find_one({"_id": "bot_presence"})
+            doc = await self.storage.find_one(self.presence_collection, {"_id": "bot_presence"})
             if doc:
                 # Remove _id antes de retornar
                 doc.pop("_id", None)
@@ -3235,15 +5027,16 @@ class MusicBot(commands.Bot):
             print(f"Falha ao carregar presença do MongoDB: {exc}")
             return {}
     
-    def save_presence_config(self, config: dict) -> bool:
+    async def save_presence_config(self, config: dict) -> bool:
         """Salva configuração de presença no MongoDB."""
-        if not self._mongo_connected or self.presence_collection is None:
+        if not self._mongo_connected or self.storage is None or self.presence_collection is None:
             print("MongoDB não conectado. Não foi possível salvar presença.")
             return False
         
         try:
             # Upsert: atualiza se existe, insere se não existe
-            self.presence_collection.update_one(
+            await self.storage.update_one(
+                self.presence_collection,
                 {"_id": "bot_presence"},
                 {"$set": config},
                 upsert=True
@@ -3291,7 +5084,7 @@ class MusicBot(commands.Bot):
             traceback.print_exc()
 
     async def apply_saved_presence(self) -> None:
-        config = self._load_presence_config()
+        config = await self._load_presence_config()
         status_str = (config.get("status") or "online").lower()
         status_map = {
             "online": discord.Status.online,